@@ -0,0 +1,57 @@
+"""
+Import-time benchmark for the application module.
+
+Spawns fresh interpreters with ``python -X importtime`` and reports the total
+cost of importing ``backend.main`` (what every worker spawn and every test
+collection pays), plus the most expensive modules by cumulative time.
+
+Usage:
+    python -m backend.benchmarks.import_time
+    python -m backend.benchmarks.import_time --module backend.db.sql.sql_driver --runs 10 --top 15
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+
+
+def _import_profile(module: str) -> dict[str, tuple[int, int]]:
+    """Return {module: (self_us, cumulative_us)} from one cold interpreter."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    profile = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        profile[name.strip()] = (int(self_us), int(cumulative_us))
+    return profile
+
+
+def run(module: str, runs: int, top: int) -> None:
+    profiles = [_import_profile(module) for _ in range(runs)]
+    totals_ms = [profile[module][1] / 1000 for profile in profiles]
+    print(f"import {module}: median {statistics.median(totals_ms):.1f} ms, "
+          f"min {min(totals_ms):.1f} ms, max {max(totals_ms):.1f} ms over {runs} runs")
+
+    last = profiles[-1]
+    print(f"\n{'module':<60} {'self ms':>9} {'cumulative ms':>14}")
+    for name, (self_us, cumulative_us) in sorted(last.items(), key=lambda item: item[1][1], reverse=True)[:top]:
+        print(f"{name:<60} {self_us / 1000:>9.1f} {cumulative_us / 1000:>14.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="backend.main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args()
+    run(args.module, args.runs, args.top)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Calibration benchmark for password hashing cost.
+
+Reports the per-hash latency for a range of bcrypt rounds and argon2id
+parameters, so BCRYPT_ROUNDS / ARGON2_* can be chosen for the target hardware.
+
+Usage:
+    python -m backend.benchmarks.password_hashing
+    python -m backend.benchmarks.password_hashing --bcrypt-rounds 10 11 12 13 --samples 5
+"""
+import argparse
+import statistics
+import time
+
+from passlib.exc import MissingBackendError
+
+from backend.config import settings
+from backend.routers.auth.security_utl import build_password_context
+
+SAMPLE_PASSWORD = "Calibrate@1234"
+
+
+def _time_hash(context, samples: int) -> tuple[float, float]:
+    """Return (median, max) hash latency in milliseconds."""
+    context.hash(SAMPLE_PASSWORD)  # warm-up: loads the hashing backend
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        context.hash(SAMPLE_PASSWORD)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), max(timings)
+
+
+def run(bcrypt_rounds: list[int], argon2_params: list[tuple[int, int, int]], samples: int) -> None:
+    print(f"{'setting':<40} {'median ms':>10} {'max ms':>10}")
+
+    for rounds in bcrypt_rounds:
+        context = build_password_context(scheme="bcrypt", bcrypt_rounds=rounds)
+        median, worst = _time_hash(context, samples)
+        marker = " (current)" if settings.PASSWORD_HASH_SCHEME == "bcrypt" and rounds == settings.BCRYPT_ROUNDS else ""
+        print(f"{f'bcrypt rounds={rounds}{marker}':<40} {median:>10.1f} {worst:>10.1f}")
+
+    for time_cost, memory_cost, parallelism in argon2_params:
+        context = build_password_context(
+            scheme="argon2",
+            argon2_time_cost=time_cost,
+            argon2_memory_cost=memory_cost,
+            argon2_parallelism=parallelism,
+        )
+        label = f"argon2id t={time_cost} m={memory_cost}KiB p={parallelism}"
+        try:
+            median, worst = _time_hash(context, samples)
+        except MissingBackendError:
+            print(f"{label:<40} {'argon2-cffi not installed':>21}")
+            return
+        print(f"{label:<40} {median:>10.1f} {worst:>10.1f}")
+
+
+def _parse_argon2(value: str) -> tuple[int, int, int]:
+    time_cost, memory_cost, parallelism = (int(part) for part in value.split(","))
+    return time_cost, memory_cost, parallelism
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bcrypt-rounds", type=int, nargs="*", default=[10, 11, 12, 13, 14])
+    parser.add_argument(
+        "--argon2",
+        type=_parse_argon2,
+        nargs="*",
+        default=[
+            (2, 19456, 1),
+            (3, 65536, 4),
+            (settings.ARGON2_TIME_COST, settings.ARGON2_MEMORY_COST_KIB, settings.ARGON2_PARALLELISM),
+        ],
+        help="argon2id settings as time_cost,memory_kib,parallelism",
+    )
+    parser.add_argument("--samples", type=int, default=3)
+    args = parser.parse_args()
+    run(args.bcrypt_rounds, args.argon2, args.samples)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Validation benchmark for survey question models.
+
+Validates a synthetic survey (200 questions by default, cycling through every
+component) with the generic ``QuestionItem``, whose optionProps is a plain
+union tried member by member, and with the ``component``-discriminated
+``AnyQuestionItem`` used by the API models.
+
+Usage:
+    python -m backend.benchmarks.question_validation
+    python -m backend.benchmarks.question_validation --questions 500 --runs 200
+"""
+import argparse
+import json
+import statistics
+import time
+
+from pydantic import TypeAdapter
+
+from backend.models.api.surveys import AnyQuestionItem, QuestionItem
+
+OPTION_PROPS = {
+    "TextInput": {"label": "Your answer", "placeholder": "Type here..."},
+    "Switch": {"activeLabel": "Yes", "inactiveLabel": "No", "checked": False},
+    "RadioBar": {"name": "radio", "buttons": [{"label": f"Option {i}", "value": f"option-{i}"} for i in range(5)]},
+    "CheckboxTiles": {"name": "tiles", "buttons": [{"label": f"Tile {i}", "value": f"tile-{i}"} for i in range(5)]},
+    "DropDown": {
+        "options": [{"label": f"Choice {i}", "value": f"choice-{i}"} for i in range(10)],
+        "selectedOption": "choice-0",
+    },
+}
+
+
+def build_questions(count: int) -> list[dict]:
+    components = list(OPTION_PROPS)
+    return [
+        {
+            "id": f"q{index}",
+            "questionText": f"Question {index}",
+            "component": components[index % len(components)],
+            "option": {"optionProps": OPTION_PROPS[components[index % len(components)]]},
+            "layout": {"i": f"q{index}", "x": 0, "y": index, "w": 6, "h": 2},
+        }
+        for index in range(count)
+    ]
+
+
+def _time_validation(validate, payload, runs: int) -> float:
+    """Return the median validation time in milliseconds."""
+    validate(payload)  # warm-up: builds the validators
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        validate(payload)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def run(question_count: int, runs: int) -> None:
+    questions = build_questions(question_count)
+    raw = json.dumps(questions)
+    adapters = {
+        "plain union": TypeAdapter(list[QuestionItem]),
+        "discriminated": TypeAdapter(list[AnyQuestionItem]),
+    }
+
+    print(f"{question_count} questions, median of {runs} runs")
+    print(f"{'model':<16} {'python ms':>10} {'json ms':>10}")
+    results = {}
+    for label, adapter in adapters.items():
+        python_ms = _time_validation(adapter.validate_python, questions, runs)
+        json_ms = _time_validation(adapter.validate_json, raw, runs)
+        results[label] = python_ms
+        print(f"{label:<16} {python_ms:>10.3f} {json_ms:>10.3f}")
+    print(f"speedup (python): {results['plain union'] / results['discriminated']:.2f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--questions", type=int, default=200)
+    parser.add_argument("--runs", type=int, default=100)
+    args = parser.parse_args()
+    run(args.questions, args.runs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Latency benchmark for the owner-facing response endpoints.
+
+Calls list_responses and get_survey_stats directly with simulated MongoDB and
+PostgreSQL round-trip latencies and reports p50/p95 handler latency next to
+the slowest single call and the serial sum of all calls. With Mongo and SQL
+overlapping, p50 should sit near the slowest chain rather than the sum.
+
+Usage:
+    python -m backend.benchmarks.response_latency
+    python -m backend.benchmarks.response_latency --mongo-ms 20 --sql-ms 15 --runs 200
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from bson import ObjectId
+
+from backend.models.db.sql.auth import SurveyResponseAnswer
+from backend.routers.surveys.responses import responses as routes
+
+
+class _SlowCollection:
+    def __init__(self, doc, latency: float):
+        self._doc = doc
+        self._latency = latency
+
+    async def find_one(self, query):
+        await asyncio.sleep(self._latency)
+        return self._doc
+
+
+class _Result:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return self._rows
+
+    def scalar(self):
+        return len(self._rows)
+
+
+class _SlowSession:
+    """Every statement costs one simulated round trip; ``answer(query)`` picks its rows."""
+
+    def __init__(self, answer, latency: float):
+        self._answer = answer
+        self._latency = latency
+
+    async def execute(self, query):
+        await asyncio.sleep(self._latency)
+        return _Result(self._answer(query))
+
+
+def _percentiles(samples: list[float]) -> tuple[float, float]:
+    ordered = sorted(samples)
+    return statistics.median(ordered), ordered[int(len(ordered) * 0.95) - 1]
+
+
+async def _measure(call, runs: int) -> list[float]:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        await call()
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+async def run(mongo_ms: float, sql_ms: float, rows: int, runs: int) -> None:
+    user = SimpleNamespace(id=uuid.uuid4())
+    object_id = ObjectId()
+    survey = {"_id": object_id, "title": "Benchmark", "status": "published", "questions": []}
+    responses = [
+        SimpleNamespace(
+            id=uuid.uuid4(),
+            survey_id=str(object_id),
+            answers=[],
+            submitted_at=datetime.now(timezone.utc),
+        )
+        for _ in range(rows)
+    ]
+    today = datetime.now(timezone.utc).date()
+
+    def answer(query):
+        first = query.column_descriptions[0]
+        if first["entity"] is SurveyResponseAnswer:
+            return []  # stats: option counts
+        if first["name"] == "day":
+            return [(today, rows, 0)]  # stats: per-day trend
+        return responses  # list: page (and count)
+
+    routes.surveys_collection = _SlowCollection(survey, mongo_ms / 1000)
+    session = _SlowSession(answer, sql_ms / 1000)
+
+    cases = {
+        # page + count are sequential on one session; Mongo overlaps with both
+        "list_responses": (
+            lambda: routes.list_responses(
+                str(object_id), user, session, page=1, page_size=10, filters_by_answer=[]
+            ),
+            max(mongo_ms, 2 * sql_ms),
+            mongo_ms + 2 * sql_ms,
+        ),
+        # trend + option counts are sequential on one session; Mongo overlaps with both
+        "get_survey_stats": (
+            lambda: routes.get_survey_stats(str(object_id), user, session, start_date=None, end_date=None),
+            max(mongo_ms, 2 * sql_ms),
+            mongo_ms + 2 * sql_ms,
+        ),
+    }
+
+    print(f"{'endpoint':<20} {'p50 ms':>8} {'p95 ms':>8} {'slowest chain ms':>17} {'serial sum ms':>14}")
+    for name, (call, slowest, serial) in cases.items():
+        p50, p95 = _percentiles(await _measure(call, runs))
+        print(f"{name:<20} {p50:>8.1f} {p95:>8.1f} {slowest:>17.1f} {serial:>14.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mongo-ms", type=float, default=20.0, help="simulated Mongo round trip")
+    parser.add_argument("--sql-ms", type=float, default=15.0, help="simulated SQL round trip")
+    parser.add_argument("--rows", type=int, default=25, help="responses returned by SQL")
+    parser.add_argument("--runs", type=int, default=100)
+    args = parser.parse_args()
+    asyncio.run(run(args.mongo_ms, args.sql_ms, args.rows, args.runs))
+
+
+if __name__ == "__main__":
+    main()
@@ -9,9 +9,35 @@ load_dotenv(path_to_env)
 
 # JWT Configuration
 JWT_SECRET: str = os.getenv("JWT_SECRET", "your-secret-key-here-change-in-production")
-JWT_ALG: str = os.getenv("JWT_ALGORITHM", "HS256")
+JWT_ALG: str = os.getenv("JWT_ALGORITHM", "HS256")  # HS256 uses JWT_SECRET; ES256/RS256 use the JWT_KEYS key ring
+JWT_KEYS: str = os.getenv("JWT_KEYS", "")  # JSON object: {"<kid>": "<PEM key>", ...}
+JWT_ACTIVE_KID: str = os.getenv("JWT_ACTIVE_KID", "")
+JWKS_MAX_AGE_SECONDS: int = int(os.getenv("JWKS_MAX_AGE_SECONDS", "3600"))
 ACCESS_EXPIRE_MIN: int = int(os.getenv("ACCESS_EXPIRE_MIN", "15"))  # 15 minutes
 REFRESH_EXPIRE_DAYS: int = int(os.getenv("REFRESH_EXPIRE_DAYS", "7"))  # 7 days
+JWT_DECODE_CACHE_SIZE: int = int(os.getenv("JWT_DECODE_CACHE_SIZE", "10000"))  # 0 disables the verified-token cache
+REFRESH_TOKEN_PRUNE_INTERVAL_SECONDS: float = float(os.getenv("REFRESH_TOKEN_PRUNE_INTERVAL_SECONDS", "3600"))  # 0 disables pruning
+REFRESH_TOKEN_PRUNE_BATCH_SIZE: int = int(os.getenv("REFRESH_TOKEN_PRUNE_BATCH_SIZE", "1000"))
+
+# Password Hashing Configuration
+PASSWORD_HASH_SCHEME: str = os.getenv("PASSWORD_HASH_SCHEME", "bcrypt").lower()  # Options: 'bcrypt' or 'argon2' (requires argon2-cffi)
+BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", "12"))
+ARGON2_TIME_COST: int = int(os.getenv("ARGON2_TIME_COST", "3"))
+ARGON2_MEMORY_COST_KIB: int = int(os.getenv("ARGON2_MEMORY_COST_KIB", "65536"))  # 64 MiB
+ARGON2_PARALLELISM: int = int(os.getenv("ARGON2_PARALLELISM", "4"))
+
+# Rate Limiting Configuration (limits are "<requests>/<seconds>")
+RATE_LIMIT_ENABLED: bool = os.getenv("RATE_LIMIT_ENABLED", "True").lower() in ("true", "1", "yes")
+RATE_LIMIT_BACKEND: str = os.getenv("RATE_LIMIT_BACKEND", "memory")  # 'memory' or 'package.module:factory' for a shared store
+RATE_LIMIT_MAX_KEYS: int = int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+RATE_LIMIT_TRUST_FORWARDED_FOR: bool = os.getenv("RATE_LIMIT_TRUST_FORWARDED_FOR", "False").lower() in ("true", "1", "yes")
+# Proxies in front of the app that append to X-Forwarded-For; the client IP is the entry the outermost one added
+RATE_LIMIT_TRUSTED_PROXY_HOPS: int = int(os.getenv("RATE_LIMIT_TRUSTED_PROXY_HOPS", "1"))
+RATE_LIMIT_LOGIN_PER_IP: str = os.getenv("RATE_LIMIT_LOGIN_PER_IP", "20/60")
+RATE_LIMIT_LOGIN_PER_EMAIL: str = os.getenv("RATE_LIMIT_LOGIN_PER_EMAIL", "5/60")
+RATE_LIMIT_REGISTER_PER_IP: str = os.getenv("RATE_LIMIT_REGISTER_PER_IP", "5/60")
+RATE_LIMIT_SUBMIT_PER_IP: str = os.getenv("RATE_LIMIT_SUBMIT_PER_IP", "30/60")
+RATE_LIMIT_SUBMIT_PER_SURVEY: str = os.getenv("RATE_LIMIT_SUBMIT_PER_SURVEY", "600/60")
 
 # Cookie Configuration
 COOKIE_NAME: str = os.getenv("COOKIE_NAME", "refresh_token")
@@ -23,9 +49,15 @@ DATABASE_URL: str = os.getenv("DATABASE_URL", "postgresql+asyncpg://postgres:pos
 MONGODB_URI: str = os.getenv("MONGODB_URI", "mongodb://localhost:27017")
 MONGODB_DB_NAME: str = os.getenv("MONGODB_DB_NAME", "surveys_db")
 MONGO_MIGRATION_STRATEGY: str = os.getenv("MONGO_MIGRATION_STRATEGY", os.getenv("MIGRATION_STRATEGY", "delete"))  # Options: 'update', 'delete', or 'safe'
+# Lease on the schema_migrations mutex, renewed while migrations run; a crashed runner's lock is taken over after this
+MONGO_MIGRATION_LOCK_TTL_SECONDS: int = int(os.getenv("MONGO_MIGRATION_LOCK_TTL_SECONDS", "600"))
+# Write operations per bulk_write batch in streaming cleanup migrations
+MONGO_MIGRATION_BATCH_SIZE: int = int(os.getenv("MONGO_MIGRATION_BATCH_SIZE", "1000"))
 
 # SQL Migration Configuration
 SQL_MIGRATION_STRATEGY: str = os.getenv("SQL_MIGRATION_STRATEGY", os.getenv("MIGRATION_STRATEGY", "delete"))  # Options: 'update', 'delete', or 'safe'
+# Responses per batch when backfilling survey_response_answers
+SQL_MIGRATION_BATCH_SIZE: int = int(os.getenv("SQL_MIGRATION_BATCH_SIZE", "1000"))
 
 # Security Configuration
 SECRET_KEY: str = os.getenv("SECRET_KEY", "your-secret-key-change-in-production")
@@ -34,6 +66,82 @@ SECRET_KEY: str = os.getenv("SECRET_KEY", "your-secret-key-change-in-production"
 DEBUG: bool = os.getenv("DEBUG", "False").lower() in ("true", "1", "yes")
 ENVIRONMENT: str = os.getenv("ENVIRONMENT", "development")
 
+# Run `python -m backend.manage migrate` as part of app boot (single-process local dev only)
+MIGRATE_ON_STARTUP: bool = os.getenv("MIGRATE_ON_STARTUP", "False").lower() in ("true", "1", "yes")
+# Total connections one deploy may hold on the primary PostgreSQL, across every
+# worker process (keep it below max_connections, minus headroom for migrate and
+# admin sessions). Each worker gets SQL_CONNECTION_BUDGET / WEB_CONCURRENCY and
+# the per-workload sizes below are scaled down to fit that share.
+SQL_CONNECTION_BUDGET: int = int(os.getenv("SQL_CONNECTION_BUDGET", "80"))
+# Worker processes sharing the budget; set by `python -m backend.server`, and read by uvicorn --workers
+WEB_CONCURRENCY: int = int(os.getenv("WEB_CONCURRENCY", "1"))
+
+# Per-workload PostgreSQL pools (statement_timeout in ms, 0 disables); upper bounds per worker
+SQL_POOL_INTERACTIVE_SIZE: int = int(os.getenv("SQL_POOL_INTERACTIVE_SIZE", "10"))
+SQL_POOL_INTERACTIVE_MAX_OVERFLOW: int = int(os.getenv("SQL_POOL_INTERACTIVE_MAX_OVERFLOW", "20"))
+SQL_POOL_INTERACTIVE_STATEMENT_TIMEOUT_MS: int = int(os.getenv("SQL_POOL_INTERACTIVE_STATEMENT_TIMEOUT_MS", "5000"))
+SQL_POOL_INGEST_SIZE: int = int(os.getenv("SQL_POOL_INGEST_SIZE", "10"))
+SQL_POOL_INGEST_MAX_OVERFLOW: int = int(os.getenv("SQL_POOL_INGEST_MAX_OVERFLOW", "10"))
+SQL_POOL_INGEST_STATEMENT_TIMEOUT_MS: int = int(os.getenv("SQL_POOL_INGEST_STATEMENT_TIMEOUT_MS", "2000"))
+SQL_POOL_ANALYTICS_SIZE: int = int(os.getenv("SQL_POOL_ANALYTICS_SIZE", "3"))
+SQL_POOL_ANALYTICS_MAX_OVERFLOW: int = int(os.getenv("SQL_POOL_ANALYTICS_MAX_OVERFLOW", "2"))
+SQL_POOL_ANALYTICS_STATEMENT_TIMEOUT_MS: int = int(os.getenv("SQL_POOL_ANALYTICS_STATEMENT_TIMEOUT_MS", "30000"))
+
+# Read replicas. DATABASE_READ_URL serves the read and analytics pools when set;
+# without it, reads share the interactive pool.
+# MONGO_SECONDARY_READS sends staleness-tolerant reads to secondaries (90 s is MongoDB's minimum bound).
+DATABASE_READ_URL: str = os.getenv("DATABASE_READ_URL", "")
+SQL_POOL_READ_SIZE: int = int(os.getenv("SQL_POOL_READ_SIZE", "10"))
+SQL_POOL_READ_MAX_OVERFLOW: int = int(os.getenv("SQL_POOL_READ_MAX_OVERFLOW", "10"))
+SQL_POOL_READ_STATEMENT_TIMEOUT_MS: int = int(os.getenv("SQL_POOL_READ_STATEMENT_TIMEOUT_MS", "5000"))
+MONGO_SECONDARY_READS: bool = os.getenv("MONGO_SECONDARY_READS", "False").lower() in ("true", "1", "yes")
+MONGO_MAX_STALENESS_SECONDS: int = int(os.getenv("MONGO_MAX_STALENESS_SECONDS", "90"))
+# Reads pinned to the primary after a save: staleness bound plus one 10 s heartbeat
+READ_YOUR_WRITES_SECONDS: int = int(os.getenv("READ_YOUR_WRITES_SECONDS", str(MONGO_MAX_STALENESS_SECONDS + 10)))
+
+# Connections opened during startup so the first requests skip connection setup
+SQL_POOL_WARM_SIZE: int = int(os.getenv("SQL_POOL_WARM_SIZE", "5"))
+MONGO_MIN_POOL_SIZE: int = int(os.getenv("MONGO_MIN_POOL_SIZE", "5"))
+
+# /readyz dependency checks: results are cached to keep probe traffic off the databases
+READINESS_CACHE_SECONDS: float = float(os.getenv("READINESS_CACHE_SECONDS", "2"))
+READINESS_CHECK_TIMEOUT_SECONDS: float = float(os.getenv("READINESS_CHECK_TIMEOUT_SECONDS", "1"))
+
+# Per-step timeout for the boot-time schema checks; migration steps run without one
+STARTUP_CHECK_TIMEOUT_SECONDS: float = float(os.getenv("STARTUP_CHECK_TIMEOUT_SECONDS", "5"))
+
+# Request timing (Server-Timing header + structured log line per request)
+REQUEST_TIMING_ENABLED: bool = os.getenv("REQUEST_TIMING_ENABLED", "True").lower() in ("true", "1", "yes")
+
+# Production server (python -m backend.server)
+SERVER_HOST: str = os.getenv("SERVER_HOST", "0.0.0.0")
+SERVER_PORT: int = int(os.getenv("SERVER_PORT", "8000"))
+SERVER_WORKERS: int = int(os.getenv("SERVER_WORKERS", "0"))  # 0 = one per available CPU
+SERVER_MAX_WORKERS: int = int(os.getenv("SERVER_MAX_WORKERS", "16"))
+SERVER_LOOP: str = os.getenv("SERVER_LOOP", "auto")  # auto, uvloop or asyncio
+SERVER_HTTP: str = os.getenv("SERVER_HTTP", "auto")  # auto, httptools or h11
+SERVER_KEEPALIVE_SECONDS: int = int(os.getenv("SERVER_KEEPALIVE_SECONDS", "5"))
+SERVER_BACKLOG: int = int(os.getenv("SERVER_BACKLOG", "2048"))
+SERVER_MAX_REQUESTS: int = int(os.getenv("SERVER_MAX_REQUESTS", "10000"))  # 0 disables worker recycling
+SERVER_MAX_REQUESTS_JITTER: float = float(os.getenv("SERVER_MAX_REQUESTS_JITTER", "0.1"))  # per-worker spread, fraction of SERVER_MAX_REQUESTS
+SERVER_GRACEFUL_SHUTDOWN_SECONDS: int = int(os.getenv("SERVER_GRACEFUL_SHUTDOWN_SECONDS", "30"))
+
+# Compiled per-survey answer validators kept in memory (one entry per survey)
+ANSWER_VALIDATOR_CACHE_SIZE: int = int(os.getenv("ANSWER_VALIDATOR_CACHE_SIZE", "1024"))
+
+# Slow-query log (plans are only captured outside production)
+SLOW_QUERY_SQL_MS: float = float(os.getenv("SLOW_QUERY_SQL_MS", "200"))
+SLOW_QUERY_MONGO_MS: float = float(os.getenv("SLOW_QUERY_MONGO_MS", "200"))
+SLOW_QUERY_EXPLAIN: bool = os.getenv("SLOW_QUERY_EXPLAIN", "True").lower() in ("true", "1", "yes")
+
+# Prometheus metrics
+METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "True").lower() in ("true", "1", "yes")
+METRICS_PATH: str = os.getenv("METRICS_PATH", "/metrics")
+# Bearer token required to scrape METRICS_PATH; the endpoint is not served while unset
+METRICS_TOKEN: str = os.getenv("METRICS_TOKEN", "")
+# Shared sample files for multi-worker servers; python -m backend.server uses a fresh temp dir when unset
+PROMETHEUS_MULTIPROC_DIR: str = os.getenv("PROMETHEUS_MULTIPROC_DIR", "")
+
 # CORS Configuration
 ALLOWED_ORIGINS: list[str] = os.getenv("ALLOWED_ORIGINS", "http://localhost:3000,http://127.0.0.1:3000").split(",")
 # OpenAI Survey Generation Configuration
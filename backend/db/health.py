@@ -0,0 +1,128 @@
+"""
+Connection-pool warmup and cached dependency checks for readiness probes.
+"""
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable
+
+from sqlalchemy import text
+
+from backend.config import settings
+from backend.db.mongo.mongoDB import get_client
+from backend.db.schema import check_schema
+from backend.db.sql.sql_driver import get_async_engine
+from backend.startup import Step, run_graph
+
+logger = logging.getLogger(__name__)
+
+
+async def warm_sql_pool(size: int = None, workload: str = "interactive") -> int:
+    """
+    Open `size` pooled connections of `workload` concurrently and return them
+    to the pool, so the first requests after boot skip connection setup.
+    """
+    size = settings.SQL_POOL_WARM_SIZE if size is None else size
+    engine = get_async_engine(workload)
+    size = min(size, engine.pool.size())
+    if size <= 0:
+        return 0
+
+    # Every connection that opened is closed (returned to the pool), even when
+    # another connect fails or the startup graph cancels the step on timeout
+    opened = []
+
+    async def open_connection():
+        conn = await engine.connect()
+        opened.append(conn)
+        await conn.execute(text("SELECT 1"))
+
+    try:
+        results = await asyncio.gather(*(open_connection() for _ in range(size)), return_exceptions=True)
+    finally:
+        for conn in opened:
+            await conn.close()
+    errors = [result for result in results if isinstance(result, BaseException)]
+    if errors:
+        raise errors[0]
+    return len(results)
+
+
+async def warm_mongo_pool() -> None:
+    """
+    Ping once to establish the first connection; the driver then keeps the
+    pool at MONGO_MIN_POOL_SIZE in the background.
+    """
+    await get_client().admin.command("ping")
+
+
+async def warm_pools() -> None:
+    """Warm both pools concurrently. Failures are logged, never raised."""
+    timeout = settings.STARTUP_CHECK_TIMEOUT_SECONDS
+    await run_graph(
+        [
+            Step("warm_sql_pool", lambda _: warm_sql_pool(workload="interactive"), timeout=timeout),
+            Step("warm_sql_ingest_pool", lambda _: warm_sql_pool(workload="ingest"), timeout=timeout),
+            Step("warm_mongo_pool", lambda _: warm_mongo_pool(), timeout=timeout),
+        ],
+        name="pool warmup",
+    )
+
+
+async def sql_available() -> bool:
+    """A pooled connection can be checked out and answers SELECT 1."""
+    async with get_async_engine().connect() as conn:
+        await conn.execute(text("SELECT 1"))
+    return True
+
+
+async def mongo_available() -> bool:
+    await get_client().admin.command("ping")
+    return True
+
+
+async def schema_current() -> bool:
+    """Both stores have recorded the schema version this code expects."""
+    return all((await check_schema()).values())
+
+
+class CachedCheck:
+    """
+    Runs an async health check at most once per `ttl` seconds and shares the
+    result between concurrent callers, so frequent probes do not hit the databases.
+    """
+
+    def __init__(self, name: str, check: Callable[[], Awaitable[bool]], ttl: float = None, timeout: float = None):
+        self.name = name
+        self._check = check
+        self._ttl = settings.READINESS_CACHE_SECONDS if ttl is None else ttl
+        self._timeout = settings.READINESS_CHECK_TIMEOUT_SECONDS if timeout is None else timeout
+        self._lock = asyncio.Lock()
+        self._result = False
+        self._checked_at = None
+
+    def _fresh(self) -> bool:
+        return self._checked_at is not None and time.monotonic() - self._checked_at < self._ttl
+
+    async def __call__(self) -> bool:
+        if self._fresh():
+            return self._result
+        async with self._lock:
+            if self._fresh():
+                return self._result
+            try:
+                self._result = bool(await asyncio.wait_for(self._check(), timeout=self._timeout))
+            except Exception as exc:
+                logger.warning("Readiness check %s failed: %s: %s", self.name, type(exc).__name__, exc)
+                self._result = False
+            self._checked_at = time.monotonic()
+        return self._result
+
+
+# The schema is re-checked too, so a worker that booted before `manage migrate`
+# finished becomes ready without a restart
+readiness_checks = {
+    "schema": CachedCheck("schema", schema_current),
+    "sql": CachedCheck("sql", sql_available),
+    "mongo": CachedCheck("mongo", mongo_available),
+}
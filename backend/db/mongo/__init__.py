@@ -1,3 +1,3 @@
-from .mongoDB import surveys_collection, db, client
+from .mongoDB import surveys_collection, db, get_client, get_database
 
-__all__ = ["surveys_collection", "db", "client"]
+__all__ = ["surveys_collection", "db", "get_client", "get_database"]
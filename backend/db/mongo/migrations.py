@@ -1,11 +1,31 @@
+import asyncio
+import hashlib
+import inspect
 import logging
-
-from backend.config.settings import MONGO_MIGRATION_STRATEGY
-from backend.db.mongo.mongoDB import surveys_collection
-from pymongo.errors import OperationFailure
+import os
+import socket
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Optional
+
+from backend.config.settings import (
+    MONGO_MIGRATION_BATCH_SIZE,
+    MONGO_MIGRATION_LOCK_TTL_SECONDS,
+    MONGO_MIGRATION_STRATEGY,
+)
+from backend.db.mongo.mongoDB import db, surveys_collection
+from pymongo import DeleteOne, UpdateOne
+from pymongo.errors import DuplicateKeyError, OperationFailure
 
 logger = logging.getLogger(__name__)
 
+# Ledger of applied migrations ({_id: migration id, checksum, applied_at, duration_ms})
+migrations_collection = db["schema_migrations"]
+# Mutex documents so only one worker/deploy runs migrations at a time
+locks_collection = db["migration_locks"]
+LOCK_ID = "schema_migrations"
+
 INDEX_NAME = "uniq_owner_title"
 INDEX_KEYS = [("created_by_id", 1), ("title", 1)]
 INDEX_OPTIONS = {
@@ -36,31 +56,51 @@ def _spec_matches(idx_doc):
     )
 
 
-async def _cleanup_problematic_titles() -> None:
-    null_title_docs = await surveys_collection.find({"title": None}).to_list(length=None)
-    missing_title_docs = await surveys_collection.find({"title": {"$exists": False}}).to_list(length=None)
-    empty_title_docs = await surveys_collection.find({"title": ""}).to_list(length=None)
+PROBLEMATIC_TITLE_FILTER = {
+    "$or": [
+        {"title": None},
+        {"title": {"$exists": False}},
+        {"title": ""},
+    ]
+}
+
+
+async def _flush(ops: list) -> None:
+    """Send buffered write models as one unordered bulk write."""
+    if ops:
+        await surveys_collection.bulk_write(ops, ordered=False)
+        ops.clear()
+
 
-    problematic_docs = null_title_docs + missing_title_docs + empty_title_docs
-    if not problematic_docs:
+async def _cleanup_problematic_titles(batch_size: int = MONGO_MIGRATION_BATCH_SIZE) -> None:
+    """
+    Stream documents with null/missing/empty titles through one cursor
+    and fix them in unordered bulk writes of batch_size operations.
+    """
+    if MONGO_MIGRATION_STRATEGY not in {"update", "delete"}:
         return
 
-    logger.info(
-        "Found %s documents with null/missing/empty titles.",
-        len(problematic_docs),
-    )
+    ops = []
+    processed = 0
+    async for doc in surveys_collection.find(PROBLEMATIC_TITLE_FILTER, {"_id": 1}, batch_size=batch_size):
+        if MONGO_MIGRATION_STRATEGY == "update":
+            ops.append(UpdateOne({"_id": doc["_id"]}, {"$set": {"title": f"Untitled Survey {doc['_id']}"}}))
+        else:
+            ops.append(DeleteOne({"_id": doc["_id"]}))
+        processed += 1
+        if len(ops) >= batch_size:
+            await _flush(ops)
+    await _flush(ops)
 
-    if MONGO_MIGRATION_STRATEGY == "update":
-        for doc in problematic_docs:
-            await surveys_collection.update_one(
-                {"_id": doc["_id"]},
-                {"$set": {"title": f"Untitled Survey {doc['_id']}"}},
-            )
-    elif MONGO_MIGRATION_STRATEGY == "delete":
-        await surveys_collection.delete_many({"_id": {"$in": [doc["_id"] for doc in problematic_docs]}})
+    if processed:
+        logger.info("Cleaned up %s documents with null/missing/empty titles.", processed)
 
 
-async def _cleanup_duplicate_owner_titles() -> None:
+async def _cleanup_duplicate_owner_titles(batch_size: int = MONGO_MIGRATION_BATCH_SIZE) -> None:
+    """
+    Stream duplicate owner/title groups from an aggregation cursor, keeping the
+    oldest document in each group and renaming or deleting the rest in bulk.
+    """
     pipeline = [
         {
             "$match": {
@@ -78,34 +118,38 @@ async def _cleanup_duplicate_owner_titles() -> None:
         {"$match": {"count": {"$gt": 1}}},
     ]
 
-    duplicates = await surveys_collection.aggregate(pipeline).to_list(length=None)
-    if not duplicates:
-        return
-
-    logger.info("Found duplicate survey titles for %s owner/title pairs.", len(duplicates))
-
-    for dup in duplicates:
+    ops = []
+    groups = 0
+    async for dup in surveys_collection.aggregate(pipeline, allowDiskUse=True, batchSize=batch_size):
+        groups += 1
         docs_sorted = sorted(dup["docs"])
         to_keep = docs_sorted[0]
         to_process = docs_sorted[1:]
         title = dup["_id"]["title"]
 
         if MONGO_MIGRATION_STRATEGY == "delete":
-            await surveys_collection.delete_many({"_id": {"$in": to_process}})
+            ops.extend(DeleteOne({"_id": doc_id}) for doc_id in to_process)
             logger.debug(
-                "Deleted %s duplicates for owner %s and title '%s', keeping %s",
+                "Deleting %s duplicates for owner %s and title '%s', keeping %s",
                 len(to_process),
                 dup["_id"]["created_by_id"],
                 title,
                 to_keep,
             )
         elif MONGO_MIGRATION_STRATEGY == "update":
-            for i, doc_id in enumerate(to_process, start=1):
-                new_title = f"{title} (Duplicate {i}-{str(doc_id)[-6:]})"
-                await surveys_collection.update_one(
+            ops.extend(
+                UpdateOne(
                     {"_id": doc_id},
-                    {"$set": {"title": new_title}},
+                    {"$set": {"title": f"{title} (Duplicate {i}-{str(doc_id)[-6:]})"}},
                 )
+                for i, doc_id in enumerate(to_process, start=1)
+            )
+        if len(ops) >= batch_size:
+            await _flush(ops)
+    await _flush(ops)
+
+    if groups:
+        logger.info("Cleaned up duplicate survey titles for %s owner/title pairs.", groups)
 
 
 async def _backfill_status_from_legacy_public_flag() -> None:
@@ -123,15 +167,13 @@ async def _backfill_status_from_legacy_public_flag() -> None:
     )
 
 
-async def run_migrations() -> None:
+async def _ensure_owner_title_index() -> None:
     """
-    Idempotent index migration.
-    Ensures a unique partial index on (created_by_id, title) so titles are unique per user.
+    Ensure a unique partial index on (created_by_id, title) so titles are unique per user.
+    Legacy rows that would violate it are cleaned up according to MONGO_MIGRATION_STRATEGY.
     """
     existing = await _indexes_by_name(surveys_collection)
 
-    await _backfill_status_from_legacy_public_flag()
-
     if INDEX_NAME in existing and _spec_matches(existing[INDEX_NAME]):
         logger.info("Owner/title index already correct; skipping creation.")
         return
@@ -171,4 +213,139 @@ async def run_migrations() -> None:
         else:
             raise
 
-    logger.info("Migration completed successfully!")
+
+@dataclass(frozen=True)
+class Migration:
+    """An ordered, idempotent migration step recorded once in the ledger."""
+
+    id: str
+    apply: Callable[[], Awaitable[None]]
+
+    @property
+    def checksum(self) -> Optional[str]:
+        """Hash of the step's source, or None when it is unavailable (e.g. .pyc-only deploys)."""
+        try:
+            source = inspect.getsource(self.apply)
+        except (OSError, TypeError):
+            return None
+        return hashlib.sha256(source.encode()).hexdigest()
+
+
+# Append only: never reorder or rename applied ids.
+MIGRATIONS: list[Migration] = [
+    Migration("0001_backfill_status_from_is_public", _backfill_status_from_legacy_public_flag),
+    Migration("0002_owner_title_unique_index", _ensure_owner_title_index),
+]
+
+
+async def _acquire_lock(owner: str, ttl_seconds: int) -> bool:
+    """Take the migration mutex, or steal it once the previous holder's lease expired."""
+    now = datetime.now(timezone.utc)
+    try:
+        await locks_collection.find_one_and_update(
+            {"_id": LOCK_ID, "expires_at": {"$lt": now}},
+            {"$set": {"owner": owner, "expires_at": now + timedelta(seconds=ttl_seconds)}},
+            upsert=True,
+        )
+    except DuplicateKeyError:
+        # Upsert collided with a live lock held by someone else
+        return False
+    return True
+
+
+async def _renew_lock(owner: str, ttl_seconds: int) -> bool:
+    """Extend our lease on the migration mutex; False once another runner holds it."""
+    result = await locks_collection.update_one(
+        {"_id": LOCK_ID, "owner": owner},
+        {"$set": {"expires_at": datetime.now(timezone.utc) + timedelta(seconds=ttl_seconds)}},
+    )
+    return result.matched_count == 1
+
+
+async def _heartbeat(owner: str, ttl_seconds: int) -> None:
+    """Renew the lease every third of its TTL so long migrations keep the lock."""
+    while True:
+        await asyncio.sleep(ttl_seconds / 3)
+        try:
+            if not await _renew_lock(owner, ttl_seconds):
+                logger.error("MongoDB migration lock was taken over by another runner.")
+                return
+        except Exception:
+            logger.warning("Renewing the MongoDB migration lock failed; retrying.", exc_info=True)
+
+
+async def _release_lock(owner: str) -> None:
+    await locks_collection.delete_one({"_id": LOCK_ID, "owner": owner})
+
+
+async def _applied_migrations() -> dict[str, dict]:
+    ids = [migration.id for migration in MIGRATIONS]
+    return {doc["_id"]: doc async for doc in migrations_collection.find({"_id": {"$in": ids}})}
+
+
+async def schema_is_current() -> bool:
+    """Fast boot check: one _id-index lookup in the schema_migrations ledger."""
+    try:
+        applied = await _applied_migrations()
+    except Exception:
+        logger.exception("MongoDB schema_migrations check failed")
+        return False
+    pending = [migration.id for migration in MIGRATIONS if migration.id not in applied]
+    if pending:
+        logger.error("MongoDB migrations pending: %s; run `python -m backend.manage migrate`.", pending)
+        return False
+    return True
+
+
+async def run_migrations(
+    lock_ttl_seconds: int = MONGO_MIGRATION_LOCK_TTL_SECONDS,
+    poll_interval: float = 1.0,
+) -> None:
+    """
+    Apply pending migrations in order, each exactly once.
+    Holds the migration mutex for the duration so concurrent runners wait instead of racing;
+    a heartbeat renews its lease, and ownership is re-checked before each ledger entry.
+    """
+    owner = f"{socket.gethostname()}:{os.getpid()}"
+    deadline = time.monotonic() + lock_ttl_seconds
+    while not await _acquire_lock(owner, lock_ttl_seconds):
+        if time.monotonic() >= deadline:
+            raise TimeoutError("Timed out waiting for the MongoDB migration lock")
+        logger.info("Another process is running MongoDB migrations; waiting...")
+        await asyncio.sleep(poll_interval)
+
+    heartbeat = asyncio.create_task(_heartbeat(owner, lock_ttl_seconds))
+    try:
+        applied = await _applied_migrations()
+        for migration in MIGRATIONS:
+            record = applied.get(migration.id)
+            if record is not None:
+                recorded, current = record.get("checksum"), migration.checksum
+                if recorded is not None and current is not None and recorded != current:
+                    logger.warning(
+                        "Applied migration %s has changed since it ran; it will not be re-run.",
+                        migration.id,
+                    )
+                continue
+
+            logger.info("Applying MongoDB migration %s ...", migration.id)
+            started = time.perf_counter()
+            await migration.apply()
+            if not await _renew_lock(owner, lock_ttl_seconds):
+                raise RuntimeError(
+                    f"Lost the MongoDB migration lock before recording {migration.id}"
+                )
+            await migrations_collection.insert_one(
+                {
+                    "_id": migration.id,
+                    "checksum": migration.checksum,
+                    "applied_at": datetime.now(timezone.utc),
+                    "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+                }
+            )
+    finally:
+        heartbeat.cancel()
+        await asyncio.gather(heartbeat, return_exceptions=True)
+        await _release_lock(owner)
+
+    logger.info("MongoDB migrations completed successfully!")
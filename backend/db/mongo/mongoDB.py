@@ -1,11 +1,87 @@
+"""
+MongoDB client, built on first use.
 
+`db` and `surveys_collection` are lightweight proxies that resolve to the
+Motor objects the first time one of their attributes is used, so importing
+this module does not create a client (or start its monitor threads).
+"""
 import os
+from functools import lru_cache
+
 import motor.motor_asyncio
+from pymongo.read_preferences import SecondaryPreferred
+
+from backend.config import settings
+from backend.db.slow_queries import SlowMongoCommandListener
+from backend.middleware.metrics import MongoPoolMetricsListener
+from backend.middleware.timing import MongoTimingListener
 
 
 MONGODB_URI = os.getenv("MONGODB_URI", "mongodb://localhost:27017")
 MONGODB_DB = os.getenv("MONGODB_DB", "survey")
 
-client = motor.motor_asyncio.AsyncIOMotorClient(MONGODB_URI)
-db = client[MONGODB_DB]
-surveys_collection = db["surveys"]
\ No newline at end of file
+
+@lru_cache(maxsize=None)
+def get_client() -> motor.motor_asyncio.AsyncIOMotorClient:
+    slow_query_listener = SlowMongoCommandListener()
+    client = motor.motor_asyncio.AsyncIOMotorClient(
+        MONGODB_URI,
+        minPoolSize=settings.MONGO_MIN_POOL_SIZE,
+        event_listeners=[MongoTimingListener(), MongoPoolMetricsListener(), slow_query_listener],
+    )
+    slow_query_listener.bind(client)
+    return client
+
+
+def get_database() -> motor.motor_asyncio.AsyncIOMotorDatabase:
+    return get_client()[MONGODB_DB]
+
+
+class LazyCollection:
+    """Proxy for a collection of the default database, resolved on first attribute access."""
+
+    def __init__(self, name: str, read_preference=None):
+        self._name = name
+        self._read_preference = read_preference
+        self._collection = None
+
+    def __getattr__(self, item):
+        if self._collection is None:
+            collection = get_database()[self._name]
+            if self._read_preference is not None:
+                collection = collection.with_options(read_preference=self._read_preference)
+            self._collection = collection
+        return getattr(self._collection, item)
+
+    def __repr__(self) -> str:
+        return f"LazyCollection({MONGODB_DB}.{self._name})"
+
+
+class LazyDatabase:
+    """Proxy for the default database; `db[name]` returns a LazyCollection."""
+
+    def __getitem__(self, name: str) -> LazyCollection:
+        return LazyCollection(name)
+
+    def __getattr__(self, item):
+        return getattr(get_database(), item)
+
+    def __repr__(self) -> str:
+        return f"LazyDatabase({MONGODB_DB})"
+
+
+def __getattr__(name: str):
+    # Backwards compatible module attribute, still resolved lazily
+    if name == "client":
+        return get_client()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+db = LazyDatabase()
+surveys_collection = db["surveys"]
+# Replica reads for endpoints that tolerate bounded staleness (see db.read_routing)
+surveys_secondary_collection = LazyCollection(
+    "surveys",
+    read_preference=SecondaryPreferred(max_staleness=settings.MONGO_MAX_STALENESS_SECONDS),
+)
+
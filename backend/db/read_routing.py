@@ -0,0 +1,44 @@
+"""
+Routing of reads to replicas while keeping read-your-writes for the writer.
+
+After a survey save, the response carries a short-lived cookie. While it is
+present, that browser's reads go to the primary. The window covers the replica
+staleness bound (MONGO_MAX_STALENESS_SECONDS plus one heartbeat), so once it
+expires any secondary the driver may pick already has the write.
+"""
+import time
+
+from fastapi import Request, Response
+
+from backend.config import settings
+from backend.db.mongo.mongoDB import surveys_collection, surveys_secondary_collection
+
+READ_YOUR_WRITES_COOKIE = "rw_until"
+
+
+def mark_recent_write(response: Response) -> None:
+    """Pin this client's reads to the primary for READ_YOUR_WRITES_SECONDS."""
+    window = settings.READ_YOUR_WRITES_SECONDS
+    response.set_cookie(
+        key=READ_YOUR_WRITES_COOKIE,
+        value=str(int(time.time()) + window),
+        httponly=True,
+        secure=True,
+        samesite="none",
+        path="/",
+        max_age=window,
+    )
+
+
+def has_recent_write(request: Request) -> bool:
+    try:
+        return int(request.cookies.get(READ_YOUR_WRITES_COOKIE, "0")) > time.time()
+    except ValueError:
+        return False
+
+
+def surveys_for_read(request: Request):
+    """Surveys collection to read from: a secondary when enabled and this client has no pending write."""
+    if settings.MONGO_SECONDARY_READS and not has_recent_write(request):
+        return surveys_secondary_collection
+    return surveys_collection
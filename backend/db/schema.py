@@ -0,0 +1,64 @@
+"""
+Schema lifecycle shared by the `manage migrate` command and app boot.
+
+`migrate` does the slow work (table creation, SQL and MongoDB migrations,
+demo seeding) once per deploy; `check_schema` is the fast boot-time check
+that only compares recorded schema versions. Both run as dependency graphs,
+so PostgreSQL and MongoDB work overlaps.
+"""
+from backend.config import settings
+from backend.db.mongo import migrations as mongo_migrations
+from backend.db.mongo.seed_data import seed_demo_survey
+from backend.db.sql import migrations as sql_migrations
+from backend.db.sql.init_db import ensure_answers_gin_index, init_database
+from backend.db.sql.seed_data import seed_demo_user
+from backend.startup import Step, run_graph
+
+
+async def _seed_demo_survey(results: dict) -> None:
+    demo_user = results["seed_demo_user"]
+    if demo_user:
+        await seed_demo_survey(
+            created_by_id=str(demo_user.id),
+            created_by_email=demo_user.email,
+        )
+
+
+def migration_steps() -> list[Step]:
+    # No timeouts: cancelling a streaming cleanup or backfill midway only means redoing it
+    return [
+        Step("init_database", lambda _: init_database()),
+        Step("sql_migrations", lambda _: sql_migrations.run_migrations(), depends_on=("init_database",)),
+        Step("answers_gin_index", lambda _: ensure_answers_gin_index(), depends_on=("init_database",)),
+        Step("seed_demo_user", lambda _: seed_demo_user(), depends_on=("sql_migrations",)),
+        Step("mongo_migrations", lambda _: mongo_migrations.run_migrations()),
+        Step(
+            "seed_demo_survey",
+            _seed_demo_survey,
+            depends_on=("seed_demo_user", "mongo_migrations"),
+        ),
+    ]
+
+
+def check_steps() -> list[Step]:
+    timeout = settings.STARTUP_CHECK_TIMEOUT_SECONDS
+    return [
+        Step("sql_schema", lambda _: sql_migrations.schema_is_current(), timeout=timeout),
+        Step("mongo_schema", lambda _: mongo_migrations.schema_is_current(), timeout=timeout),
+    ]
+
+
+async def migrate() -> None:
+    """Create tables, run every migration and seed demo data."""
+    report = await run_graph(migration_steps(), name="migrate")
+    if report.failed:
+        raise RuntimeError(f"Migration steps did not complete: {report.failed}")
+
+
+async def check_schema() -> dict[str, bool]:
+    """Return whether each store's recorded schema version is current."""
+    report = await run_graph(check_steps(), name="schema check")
+    return {
+        "sql": report.result("sql_schema") is True,
+        "mongo": report.result("mongo_schema") is True,
+    }
@@ -0,0 +1,232 @@
+"""
+Slow-query log for SQL and MongoDB.
+
+Statements slower than SLOW_QUERY_SQL_MS / SLOW_QUERY_MONGO_MS are logged on
+the backend.slow_queries logger with their parameters redacted. Outside
+production (and with SLOW_QUERY_EXPLAIN enabled) the log line also carries
+the query plan, captured in the background on a separate connection:
+EXPLAIN (ANALYZE, BUFFERS) for plain SQL SELECTs, plain EXPLAIN for
+INSERT/UPDATE/DELETE (so they are not executed twice), and explain
+(executionStats) for MongoDB commands.
+"""
+
+import asyncio
+import json
+import logging
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional
+
+from pymongo import monitoring
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from backend.config import settings
+
+logger = logging.getLogger("backend.slow_queries")
+
+# Commands that never get explained (explain itself, handshakes, session plumbing)
+_MONGO_UNEXPLAINABLE = {"explain", "hello", "isMaster", "ismaster", "ping", "endSessions", "getMore", "killCursors"}
+_MONGO_EXPLAINABLE = {"find", "aggregate", "count", "distinct", "update", "delete", "findAndModify"}
+_MONGO_INTERNAL_FIELDS = {"lsid", "txnNumber", "$clusterTime", "$db", "$readPreference", "$signature"}
+
+
+def explain_enabled() -> bool:
+    return settings.SLOW_QUERY_EXPLAIN and settings.ENVIRONMENT.lower() != "production"
+
+
+def redact_sql_parameters(parameters: Any) -> Any:
+    """Replace bound values with their type name, keeping the shape (and NULLs)."""
+    if isinstance(parameters, dict):
+        return {key: redact_sql_parameters(value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [redact_sql_parameters(value) for value in parameters]
+    if parameters is None:
+        return None
+    return f"<{type(parameters).__name__}>"
+
+
+def redact_mongo_command(command: dict) -> dict:
+    """Keep the command name, collection, field names and operators; replace values with '?'."""
+
+    def redact(value):
+        if isinstance(value, dict):
+            return {key: redact(item) for key, item in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [redact(item) for item in value]
+        return "?"
+
+    redacted = {}
+    for index, (key, value) in enumerate(command.items()):
+        if key in _MONGO_INTERNAL_FIELDS:
+            continue
+        # First entry is {command_name: collection}
+        redacted[key] = value if index == 0 else redact(value)
+    return redacted
+
+
+def _log(payload: dict) -> None:
+    logger.warning(json.dumps({"event": "slow_query", **payload}, default=str))
+
+
+def install_sql_slow_query_log(engine) -> None:
+    """Log slow statements of an AsyncEngine, with EXPLAIN output outside production."""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    explainer = SqlExplainer(sync_engine.url)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("slow_query_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        duration_ms = (time.perf_counter() - conn.info["slow_query_start_time"].pop()) * 1000
+        if duration_ms < settings.SLOW_QUERY_SQL_MS:
+            return
+
+        payload = {
+            "store": "sql",
+            "duration_ms": round(duration_ms, 2),
+            "statement": statement,
+            "parameters": redact_sql_parameters(parameters),
+        }
+        if not (explain_enabled() and not executemany and explainer.submit(statement, parameters, payload)):
+            _log(payload)
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _handle_error(exception_context):
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("slow_query_start_time"):
+            conn.info["slow_query_start_time"].pop()
+
+
+_LOCKING_CLAUSE = re.compile(r"\bFOR\s+(UPDATE|SHARE|NO\s+KEY\s+UPDATE|KEY\s+SHARE)\b", re.IGNORECASE)
+
+
+def explain_options(statement: str) -> Optional[str]:
+    """
+    EXPLAIN options for a statement, or None when it is not explained.
+    Only a plain SELECT is ANALYZEd (executed again); DML gets its plan only,
+    and WITH (possibly data-modifying CTEs), DDL and everything else is skipped.
+    """
+    verb = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+    if verb == "SELECT" and not _LOCKING_CLAUSE.search(statement):
+        return "(ANALYZE, BUFFERS, FORMAT TEXT)"
+    if verb in ("SELECT", "INSERT", "UPDATE", "DELETE"):
+        return "(FORMAT TEXT)"
+    return None
+
+
+class SqlExplainer:
+    """
+    Explains slow statements off the request path.
+
+    The EXPLAIN runs in a background task on its own unpooled connection, inside
+    a transaction that is always rolled back, so it neither delays the request
+    nor touches (or aborts) the caller's transaction.
+    """
+
+    def __init__(self, url):
+        self._url = url
+        self._engine = None
+        self._tasks: set[asyncio.Task] = set()
+
+    def submit(self, statement: str, parameters, payload: dict) -> bool:
+        """Schedule explain-then-log; False when there is nothing to explain."""
+        options = explain_options(statement)
+        if options is None:
+            return False
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        task = loop.create_task(self._explain_and_log(f"EXPLAIN {options} {statement}", parameters, payload))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return True
+
+    async def _explain_and_log(self, explain: str, parameters, payload: dict) -> None:
+        try:
+            if self._engine is None:
+                self._engine = create_async_engine(self._url, poolclass=NullPool)
+            async with self._engine.connect() as conn:
+                result = await conn.exec_driver_sql(explain, tuple(parameters or ()))
+                payload["plan"] = "\n".join(str(row[0]) for row in result.fetchall())
+                await conn.rollback()
+        except Exception as exc:
+            payload["plan"] = f"EXPLAIN failed: {type(exc).__name__}: {exc}"
+        _log(payload)
+
+
+class SlowMongoCommandListener(monitoring.CommandListener):
+    """
+    pymongo command listener that logs slow commands.
+
+    Explains run on a dedicated thread through the synchronous client bound with
+    ``bind``, because listeners must not issue commands themselves.
+    """
+
+    def __init__(self):
+        self._commands: dict[tuple, tuple[str, dict]] = {}
+        self._lock = threading.Lock()
+        self._client = None
+        self._explainer: Optional[ThreadPoolExecutor] = None
+
+    def bind(self, client) -> None:
+        """Bind the (Motor or pymongo) client used to run explains."""
+        self._client = getattr(client, "delegate", client)
+
+    def started(self, event):
+        if event.command_name in _MONGO_UNEXPLAINABLE:
+            return
+        with self._lock:
+            self._commands[(event.request_id, event.connection_id)] = (event.database_name, event.command)
+
+    def succeeded(self, event):
+        self._finish(event)
+
+    def failed(self, event):
+        self._finish(event)
+
+    def _finish(self, event):
+        with self._lock:
+            started = self._commands.pop((event.request_id, event.connection_id), None)
+        if started is None:
+            return
+        duration_ms = event.duration_micros / 1000
+        if duration_ms < settings.SLOW_QUERY_MONGO_MS:
+            return
+
+        database_name, command = started
+        payload = {
+            "store": "mongo",
+            "duration_ms": round(duration_ms, 2),
+            "database": database_name,
+            "command": redact_mongo_command(command),
+        }
+        if explain_enabled() and self._client is not None and event.command_name in _MONGO_EXPLAINABLE:
+            if self._explainer is None:
+                self._explainer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mongo-explain")
+            self._explainer.submit(self._explain_and_log, database_name, command, payload)
+        else:
+            _log(payload)
+
+    def _explain_and_log(self, database_name: str, command: dict, payload: dict) -> None:
+        explained = {key: value for key, value in command.items() if key not in _MONGO_INTERNAL_FIELDS}
+        try:
+            plan = self._client[database_name].command(
+                {"explain": explained, "verbosity": "executionStats"}
+            )
+            payload["plan"] = {
+                "queryPlanner": plan.get("queryPlanner", {}).get("winningPlan"),
+                "executionStats": {
+                    key: plan.get("executionStats", {}).get(key)
+                    for key in ("nReturned", "totalKeysExamined", "totalDocsExamined", "executionTimeMillis")
+                },
+            }
+        except Exception as exc:
+            payload["plan"] = f"explain failed: {type(exc).__name__}: {exc}"
+        _log(payload)
@@ -1,24 +1,48 @@
 """
 Database initialization and table creation.
 """
-from sqlalchemy import create_engine
-from sqlalchemy.ext.asyncio import create_async_engine
-from backend.config import settings
-from backend.models.db.sql.auth import Base
+from backend.db.sql.sql_driver import get_maintenance_engine, get_sync_engine
+from backend.models.db.sql.auth import ANSWERS_GIN_INDEX, Base
+from sqlalchemy import text
 import logging
 import asyncio
 
 logger = logging.getLogger(__name__)
 
 
-def to_asyncpg(url: str) -> str:
-    # Railway: postgresql://...  -> postgresql+asyncpg://...
-    if url.startswith("postgresql://"):
-        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
-    # Some providers still use postgres://
-    if url.startswith("postgres://"):
-        return url.replace("postgres://", "postgresql+asyncpg://", 1)
-    return url
+async def ensure_answers_gin_index() -> None:
+    """
+    Build the jsonb_path_ops GIN index on survey_responses.answers for tables
+    created before it existed. CONCURRENTLY keeps ingest writing during the
+    build and needs a connection outside a transaction; the build can take
+    minutes, so it runs without a statement_timeout. An INVALID leftover from
+    an interrupted build is dropped first, since IF NOT EXISTS would keep it.
+    Errors propagate so `manage migrate` fails.
+    """
+    async with get_maintenance_engine().connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text("SET statement_timeout = 0"))
+        valid = (
+            await conn.execute(
+                text(
+                    "SELECT i.indisvalid FROM pg_index i "
+                    "JOIN pg_class c ON c.oid = i.indexrelid WHERE c.relname = :name"
+                ),
+                {"name": ANSWERS_GIN_INDEX},
+            )
+        ).scalar_one_or_none()
+        if valid is True:
+            return
+        if valid is False:
+            logger.warning("Dropping invalid index %s left by an interrupted build.", ANSWERS_GIN_INDEX)
+            await conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {ANSWERS_GIN_INDEX}"))
+        logger.info("Building index %s.", ANSWERS_GIN_INDEX)
+        await conn.execute(
+            text(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {ANSWERS_GIN_INDEX} "
+                "ON survey_responses USING gin (answers jsonb_path_ops)"
+            )
+        )
 
 
 async def init_database(max_retries: int = 10, retry_delay: int = 3):
@@ -34,19 +58,11 @@ async def init_database(max_retries: int = 10, retry_delay: int = 3):
             logger.info(
                 f"Attempting to initialize database (attempt {attempt + 1}/{max_retries})...")
 
-            # Use async engine for async operations
-            engine = create_async_engine(
-                to_asyncpg(settings.DATABASE_URL),
-                echo=False,
-                pool_pre_ping=True,
-                pool_recycle=3600,
-            )
-
-            # Create all tables asynchronously
-            async with engine.begin() as conn:
+            # Create all tables on the maintenance engine: unpooled, so each retry dials afresh,
+            # and without a statement_timeout that lock waits on busy tables would trip
+            async with get_maintenance_engine().begin() as conn:
                 await conn.run_sync(Base.metadata.create_all)
 
-            await engine.dispose()
             logger.info("Database tables created successfully")
             return
 
@@ -70,8 +86,7 @@ def create_tables_sync():
     """Synchronous version for direct execution."""
     try:
         logger.info("Creating database tables synchronously...")
-        engine = create_engine(settings.DATABASE_URL)
-        Base.metadata.create_all(bind=engine)
+        Base.metadata.create_all(bind=get_sync_engine())
     except Exception as e:
         logger.error(f"Failed to create tables: {e}")
         raise
@@ -3,18 +3,24 @@ Migration utilities for SQL (PostgreSQL) database.
 Handles demo user password synchronization and other schema/data migrations.
 """
 import logging
-from sqlalchemy import func, select, update, delete
+from sqlalchemy import func, select, text, update, delete
 
 from backend.config.settings import SQL_MIGRATION_STRATEGY, ENVIRONMENT
-from backend.db.sql.sql_driver import AsyncSessionLocal
+from backend.db.sql.sql_driver import AsyncSessionLocal, MaintenanceSessionLocal
 from backend.models.db.sql.auth import User, RefreshToken
 from backend.routers.auth.security_utl import hash_password
+from backend.services.surveys.response_answers import backfill_response_answers
 
 logger = logging.getLogger(__name__)
 
 DEMO_USER_EMAIL = "kek@lol.com"
 DEMO_USER_PASSWORD = "Test@1234"
 
+# Bump whenever a migration is added below; app boot refuses readiness until
+# `python -m backend.manage migrate` has recorded this version.
+SCHEMA_VERSION = 2
+SCHEMA_COMPONENT = "sql"
+
 
 async def _reset_auth_data() -> None:
     """
@@ -25,7 +31,7 @@ async def _reset_auth_data() -> None:
         logger.warning("Skipping auth reset in production environment.")
         return
 
-    async with AsyncSessionLocal() as session:
+    async with MaintenanceSessionLocal() as session:
         try:
             await session.execute(delete(RefreshToken))
             await session.execute(delete(User))
@@ -44,7 +50,7 @@ async def _sync_demo_user_password() -> None:
     email = DEMO_USER_EMAIL.lower().strip()
     expected_password_hash = hash_password(DEMO_USER_PASSWORD)
 
-    async with AsyncSessionLocal() as session:
+    async with MaintenanceSessionLocal() as session:
         try:
             existing = (
                 await session.execute(select(User).where(func.lower(User.email) == email))
@@ -91,13 +97,102 @@ async def _sync_demo_user_password() -> None:
             logger.exception("Failed to sync demo user password")
 
 
+async def _add_refresh_token_version_column() -> None:
+    """
+    Add refresh_tokens.token_version for session-family revocation.
+    Existing tokens are backfilled with their owner's current token version,
+    so sessions that are valid today stay valid after the migration.
+    """
+    async with MaintenanceSessionLocal() as session:
+        try:
+            exists = (
+                await session.execute(
+                    text(
+                        "SELECT 1 FROM information_schema.columns "
+                        "WHERE table_schema = current_schema() "
+                        "AND table_name = 'refresh_tokens' AND column_name = 'token_version'"
+                    )
+                )
+            ).scalar_one_or_none()
+            if exists:
+                return
+
+            await session.execute(
+                text(
+                    "ALTER TABLE refresh_tokens "
+                    "ADD COLUMN token_version INTEGER NOT NULL DEFAULT 0"
+                )
+            )
+            await session.execute(
+                text(
+                    "UPDATE refresh_tokens rt SET token_version = u.token_version "
+                    "FROM users u WHERE rt.user_id = u.id AND u.token_version <> 0"
+                )
+            )
+            await session.commit()
+            logger.info("Added token_version column to refresh_tokens.")
+        except Exception:
+            await session.rollback()
+            logger.exception("Failed to add refresh_tokens.token_version column")
+            # Refresh and login queries need the column; never record the schema as current without it
+            raise
+
+
+async def _record_schema_version() -> None:
+    async with MaintenanceSessionLocal() as session:
+        await session.execute(
+            text(
+                "CREATE TABLE IF NOT EXISTS schema_version ("
+                "component TEXT PRIMARY KEY, "
+                "version INTEGER NOT NULL, "
+                "applied_at TIMESTAMPTZ NOT NULL DEFAULT now())"
+            )
+        )
+        await session.execute(
+            text(
+                "INSERT INTO schema_version (component, version) VALUES (:component, :version) "
+                "ON CONFLICT (component) DO UPDATE SET version = EXCLUDED.version, applied_at = now()"
+            ),
+            {"component": SCHEMA_COMPONENT, "version": SCHEMA_VERSION},
+        )
+        await session.commit()
+
+
+async def schema_is_current() -> bool:
+    """
+    Fast boot check: one primary-key lookup against schema_version, on the
+    interactive pool (migrations themselves run on the maintenance engine).
+    Returns False when the table is missing or holds an older version.
+    """
+    async with AsyncSessionLocal() as session:
+        try:
+            version = (
+                await session.execute(
+                    text("SELECT version FROM schema_version WHERE component = :component"),
+                    {"component": SCHEMA_COMPONENT},
+                )
+            ).scalar_one_or_none()
+        except Exception:
+            logger.exception("SQL schema version check failed")
+            return False
+    if version is None or version < SCHEMA_VERSION:
+        logger.error("SQL schema version %s is behind %s; run `python -m backend.manage migrate`.", version, SCHEMA_VERSION)
+        return False
+    return True
+
+
 async def run_migrations() -> None:
     """
     Run all SQL database migrations.
     Ensures demo user password is synchronized to the expected default.
+    Every step runs on the maintenance engine, without a statement_timeout.
     """
     logger.info("Running SQL migrations with strategy '%s'.", SQL_MIGRATION_STRATEGY)
+    await _add_refresh_token_version_column()
     if SQL_MIGRATION_STRATEGY == "delete":
         await _reset_auth_data()
     await _sync_demo_user_password()
+    # survey_response_answers itself is created by init_database (create_all)
+    await backfill_response_answers()
+    await _record_schema_version()
     logger.info("SQL migrations completed successfully!")
@@ -5,7 +5,7 @@ import logging
 
 from sqlalchemy import func, select
 
-from backend.db.sql.sql_driver import AsyncSessionLocal
+from backend.db.sql.sql_driver import MaintenanceSessionLocal
 from backend.models.db.sql.auth import User
 from backend.routers.auth.security_utl import hash_password
 
@@ -23,7 +23,7 @@ async def seed_demo_user() -> User | None:
     """
     email = DEMO_USER_EMAIL.lower().strip()
 
-    async with AsyncSessionLocal() as session:
+    async with MaintenanceSessionLocal() as session:
         try:
             existing = (
                 await session.execute(select(User).where(func.lower(User.email) == email))
@@ -1,28 +1,277 @@
+"""
+SQLAlchemy engines and session factories.
+
+Engines are built on first use, not at import. Each workload (interactive,
+ingest, read, analytics) gets its own shared async engine with its own pool size
+and statement_timeout; read and analytics use the replica at DATABASE_READ_URL
+when one is configured. Without a replica, reads share the interactive engine,
+and the pools on the primary are sized to fit SQL_CONNECTION_BUDGET. The synchronous engine is only created for callers that
+explicitly ask for it (get_sync_engine / get_db).
+"""
+from dataclasses import dataclass, replace
+from functools import lru_cache
+
 from sqlalchemy import create_engine
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import SessionTransactionOrigin, sessionmaker
+from sqlalchemy.pool import NullPool
 from backend.config import settings
-from backend.db.sql.init_db import to_asyncpg
-
-# Synchronous engine for sync operations
-engine = create_engine(
-    settings.DATABASE_URL,
-    pool_size=10,
-    max_overflow=20,
-    pool_pre_ping=True,
-    pool_recycle=1800,
+from backend.db.slow_queries import install_sql_slow_query_log
+from backend.middleware.metrics import MeteredAsyncAdaptedQueuePool, register_sql_pool
+from backend.middleware.timing import instrument_engine
+
+
+def to_asyncpg(url: str) -> str:
+    # Railway: postgresql://...  -> postgresql+asyncpg://...
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    # Some providers still use postgres://
+    if url.startswith("postgres://"):
+        return url.replace("postgres://", "postgresql+asyncpg://", 1)
+    return url
+
+
+@dataclass(frozen=True)
+class WorkloadPool:
+    """Sizing and per-statement time limit of one workload's connection pool."""
+
+    size: int
+    max_overflow: int
+    statement_timeout_ms: int
+    replica: bool = False  # served by DATABASE_READ_URL when configured
+
+
+def _budgeted(pools: dict[str, WorkloadPool], connections: int) -> dict[str, WorkloadPool]:
+    """Scale pools down proportionally so their size + max_overflow fits in `connections`."""
+    demand = sum(pool.size + pool.max_overflow for pool in pools.values())
+    if demand <= connections:
+        return pools
+    scale = connections / demand
+    budgeted = {}
+    for name, pool in pools.items():
+        size = max(1, int(pool.size * scale))
+        max_overflow = max(0, int((pool.size + pool.max_overflow) * scale) - size)
+        budgeted[name] = replace(pool, size=size, max_overflow=max_overflow)
+    return budgeted
+
+
+def connections_per_worker() -> int:
+    return max(1, settings.SQL_CONNECTION_BUDGET // max(1, settings.WEB_CONCURRENCY))
+
+
+def workload_pools() -> dict[str, WorkloadPool]:
+    """
+    Separate pools per workload, so heavy analytics queries can only exhaust
+    their own connections and never block response ingestion or page loads.
+    Pools on the primary share this worker's slice of SQL_CONNECTION_BUDGET.
+    Without a replica there is no separate read pool (see resolve_workload).
+    """
+    primary = {
+        "interactive": WorkloadPool(
+            settings.SQL_POOL_INTERACTIVE_SIZE,
+            settings.SQL_POOL_INTERACTIVE_MAX_OVERFLOW,
+            settings.SQL_POOL_INTERACTIVE_STATEMENT_TIMEOUT_MS,
+        ),
+        "ingest": WorkloadPool(
+            settings.SQL_POOL_INGEST_SIZE,
+            settings.SQL_POOL_INGEST_MAX_OVERFLOW,
+            settings.SQL_POOL_INGEST_STATEMENT_TIMEOUT_MS,
+        ),
+    }
+    replica = {
+        "read": WorkloadPool(
+            settings.SQL_POOL_READ_SIZE,
+            settings.SQL_POOL_READ_MAX_OVERFLOW,
+            settings.SQL_POOL_READ_STATEMENT_TIMEOUT_MS,
+            replica=True,
+        ),
+        "analytics": WorkloadPool(
+            settings.SQL_POOL_ANALYTICS_SIZE,
+            settings.SQL_POOL_ANALYTICS_MAX_OVERFLOW,
+            settings.SQL_POOL_ANALYTICS_STATEMENT_TIMEOUT_MS,
+            replica=True,
+        ),
+    }
+    if not settings.DATABASE_READ_URL:
+        # Analytics keeps its own (small) pool for isolation, but on the primary it counts against the budget
+        primary["analytics"] = replace(replica.pop("analytics"), replica=False)
+        replica.pop("read")
+    return {**_budgeted(primary, connections_per_worker()), **replica}
+
+
+def resolve_workload(workload: str) -> str:
+    """The workload whose engine serves `workload`: without a replica, reads share the interactive pool."""
+    if workload == "read" and not settings.DATABASE_READ_URL:
+        return "interactive"
+    return workload
+
+
+@lru_cache(maxsize=None)
+def get_async_engine(workload: str = "interactive") -> AsyncEngine:
+    """The process-wide async engine for `workload`, created on first call."""
+    if resolve_workload(workload) != workload:
+        return get_async_engine(resolve_workload(workload))
+    pool = workload_pools()[workload]
+    url = settings.DATABASE_READ_URL if pool.replica else settings.DATABASE_URL
+    async_engine = create_async_engine(
+        to_asyncpg(url),
+        poolclass=MeteredAsyncAdaptedQueuePool,
+        pool_size=pool.size,
+        max_overflow=pool.max_overflow,
+        pool_pre_ping=True,
+        pool_recycle=1800,
+        connect_args={"server_settings": {"statement_timeout": str(pool.statement_timeout_ms)}},
+    )
+    instrument_engine(async_engine)
+    install_sql_slow_query_log(async_engine)
+    register_sql_pool(workload, async_engine)
+    return async_engine
+
+
+@lru_cache(maxsize=None)
+def get_maintenance_engine() -> AsyncEngine:
+    """
+    Unpooled engine on the primary without a statement_timeout, for migrations,
+    backfills and index builds that legitimately run for minutes. Request
+    handlers never use it.
+    """
+    return create_async_engine(
+        to_asyncpg(settings.DATABASE_URL),
+        poolclass=NullPool,
+        connect_args={"server_settings": {"statement_timeout": "0"}},
+    )
+
+
+@lru_cache(maxsize=None)
+def get_sync_engine():
+    """Synchronous engine for scripts and sync code paths; never built by the app itself."""
+    return create_engine(
+        settings.DATABASE_URL,
+        pool_size=10,
+        max_overflow=20,
+        pool_pre_ping=True,
+        pool_recycle=1800,
+    )
+
+
+class ReleasingAsyncSession(AsyncSession):
+    """
+    AsyncSession that can hand its pooled connection back between statements.
+
+    Like any session it checks a connection out on its first statement and
+    keeps it for the transaction. ``release()`` commits the transaction when
+    it was autobegun and has only run plain SELECTs (with expire_on_commit=False
+    loaded objects stay usable), which returns the connection to the pool.
+    Routes call it at well-defined points, such as before awaiting MongoDB,
+    so reads are not each followed by a COMMIT round trip. Anything that writes
+    (pending ORM changes, INSERT/UPDATE/DELETE/DDL, text(), SELECT ... FOR UPDATE)
+    or runs inside an explicit begin() is left alone until commit/rollback.
+    """
+
+    _wrote = False
+
+    def _has_pending_writes(self) -> bool:
+        return bool(self.new or self.dirty or self.deleted)
+
+    @staticmethod
+    def _is_plain_read(statement) -> bool:
+        return bool(getattr(statement, "is_select", False)) and getattr(statement, "_for_update_arg", None) is None
+
+    def _track(self, statement=None) -> None:
+        if (statement is not None and not self._is_plain_read(statement)) or self._has_pending_writes():
+            self._wrote = True
+
+    async def execute(self, statement, *args, **kwargs):
+        self._track(statement)
+        return await super().execute(statement, *args, **kwargs)
+
+    async def scalar(self, statement, *args, **kwargs):
+        self._track(statement)
+        return await super().scalar(statement, *args, **kwargs)
+
+    async def scalars(self, statement, *args, **kwargs):
+        self._track(statement)
+        return await super().scalars(statement, *args, **kwargs)
+
+    async def get(self, *args, **kwargs):
+        self._track()
+        return await super().get(*args, **kwargs)
+
+    async def release(self) -> None:
+        """Return the connection to the pool if the open transaction has only read."""
+        transaction = self.sync_session.get_transaction()
+        if (
+            transaction is None
+            or transaction.origin is not SessionTransactionOrigin.AUTOBEGIN
+            or self._wrote
+            or self._has_pending_writes()
+        ):
+            return
+        await self.commit()
+
+    async def commit(self) -> None:
+        await super().commit()
+        self._wrote = False
+
+    async def rollback(self) -> None:
+        await super().rollback()
+        self._wrote = False
+
+
+async def release_connection(session: AsyncSession) -> None:
+    """Call ReleasingAsyncSession.release(); a no-op for any other session."""
+    if isinstance(session, ReleasingAsyncSession):
+        await session.release()
+
+
+class _LazySessionmaker:
+    """Callable stand-in for a sessionmaker whose engine is resolved on first session."""
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._maker = None
+
+    def __call__(self, **kwargs):
+        if self._maker is None:
+            self._maker = self._factory()
+        return self._maker(**kwargs)
+
+
+SessionLocal = _LazySessionmaker(lambda: sessionmaker(bind=get_sync_engine(), expire_on_commit=False))
+AsyncSessionLocal = _LazySessionmaker(
+    lambda: async_sessionmaker(
+        bind=get_async_engine("interactive"), class_=ReleasingAsyncSession, expire_on_commit=False
+    )
+)
+IngestSessionLocal = _LazySessionmaker(
+    lambda: async_sessionmaker(
+        bind=get_async_engine("ingest"), class_=ReleasingAsyncSession, expire_on_commit=False
+    )
 )
-SessionLocal = sessionmaker(bind=engine, expire_on_commit=False)
-
-# Asynchronous engine for async operations
-async_engine = create_async_engine(
-    to_asyncpg(settings.DATABASE_URL),
-    pool_size=10,
-    max_overflow=20,
-    pool_pre_ping=True,
-    pool_recycle=1800,
+ReadSessionLocal = _LazySessionmaker(
+    lambda: async_sessionmaker(
+        bind=get_async_engine("read"), class_=ReleasingAsyncSession, expire_on_commit=False
+    )
 )
-AsyncSessionLocal = async_sessionmaker(bind=async_engine, expire_on_commit=False)
+AnalyticsSessionLocal = _LazySessionmaker(
+    lambda: async_sessionmaker(
+        bind=get_async_engine("analytics"), class_=ReleasingAsyncSession, expire_on_commit=False
+    )
+)
+# Migrations, backfills and seeding (`manage migrate`): no statement_timeout
+MaintenanceSessionLocal = _LazySessionmaker(
+    lambda: async_sessionmaker(bind=get_maintenance_engine(), expire_on_commit=False)
+)
+
+
+def __getattr__(name: str):
+    # Backwards compatible module attributes, still resolved lazily
+    if name == "async_engine":
+        return get_async_engine()
+    if name == "engine":
+        return get_sync_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 def get_db():
     """Get synchronous database session."""
@@ -33,9 +282,33 @@ def get_db():
         db.close()
 
 async def get_async_db():
-    """Get asynchronous database session."""
+    """Get asynchronous database session (interactive pool)."""
     async with AsyncSessionLocal() as session:
         try:
             yield session
         finally:
             await session.close()
+
+async def get_ingest_db():
+    """Get asynchronous session on the ingest pool (anonymous response submissions)."""
+    async with IngestSessionLocal() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+
+async def get_read_db():
+    """Get asynchronous session on the read pool (replica when DATABASE_READ_URL is set)."""
+    async with ReadSessionLocal() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+
+async def get_analytics_db():
+    """Get asynchronous session on the analytics pool (stats and exports; replica when configured)."""
+    async with AnalyticsSessionLocal() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
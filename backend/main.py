@@ -9,30 +9,31 @@ from backend.config import settings
 from backend.routers.auth import auth
 from backend.routers import surveys, responses
 from backend.middleware.error_handling import cache_body_middleware, validation_exception_handler
-from backend.db.mongo.migrations import run_migrations
-from backend.db.mongo.seed_data import seed_demo_survey
-from backend.db.sql.init_db import init_database
-from backend.db.sql.migrations import run_migrations as run_sql_migrations
-from backend.db.sql.seed_data import seed_demo_user
+from backend.middleware.metrics import PrometheusMiddleware
+from backend.middleware.timing import ServerTimingMiddleware
+from backend.db.health import readiness_checks, warm_pools
+from backend.db.schema import migrate
+from backend.routers import health
+from backend.services.auth.refresh_tokens import run_refresh_token_pruner
+import asyncio
 import logging
 from starlette.middleware.base import BaseHTTPMiddleware
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Initialize PostgreSQL database
-    await init_database()
-    # Run SQL migrations (handle demo user password sync)
-    await run_sql_migrations()
-    demo_user = await seed_demo_user()
-    # Run MongoDB migrations
-    await run_migrations()
-    if demo_user:
-        await seed_demo_survey(
-            created_by_id=str(demo_user.id),
-            created_by_email=demo_user.email,
-        )
+    # Migrations run once per deploy via `python -m backend.manage migrate`;
+    # workers only compare schema versions so cold start stays cheap.
+    if settings.MIGRATE_ON_STARTUP:
+        await migrate()
+    # Primes the cached /readyz schema check, which keeps re-checking until migrate has run
+    await asyncio.gather(readiness_checks["schema"](), warm_pools())
+    pruner = None
+    if settings.REFRESH_TOKEN_PRUNE_INTERVAL_SECONDS > 0:
+        pruner = asyncio.create_task(run_refresh_token_pruner())
     yield
+    if pruner:
+        pruner.cancel()
 
 
 tags_metadata = [
@@ -48,6 +49,10 @@ tags_metadata = [
         "name": "responses",
         "description": "Operations for managing survey responses and statistics.",
     },
+    {
+        "name": "health",
+        "description": "Liveness and readiness probes.",
+    },
 ]
 
 app = FastAPI(
@@ -85,6 +90,8 @@ app.add_middleware(
 app.include_router(surveys.router)
 app.include_router(responses.router)
 app.include_router(auth.router)
+app.include_router(auth.jwks_router)
+app.include_router(health.router)
 
 
 @app.get("/", include_in_schema=False)
@@ -94,6 +101,10 @@ async def redirect_to_docs():
 # Add middleware
 app.middleware("http")(cache_body_middleware)
 
+# Outermost middlewares, so timing and metrics cover the whole request
+app.add_middleware(ServerTimingMiddleware)
+app.add_middleware(PrometheusMiddleware)
+
 # Add exception handlers
 app.add_exception_handler(RequestValidationError, validation_exception_handler)
 
@@ -0,0 +1,57 @@
+"""
+Operational commands.
+
+    python -m backend.manage migrate   # run once per deploy, before starting workers
+    python -m backend.manage check     # exit 1 when the schema is behind the code
+    python -m backend.manage backfill-answers  # fill survey_response_answers for older responses
+"""
+import argparse
+import asyncio
+import logging
+import sys
+
+from backend.db.schema import check_schema, migrate
+from backend.services.surveys.response_answers import backfill_response_answers
+
+logger = logging.getLogger("backend.manage")
+
+
+async def _migrate() -> int:
+    await migrate()
+    status = await check_schema()
+    if not all(status.values()):
+        logger.error("Migration finished but schema is not current: %s", status)
+        return 1
+    logger.info("Schema is up to date: %s", status)
+    return 0
+
+
+async def _check() -> int:
+    status = await check_schema()
+    logger.info("Schema status: %s", status)
+    return 0 if all(status.values()) else 1
+
+
+async def _backfill_answers() -> int:
+    await backfill_response_answers()
+    return 0
+
+
+COMMANDS = {
+    "migrate": _migrate,
+    "check": _check,
+    "backfill-answers": _backfill_answers,
+}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m backend.manage")
+    parser.add_argument("command", choices=sorted(COMMANDS))
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
+    return asyncio.run(COMMANDS[args.command]())
+
+
+if __name__ == "__main__":
+    sys.exit(main())
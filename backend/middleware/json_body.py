@@ -0,0 +1,85 @@
+"""
+Request bodies validated straight from the raw JSON bytes.
+
+Declaring a pydantic model as an endpoint parameter makes FastAPI decode the
+body into Python objects first and validate them in a second pass. For the
+large survey and response payloads a JsonBody dependency instead hands the
+bytes to a TypeAdapter built once per model (``validate_json``), and reports
+failures as the same RequestValidationError FastAPI would raise.
+"""
+
+import json
+from typing import Any
+
+from fastapi import Request
+from fastapi.exceptions import RequestValidationError
+from pydantic import TypeAdapter, ValidationError
+
+
+def _inline_refs(schema: Any, definitions: dict) -> Any:
+    if isinstance(schema, dict):
+        ref = schema.get("$ref")
+        if ref is not None:
+            return _inline_refs(definitions[ref.rsplit("/", 1)[-1]], definitions)
+        return {key: _inline_refs(value, definitions) for key, value in schema.items() if key != "$defs"}
+    if isinstance(schema, list):
+        return [_inline_refs(item, definitions) for item in schema]
+    return schema
+
+
+class JsonBody:
+    """
+    Route dependency returning the request body validated as ``model``.
+
+    Pass ``openapi_extra`` to the route decorator so the documented request
+    body stays the same as with a plain model parameter.
+    """
+
+    def __init__(self, model: type):
+        self.model = model
+        self.adapter = TypeAdapter(model)
+
+    @property
+    def openapi_extra(self) -> dict:
+        schema = self.adapter.json_schema()
+        return {
+            "requestBody": {
+                "required": True,
+                "content": {"application/json": {"schema": _inline_refs(schema, schema.get("$defs", {}))}},
+            }
+        }
+
+    def validate(self, body: bytes) -> Any:
+        if not body:
+            raise RequestValidationError(
+                [{"type": "missing", "loc": ("body",), "msg": "Field required", "input": None}]
+            )
+        try:
+            return self.adapter.validate_json(body)
+        except ValidationError as exc:
+            errors = exc.errors(include_url=False)
+            if errors and errors[0]["type"] == "json_invalid":
+                raise RequestValidationError([_json_decode_error(body)]) from None
+            raise RequestValidationError(
+                [{**error, "loc": ("body", *error["loc"])} for error in errors]
+            ) from None
+
+    async def __call__(self, request: Request) -> Any:
+        return self.validate(await request.body())
+
+
+def _json_decode_error(body: bytes) -> dict:
+    """Rebuild FastAPI's decode error, which reports the character offset."""
+    try:
+        json.loads(body)
+    except (json.JSONDecodeError, UnicodeDecodeError) as exc:
+        position = exc.pos if isinstance(exc, json.JSONDecodeError) else exc.start
+        message = exc.msg if isinstance(exc, json.JSONDecodeError) else exc.reason
+        return {
+            "type": "json_invalid",
+            "loc": ("body", position),
+            "msg": "JSON decode error",
+            "input": {},
+            "ctx": {"error": message},
+        }
+    return {"type": "json_invalid", "loc": ("body",), "msg": "JSON decode error", "input": {}, "ctx": {"error": "Invalid JSON"}}
@@ -0,0 +1,231 @@
+"""
+Prometheus metrics.
+
+Metrics are prometheus_client collectors in a dedicated CollectorRegistry
+(REGISTRY), plus an ASGI middleware that records per-route request metrics
+and serves them at METRICS_PATH. The endpoint is only exposed when
+METRICS_TOKEN is set, and scrapes must send it as a bearer token.
+
+`python -m backend.server` runs several workers behind one port and sets
+PROMETHEUS_MULTIPROC_DIR, so every worker writes its samples to files there
+and /metrics, whichever worker answers, serves the aggregate of all of them
+through MultiProcessCollector. Gauges sum over live workers; the server marks
+exited workers dead. Without the variable the registry is served as is.
+"""
+
+import hmac
+import os
+import time
+
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, make_asgi_app
+from prometheus_client.multiprocess import MultiProcessCollector
+from pymongo import monitoring
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from backend.config import settings
+
+REGISTRY = CollectorRegistry()
+
+POOL_WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+# HTTP
+http_requests_total = Counter(
+    "http_requests_total", "HTTP requests by route and status.", ("method", "route", "status"), registry=REGISTRY)
+http_request_errors_total = Counter(
+    "http_request_errors_total", "HTTP requests that failed with a 5xx or an exception.", ("method", "route"),
+    registry=REGISTRY)
+http_request_duration_seconds = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route.", ("method", "route"),
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0), registry=REGISTRY)
+
+# SQLAlchemy pool (set by the pool itself rather than read at scrape time, so they aggregate across workers)
+sql_pool_size = Gauge(
+    "sqlalchemy_pool_size", "Configured SQL pool size.", ("pool",),
+    multiprocess_mode="livesum", registry=REGISTRY)
+sql_pool_checked_out = Gauge(
+    "sqlalchemy_pool_checked_out", "SQL connections currently checked out.", ("pool",),
+    multiprocess_mode="livesum", registry=REGISTRY)
+sql_pool_overflow = Gauge(
+    "sqlalchemy_pool_overflow", "SQL connections open beyond pool_size.", ("pool",),
+    multiprocess_mode="livesum", registry=REGISTRY)
+sql_pool_wait_seconds = Histogram(
+    "sqlalchemy_pool_checkout_wait_seconds", "Time spent waiting for a pooled SQL connection.", ("pool",),
+    buckets=POOL_WAIT_BUCKETS, registry=REGISTRY)
+
+# Motor / pymongo pool
+mongo_pool_connections = Gauge(
+    "mongo_pool_connections", "Open MongoDB connections.", ("address",), multiprocess_mode="livesum",
+    registry=REGISTRY)
+mongo_pool_checked_out = Gauge(
+    "mongo_pool_checked_out", "MongoDB connections currently checked out.", ("address",), multiprocess_mode="livesum",
+    registry=REGISTRY)
+mongo_pool_checkout_failures_total = Counter(
+    "mongo_pool_checkout_failures_total", "Failed MongoDB connection checkouts.", ("address", "reason"),
+    registry=REGISTRY)
+mongo_pool_wait_seconds = Histogram(
+    "mongo_pool_checkout_wait_seconds", "Time spent waiting for a pooled MongoDB connection.", ("address",),
+    buckets=POOL_WAIT_BUCKETS, registry=REGISTRY)
+
+# Survey generation provider
+generation_duration_seconds = Histogram(
+    "survey_generation_provider_duration_seconds", "Survey generation provider call latency.", ("outcome",),
+    registry=REGISTRY)
+generation_failures_total = Counter(
+    "survey_generation_provider_failures_total", "Failed survey generation provider attempts.", ("reason",),
+    registry=REGISTRY)
+
+# Background workers
+background_tasks_pending = Gauge(
+    "background_tasks_pending", "Background tasks scheduled but not finished.", ("task",), multiprocess_mode="livesum",
+    registry=REGISTRY)
+refresh_tokens_pruned_total = Counter(
+    "refresh_tokens_pruned_total", "Refresh tokens deleted by the pruning job.", registry=REGISTRY)
+
+
+def register_sql_pool(name: str, engine) -> None:
+    """Expose the pool of ``engine`` under the given pool label."""
+    pool = getattr(engine, "sync_engine", engine).pool
+    sql_pool_size.labels(pool=name).set(pool.size())
+    if isinstance(pool, MeteredAsyncAdaptedQueuePool):
+        pool.metrics_name = name
+        pool.update_gauges()
+
+
+class MeteredAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Async queue pool that records how long each checkout waited for a
+    connection, and refreshes its checked-out/overflow gauges after every
+    checkout and return (pool events fire before the counts change).
+    """
+
+    metrics_name = "interactive"
+
+    def update_gauges(self) -> None:
+        sql_pool_checked_out.labels(pool=self.metrics_name).set(self.checkedout())
+        sql_pool_overflow.labels(pool=self.metrics_name).set(max(self.overflow(), 0))
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            sql_pool_wait_seconds.labels(pool=self.metrics_name).observe(time.perf_counter() - started)
+            self.update_gauges()
+
+    def _do_return_conn(self, record):
+        try:
+            super()._do_return_conn(record)
+        finally:
+            self.update_gauges()
+
+
+class MongoPoolMetricsListener(monitoring.ConnectionPoolListener):
+    """pymongo connection pool listener feeding the mongo_pool_* metrics."""
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        mongo_pool_connections.labels(address=_address(event)).inc()
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        mongo_pool_connections.labels(address=_address(event)).dec()
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        mongo_pool_checkout_failures_total.labels(address=_address(event), reason=str(event.reason)).inc()
+
+    def connection_checked_out(self, event):
+        mongo_pool_checked_out.labels(address=_address(event)).inc()
+        duration = getattr(event, "duration", None)
+        if duration is not None:
+            mongo_pool_wait_seconds.labels(address=_address(event)).observe(duration)
+
+    def connection_checked_in(self, event):
+        mongo_pool_checked_out.labels(address=_address(event)).dec()
+
+
+def _address(event) -> str:
+    host, port = event.address
+    return f"{host}:{port}"
+
+
+def collection_registry() -> CollectorRegistry:
+    """Registry served at METRICS_PATH: all workers' samples in multiprocess mode, else REGISTRY."""
+    if not os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        return REGISTRY
+    registry = CollectorRegistry()
+    MultiProcessCollector(registry)
+    return registry
+
+
+def _authorized(scope) -> bool:
+    expected = f"Bearer {settings.METRICS_TOKEN}".encode()
+    provided = dict(scope["headers"]).get(b"authorization", b"")
+    return hmac.compare_digest(provided, expected)
+
+
+class PrometheusMiddleware:
+    """
+    ASGI middleware recording request count, errors and latency per route
+    template, and serving the registry at METRICS_PATH to token holders.
+    """
+
+    def __init__(self, app, registry: CollectorRegistry = None):
+        self.app = app
+        self.metrics_app = make_asgi_app(registry=registry or collection_registry())
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        # Without a token the path is not special and falls through to the app (404)
+        if settings.METRICS_TOKEN and scope["path"] == settings.METRICS_PATH:
+            if _authorized(scope):
+                await self.metrics_app(scope, receive, send)
+            else:
+                await send({
+                    "type": "http.response.start",
+                    "status": 401,
+                    "headers": [(b"www-authenticate", b"Bearer"), (b"content-length", b"0")],
+                })
+                await send({"type": "http.response.body", "body": b""})
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            # Unmatched paths share one label to keep cardinality bounded
+            route_path = getattr(route, "path", "unmatched")
+            method = scope["method"]
+            http_request_duration_seconds.labels(method=method, route=route_path).observe(
+                time.perf_counter() - started
+            )
+            http_requests_total.labels(method=method, route=route_path, status=str(status_code)).inc()
+            if status_code >= 500:
+                http_request_errors_total.labels(method=method, route=route_path).inc()
@@ -0,0 +1,148 @@
+"""
+Token-bucket rate limiting for expensive or anonymous endpoints.
+
+Buckets are kept per limit name and key (client IP, email, survey id, ...).
+The default backend keeps them in a bounded in-process LRU, which is enough
+for a single worker. Each worker has its own buckets, so with the in-memory
+backend every limit is effectively multiplied by the number of workers
+(`python -m backend.server` starts one per CPU by default). Multi-worker
+deployments should plug in a shared backend through RATE_LIMIT_BACKEND
+("package.module:factory") or set_rate_limit_backend().
+"""
+
+import importlib
+import math
+import time
+from collections import OrderedDict
+from typing import Callable, Optional, Protocol
+
+from fastapi import HTTPException, Request
+
+from backend.config import settings
+
+
+class RateLimitBackend(Protocol):
+    async def hit(self, key: str, capacity: int, refill_per_second: float) -> float:
+        """Consume one token for ``key``; return 0 if allowed, else seconds until a token is available."""
+        ...
+
+
+class InMemoryRateLimitBackend:
+    """
+    Token buckets stored in an LRU bounded to ``max_keys`` entries.
+    Per process: N workers allow up to N times each configured rate.
+    """
+
+    def __init__(self, max_keys: int = settings.RATE_LIMIT_MAX_KEYS, clock: Callable[[], float] = time.monotonic):
+        self.max_keys = max_keys
+        self.clock = clock
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    async def hit(self, key: str, capacity: int, refill_per_second: float) -> float:
+        now = self.clock()
+        tokens, updated_at = self._buckets.pop(key, (float(capacity), now))
+        tokens = min(float(capacity), tokens + (now - updated_at) * refill_per_second)
+
+        if tokens >= 1:
+            tokens -= 1
+            retry_after = 0.0
+        else:
+            retry_after = (1 - tokens) / refill_per_second
+
+        self._buckets[key] = (tokens, now)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return retry_after
+
+
+def _load_backend(spec: str) -> RateLimitBackend:
+    if spec == "memory":
+        return InMemoryRateLimitBackend()
+    module_name, _, attr = spec.partition(":")
+    factory = getattr(importlib.import_module(module_name), attr)
+    return factory()
+
+
+_backend: Optional[RateLimitBackend] = None
+
+
+def get_rate_limit_backend() -> RateLimitBackend:
+    global _backend
+    if _backend is None:
+        _backend = _load_backend(settings.RATE_LIMIT_BACKEND)
+    return _backend
+
+
+def set_rate_limit_backend(backend: Optional[RateLimitBackend]) -> None:
+    """Replace the backend (e.g. a shared store for multi-worker setups, or a fresh one in tests)."""
+    global _backend
+    _backend = backend
+
+
+def parse_rate(rate: str) -> tuple[int, float]:
+    """Parse "<requests>/<seconds>" (e.g. "10/60") into (capacity, refill per second)."""
+    requests, _, seconds = rate.partition("/")
+    capacity = int(requests)
+    period = float(seconds or 1)
+    if capacity < 1 or period <= 0:
+        raise ValueError(f"Invalid rate limit: {rate}")
+    return capacity, capacity / period
+
+
+def client_ip(request: Request) -> str:
+    """
+    The peer address, or with RATE_LIMIT_TRUST_FORWARDED_FOR the X-Forwarded-For
+    entry appended by the outermost of RATE_LIMIT_TRUSTED_PROXY_HOPS trusted
+    proxies. Entries left of it come from the client and can be forged freely.
+    """
+    if settings.RATE_LIMIT_TRUST_FORWARDED_FOR:
+        entries = [entry.strip() for entry in request.headers.get("x-forwarded-for", "").split(",") if entry.strip()]
+        if entries:
+            hops = max(settings.RATE_LIMIT_TRUSTED_PROXY_HOPS, 1)
+            return entries[max(len(entries) - hops, 0)]
+    return request.client.host if request.client else "unknown"
+
+
+class RateLimit:
+    """
+    A named token-bucket limit.
+
+    Use an instance as a route dependency to limit per client IP, or call
+    ``hit(key)`` from a handler to limit on a value only known there (an email,
+    a survey id). Exceeding the limit raises 429 with a Retry-After header.
+    """
+
+    def __init__(self, name: str, rate: str, key_func: Callable[[Request], str] = client_ip):
+        self.name = name
+        self.capacity, self.refill_per_second = parse_rate(rate)
+        self.key_func = key_func
+
+    async def hit(self, key: str) -> None:
+        if not settings.RATE_LIMIT_ENABLED:
+            return
+        retry_after = await get_rate_limit_backend().hit(
+            f"{self.name}:{key}", self.capacity, self.refill_per_second
+        )
+        if retry_after > 0:
+            raise HTTPException(
+                status_code=429,
+                detail="Too many requests",
+                headers={"Retry-After": str(math.ceil(retry_after))},
+            )
+
+    async def __call__(self, request: Request) -> None:
+        await self.hit(self.key_func(request))
+
+
+login_ip_limit = RateLimit("login:ip", settings.RATE_LIMIT_LOGIN_PER_IP)
+login_email_limit = RateLimit("login:email", settings.RATE_LIMIT_LOGIN_PER_EMAIL)
+register_ip_limit = RateLimit("register:ip", settings.RATE_LIMIT_REGISTER_PER_IP)
+submit_response_ip_limit = RateLimit("submit:ip", settings.RATE_LIMIT_SUBMIT_PER_IP)
+submit_response_survey_limit = RateLimit(
+    "submit:survey",
+    settings.RATE_LIMIT_SUBMIT_PER_SURVEY,
+    key_func=lambda request: request.path_params.get("id", ""),
+)
@@ -0,0 +1,151 @@
+"""
+Per-request timing breakdown.
+
+Time spent in MongoDB commands, SQL statements and password hashing is added
+to a per-request accumulator (a context variable, which Motor's executor and
+SQLAlchemy's async bridge both propagate). The middleware reports the totals
+as a Server-Timing response header and one structured log line per request;
+"app" is the remainder of the request time, spent in handler code.
+"""
+
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from pymongo import monitoring
+from sqlalchemy import event
+
+from backend.config import settings
+
+logger = logging.getLogger("backend.timing")
+
+CATEGORIES = ("mongo", "sql", "hash")
+
+
+class RequestTimings:
+    """Accumulated duration (seconds) and call count per category for one request."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.durations = {category: 0.0 for category in CATEGORIES}
+        self.counts = {category: 0 for category in CATEGORIES}
+        # Mongo listeners run on Motor's executor threads
+        self._lock = threading.Lock()
+
+    def add(self, category: str, seconds: float) -> None:
+        with self._lock:
+            self.durations[category] = self.durations.get(category, 0.0) + seconds
+            self.counts[category] = self.counts.get(category, 0) + 1
+
+    def breakdown(self) -> dict[str, float]:
+        """Durations in milliseconds, including 'app' and 'total'."""
+        total = time.perf_counter() - self.started
+        result = {category: seconds * 1000 for category, seconds in self.durations.items()}
+        result["app"] = max(total - sum(self.durations.values()), 0.0) * 1000
+        result["total"] = total * 1000
+        return result
+
+
+_current: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+
+def current_timings() -> Optional[RequestTimings]:
+    return _current.get()
+
+
+def record(category: str, seconds: float) -> None:
+    timings = _current.get()
+    if timings is not None:
+        timings.add(category, seconds)
+
+
+@contextmanager
+def timed(category: str):
+    """Record the duration of the block under ``category`` for the current request."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(category, time.perf_counter() - started)
+
+
+class MongoTimingListener(monitoring.CommandListener):
+    """pymongo command listener that records command durations as 'mongo'."""
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        record("mongo", event.duration_micros / 1_000_000)
+
+    def failed(self, event):
+        record("mongo", event.duration_micros / 1_000_000)
+
+
+def instrument_engine(engine) -> None:
+    """Record SQL statement durations as 'sql' for an Engine or AsyncEngine."""
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        record("sql", time.perf_counter() - conn.info["query_start_time"].pop())
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _handle_error(exception_context):
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_start_time"):
+            record("sql", time.perf_counter() - conn.info["query_start_time"].pop())
+
+
+def server_timing_header(breakdown: dict[str, float]) -> str:
+    return ", ".join(f"{name};dur={duration:.1f}" for name, duration in breakdown.items())
+
+
+class ServerTimingMiddleware:
+    """ASGI middleware that adds the Server-Timing header and logs the breakdown."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.REQUEST_TIMING_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = _current.set(timings)
+        status_code = 500
+
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append(
+                    (b"server-timing", server_timing_header(timings.breakdown()).encode("latin-1"))
+                )
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            route = scope.get("route")
+            breakdown = timings.breakdown()
+            logger.info(json.dumps({
+                "event": "request_timing",
+                "method": scope["method"],
+                "path": getattr(route, "path", scope["path"]),
+                "status": status_code,
+                **{f"{name}_ms": round(duration, 2) for name, duration in breakdown.items()},
+                **{f"{name}_count": count for name, count in timings.counts.items()},
+            }))
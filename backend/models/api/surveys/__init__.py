@@ -6,6 +6,7 @@ from .survey_generation import (
     survey_generation_schema,
 )
 from .surveys import (
+    AnyQuestionItem,
     CheckboxTileProps,
     CheckboxTilesProps,
     DropDownOption,
@@ -17,6 +18,7 @@ from .surveys import (
     QuestionStats,
     RadioBarProps,
     RadioProps,
+    StoredQuestionItem,
     Survey,
     SurveyAnswer,
     SurveyCreate,
@@ -35,6 +37,7 @@ from .surveys import (
 )
 
 __all__ = [
+    "AnyQuestionItem",
     "CheckboxTileProps",
     "CheckboxTilesProps",
     "DropDownOption",
@@ -50,6 +53,7 @@ __all__ = [
     "QuestionStats",
     "RadioBarProps",
     "RadioProps",
+    "StoredQuestionItem",
     "Survey",
     "SurveyAnswer",
     "SurveyCreate",
@@ -3,9 +3,9 @@ Models for survey questions and options.
 """
 import uuid
 from enum import Enum
-from typing import List, Optional, Union
+from typing import Annotated, Any, List, Literal, Optional, Union
 from datetime import datetime
-from pydantic import BaseModel, ConfigDict, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Discriminator, Field, Tag, field_validator
 
 
 class RadioProps(BaseModel):
@@ -81,6 +81,89 @@ class QuestionItem(BaseModel):
     layout: Optional["LayoutItem"] = None
 
 
+# Per-component variants. `component` picks the optionProps model directly,
+# instead of pydantic trying every member of Option's union in smart mode.
+class TextInputQuestionOption(Option):
+    optionProps: TextFieldProps
+
+
+class SwitchQuestionOption(Option):
+    optionProps: ToggleSwitchProps
+
+
+class RadioBarQuestionOption(Option):
+    optionProps: RadioBarProps
+
+
+class CheckboxTilesQuestionOption(Option):
+    optionProps: CheckboxTilesProps
+
+
+class DropDownQuestionOption(Option):
+    optionProps: DropDownProps
+
+
+class TextInputQuestion(QuestionItem):
+    component: Literal["TextInput"]
+    option: Optional[TextInputQuestionOption] = None
+
+
+class SwitchQuestion(QuestionItem):
+    component: Literal["Switch"]
+    option: Optional[SwitchQuestionOption] = None
+
+
+class RadioBarQuestion(QuestionItem):
+    component: Literal["RadioBar"]
+    option: Optional[RadioBarQuestionOption] = None
+
+
+class CheckboxTilesQuestion(QuestionItem):
+    component: Literal["CheckboxTiles"]
+    option: Optional[CheckboxTilesQuestionOption] = None
+
+
+class DropDownQuestion(QuestionItem):
+    component: Literal["DropDown"]
+    option: Optional[DropDownQuestionOption] = None
+
+
+QUESTION_COMPONENTS = {
+    "TextInput": TextInputQuestion,
+    "Switch": SwitchQuestion,
+    "RadioBar": RadioBarQuestion,
+    "CheckboxTiles": CheckboxTilesQuestion,
+    "DropDown": DropDownQuestion,
+}
+
+
+def _question_component(value: Any) -> str:
+    component = value.get("component") if isinstance(value, dict) else getattr(value, "component", None)
+    # Components the backend has no props model for keep the generic QuestionItem
+    return component if component in QUESTION_COMPONENTS else "other"
+
+
+AnyQuestionItem = Annotated[
+    Union[
+        Annotated[TextInputQuestion, Tag("TextInput")],
+        Annotated[SwitchQuestion, Tag("Switch")],
+        Annotated[RadioBarQuestion, Tag("RadioBar")],
+        Annotated[CheckboxTilesQuestion, Tag("CheckboxTiles")],
+        Annotated[DropDownQuestion, Tag("DropDown")],
+        Annotated[QuestionItem, Tag("other")],
+    ],
+    Discriminator(_question_component),
+]
+
+# Read side: documents stored before the per-component models (e.g. a DropDown
+# saved with ToggleSwitch-shaped props) fall back to the generic QuestionItem
+# instead of failing the whole survey. Writes keep using AnyQuestionItem.
+StoredQuestionItem = Annotated[
+    Union[AnyQuestionItem, QuestionItem],
+    Field(union_mode="left_to_right"),
+]
+
+
 class SurveyStatus(str, Enum):
     draft = "draft"
     published = "published"
@@ -108,14 +191,14 @@ class Survey(BaseModel):
     id: Optional[str] = None
     title: Optional[str] = None
     status: SurveyStatus = SurveyStatus.draft
-    questions: List[QuestionItem]
+    questions: List[StoredQuestionItem]
     layouts: Optional[SurveyLayouts] = None
 
 
 class SurveyCreate(BaseModel):
     title: str
     status: SurveyStatus = SurveyStatus.draft
-    questions: List[QuestionItem]
+    questions: List[AnyQuestionItem]
     layouts: Optional[SurveyLayouts] = None
 
     @field_validator("title")
@@ -201,18 +284,18 @@ class SurveyGenerateRequest(BaseModel):
 class SurveyGenerateResponse(BaseModel):
     title: str
     status: SurveyStatus = SurveyStatus.draft
-    questions: List[QuestionItem]
+    questions: List[AnyQuestionItem]
     layouts: SurveyLayouts
 
 
-def create_fallback_question() -> QuestionItem:
+def create_fallback_question() -> TextInputQuestion:
     """Create a default fallback question when survey generation returns no valid questions."""
     fallback_id = f"generated-1-{uuid.uuid4().hex[:8]}"
-    return QuestionItem(
+    return TextInputQuestion(
         id=fallback_id,
         questionText="What would you like to tell us?",
         component="TextInput",
-        option=Option(
+        option=TextInputQuestionOption(
             optionProps=TextFieldProps(
                 label="Your feedback",
                 placeholder="Type your answer...",
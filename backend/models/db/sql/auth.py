@@ -13,6 +13,7 @@ Attributes:
     id (UUID): Unique identifier for the refresh token.
     user_id (UUID): Foreign key referencing the associated user.
     token_id (UUID): Unique token identifier (JTI), used for JWT.
+    token_version (int): User token version (session family) the token was issued under.
     created_at (datetime): Timestamp when the token was created.
     revoked (bool): Indicates if the token has been revoked.
     user (User): Relationship to the User model.
@@ -67,6 +68,9 @@ class RefreshToken(Base):
         id (UUID): Primary key, auto-generated unique identifier.
         user_id (UUID): Foreign key referencing the User model, with cascade delete.
         token_id (UUID): Unique identifier for the token (JTI), used in JWT claims.
+        token_version (Integer): The user's token_version when the token was issued. All tokens
+            issued under one version form a session family; bumping User.token_version revokes
+            the whole family with a single-row update.
         created_at (DateTime): Timestamp of token creation, in UTC.
         revoked (Boolean): Flag indicating if the token has been revoked.
         user (relationship): Relationship to the User model.
@@ -77,6 +81,7 @@ class RefreshToken(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     token_id = Column(UUID(as_uuid=True), nullable=False, unique=True)  # JTI
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
     created_at = Column(DateTime(timezone=True), nullable=False, default=utcnow)
     revoked = Column(Boolean, nullable=False, default=False)
 
@@ -88,6 +93,9 @@ class RefreshToken(Base):
     )
 
 
+ANSWERS_GIN_INDEX = "ix_survey_responses_answers_path_ops"
+
+
 class SurveyResponse(Base):
     """
     Stores responder submissions for surveys.
@@ -102,6 +110,9 @@ class SurveyResponse(Base):
     answers = Column(JSONB, nullable=False)
     submitted_at = Column(DateTime(timezone=True), nullable=False, default=utcnow)
 
+    # Written together with the response; never loaded through the ORM
+    answer_keys = relationship("SurveyResponseAnswer", lazy="noload", passive_deletes=True)
+
     __table_args__ = (
         Index(
             "ix_survey_responses_survey_owner_submitted_desc",
@@ -115,4 +126,46 @@ class SurveyResponse(Base):
             "survey_id",
             "survey_owner_id",
         ),
+        # Serves `answers @> '[{"questionId": ..., "value": ...}]'` answer filters.
+        # Existing tables get it from ensure_answers_gin_index; create_all skips them.
+        Index(
+            ANSWERS_GIN_INDEX,
+            "answers",
+            postgresql_using="gin",
+            postgresql_ops={"answers": "jsonb_path_ops"},
+        ),
+    )
+
+
+class SurveyResponseAnswer(Base):
+    """
+    One row per answered (question, value) of a survey response.
+    A normalised copy of SurveyResponse.answers, so option counts, answer
+    filters and cross-tabs are index scans instead of unnesting every JSONB row.
+    Attributes:
+        response_id (UUID): Foreign key to survey_responses, with cascade delete.
+        survey_id (Text): Denormalised from the response for (survey, question, value) lookups.
+        question_id (Text): The answered question id.
+        value_key (Text): The answer value as text; one row per selected option of a
+            multi-choice answer, "true"/"false" for toggles. Unanswered ("") values have no row.
+    Table Arguments:
+        Index on (survey_id, question_id, value_key), carrying response_id for index-only scans.
+    """
+
+    __tablename__ = "survey_response_answers"
+    response_id = Column(
+        UUID(as_uuid=True), ForeignKey("survey_responses.id", ondelete="CASCADE"), primary_key=True
+    )
+    question_id = Column(Text, primary_key=True)
+    value_key = Column(Text, primary_key=True)
+    survey_id = Column(Text, nullable=False)
+
+    __table_args__ = (
+        Index(
+            "ix_survey_response_answers_survey_question_value",
+            "survey_id",
+            "question_id",
+            "value_key",
+            "response_id",
+        ),
     )
@@ -1,24 +1,35 @@
 """
 Router to manage user authentication: registration, login, token refresh.
 """
-from fastapi import APIRouter, Depends, HTTPException, Response, Request, Cookie
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Response, Request, Cookie
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy import func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from backend.db.sql.sql_driver import get_async_db
+from backend.db.sql.sql_driver import AsyncSessionLocal, get_async_db, release_connection
+from backend.middleware.metrics import background_tasks_pending
+from backend.middleware.rate_limiting import login_email_limit, login_ip_limit, register_ip_limit
+from backend.routers.auth.jwt_keys import get_key_ring, is_hmac_algorithm
 from backend.models.api.auth import AccessOut, LoginIn, RegisterIn
 from backend.models.db.sql.auth import RefreshToken, User
 from backend.config import settings
+import logging
 import uuid
 
 from backend.routers.auth.security_utl import *
 
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(
     prefix="/auth",
     tags=["auth"]
 )
 
+# Served at the site root so verifiers can use the standard well-known path
+jwks_router = APIRouter(tags=["auth"])
+
 REFRESH_COOKIE = settings.COOKIE_NAME
 
 # OAuth2 scheme for token extraction
@@ -46,6 +57,30 @@ def clear_refresh_cookie(resp: Response):
     resp.delete_cookie(REFRESH_COOKIE, path="/refresh")
 
 
+async def rehash_password(user_id: uuid.UUID, password: str) -> None:
+    """
+    Re-hash a user's password with the current hashing policy.
+
+    Runs as a background task after a successful login, so the hashing cost is
+    not added to the login response. Uses its own session because the request
+    session is closed by the time background tasks run.
+    """
+    try:
+        new_hash = await run_in_threadpool(hash_password, password)
+        async with AsyncSessionLocal() as session:
+            await session.execute(
+                update(User)
+                .where(User.id == user_id)
+                .values(password_hash=new_hash)
+            )
+            await session.commit()
+        logger.info("Upgraded password hash for user %s", user_id)
+    except Exception:
+        logger.exception("Failed to upgrade password hash for user %s", user_id)
+    finally:
+        background_tasks_pending.labels(task="rehash_password").dec()
+
+
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: AsyncSession = Depends(get_async_db)
@@ -103,17 +138,22 @@ async def get_current_user(
             detail="Token has been invalidated",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    
+
+    # The route reuses this session; give the connection back until it runs its own statements
+    await release_connection(db)
     return user
 
 
-@router.post("/register", response_model=AccessOut)
+@router.post("/register", response_model=AccessOut, dependencies=[Depends(register_ip_limit)])
 async def register(payload: RegisterIn, resp: Response, db: AsyncSession = Depends(get_async_db)):
     """
     Register a new user with the provided email and password.
     This function handles user registration by validating the email, hashing the password,
     creating a new user in the database, generating refresh and access tokens, and setting
     the refresh token as a cookie in the response.
+    The user insert uses ON CONFLICT DO NOTHING on lower(email) instead of a separate
+    existence check, and the refresh token is written in the same transaction, so
+    registration costs three round trips (INSERT user, INSERT token, COMMIT).
     Args:
         payload (RegisterIn): The input payload containing the user's email and password.
         resp (Response): The HTTP response object to set the refresh token cookie.
@@ -125,18 +165,19 @@ async def register(payload: RegisterIn, resp: Response, db: AsyncSession = Depen
                        detail "Email already registered".
     """
     email = payload.email.lower().strip()
-    stmt = select(User).where(func.lower(User.email) == email)
-    existing = (await db.execute(stmt)).scalar_one_or_none()
-    if existing:
+    password_hash = await run_in_threadpool(hash_password, payload.password)
+    stmt = (
+        pg_insert(User)
+        .values(email=email, password_hash=password_hash)
+        .on_conflict_do_nothing(index_elements=[func.lower(User.email)])
+        .returning(User.id, User.role, User.token_version)
+    )
+    user = (await db.execute(stmt)).first()
+    if not user:
         raise HTTPException(status_code=400, detail="Email already registered")
 
-    user = User(email=email, password_hash=hash_password(payload.password))
-    db.add(user)
-    await db.commit()
-    await db.refresh(user)
-
     refresh_jwt, jti = make_refresh_token(user.id)
-    db.add(RefreshToken(user_id=user.id, token_id=jti))
+    db.add(RefreshToken(user_id=user.id, token_id=jti, token_version=user.token_version))
     await db.commit()
     set_refresh_cookie(resp, refresh_jwt)
 
@@ -144,30 +185,43 @@ async def register(payload: RegisterIn, resp: Response, db: AsyncSession = Depen
     return {"access_token": access}
 
 
-@router.post("/login", response_model=AccessOut)
-async def login(payload: LoginIn, resp: Response, db: AsyncSession = Depends(get_async_db)):
+@router.post("/login", response_model=AccessOut, dependencies=[Depends(login_ip_limit)])
+async def login(
+    payload: LoginIn,
+    resp: Response,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db),
+):
     """
     Asynchronous function to authenticate a user and generate access and refresh tokens.
     This function validates the user's email and password, creates a refresh token stored in the database,
     sets a refresh cookie in the response, and returns an access token.
+    If the stored hash is below the current hashing policy, it is upgraded in a background task.
     Args:
         payload (LoginIn): The login payload containing email and password.
         resp (Response): The HTTP response object to set the refresh cookie.
+        background_tasks (BackgroundTasks): Used to schedule the password re-hash.
         db (AsyncSession, optional): The asynchronous database session. Defaults to Depends(get_async_db).
     Returns:
         dict: A dictionary containing the access token, e.g., {"access_token": "jwt_token"}.
     Raises:
         HTTPException: If the credentials are invalid, with status code 401 and detail "Invalid credentials".
+        HTTPException: If too many attempts were made for this email, with status code 429.
     """
 
     email = payload.email.lower().strip()
+    await login_email_limit.hit(email)
     user = await db.execute(select(User).where(func.lower(User.email) == email))
     user = user.scalar_one_or_none()
-    if not user or not verify_password(payload.password, user.password_hash):
+    if not user or not await run_in_threadpool(verify_password, payload.password, user.password_hash):
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
+    if needs_rehash(user.password_hash):
+        background_tasks_pending.labels(task="rehash_password").inc()
+        background_tasks.add_task(rehash_password, user.id, payload.password)
+
     refresh_jwt, jti = make_refresh_token(user.id)
-    db.add(RefreshToken(user_id=user.id, token_id=jti))
+    db.add(RefreshToken(user_id=user.id, token_id=jti, token_version=user.token_version))
     await db.commit()
     set_refresh_cookie(resp, refresh_jwt)
 
@@ -185,7 +239,9 @@ async def refresh(
     """
     Refreshes an access token using a provided refresh token.
     This endpoint validates the refresh token by decoding it, checking its revocation status in the database,
-    verifying the associated user's active status, and generating a new access token if all checks pass.
+    verifying the associated user's active status and that the token belongs to the user's current
+    session family (token version), and generating a new access token if all checks pass.
+    The token and its user are loaded with a single joined query.
     Args:
         refresh_token (str | None): The refresh token provided in the request. Must be present and valid.
         db (AsyncSession): The asynchronous database session, injected via dependency.
@@ -193,7 +249,7 @@ async def refresh(
         HTTPException: 
             - 401 if refresh_token is missing.
             - 401 if the token is invalid (decoding fails).
-            - 401 if the refresh token is revoked or not found.
+            - 401 if the refresh token is revoked, not found, or from a revoked session family.
             - 401 if the user is inactive or not found.
     Returns:
         dict: A dictionary containing the new access token, e.g., {"access_token": "new_token"}.
@@ -207,16 +263,29 @@ async def refresh(
     except Exception:
         raise HTTPException(status_code=401, detail="Invalid refresh")
 
-    rt = await db.execute(select(RefreshToken).where(RefreshToken.token_id == jti, RefreshToken.revoked == False))
-    rt = rt.scalar_one_or_none()
-    if not rt:
+    stmt = (
+        select(User, RefreshToken.token_version)
+        .join(RefreshToken, RefreshToken.user_id == User.id)
+        .where(
+            RefreshToken.token_id == jti,
+            RefreshToken.user_id == user_id,
+            RefreshToken.revoked == False,
+        )
+    )
+    row = (await db.execute(stmt)).first()
+    if not row:
         raise HTTPException(
             status_code=401, detail="Refresh revoked or not found")
 
-    user = await db.get(User, user_id)
-    if not user or not user.is_active:
+    user, family_version = row
+    if not user.is_active:
         raise HTTPException(status_code=401, detail="User inactive")
 
+    # Tokens issued before the last logout belong to a revoked session family
+    if family_version != user.token_version:
+        raise HTTPException(
+            status_code=401, detail="Refresh revoked or not found")
+
     # Generate new access token
     access = make_access_token(user.id, user.role, user.token_version)
     return {"access_token": access}
@@ -234,9 +303,12 @@ async def logout(
     Logout the current user by revoking their refresh tokens and clearing cookies.
     
     This function performs a complete logout by:
-    1. Revoking all refresh tokens for the user (optional: can revoke just the current one)
-    2. Incrementing the user's token version to invalidate all access tokens
-    3. Clearing the refresh token cookie
+    1. Incrementing the user's token version, which invalidates all access tokens and
+       revokes every refresh token issued under the previous version (session family)
+       with a single-row update
+    2. Clearing the refresh token cookie
+
+    Revoked refresh token rows are deleted later by the refresh token pruning job.
     
     Args:
         resp (Response): The HTTP response object to clear cookies
@@ -248,14 +320,10 @@ async def logout(
         dict: Success message
     """
     
-    # Option 1: Revoke all refresh tokens for the user (more secure)
-    await db.execute(
-        update(RefreshToken)
-        .where(RefreshToken.user_id == current_user.id)
-        .values(revoked=True)
-    )
-    
-    # Option 2: Only revoke the current refresh token (less secure)
+    # Revoking all refresh tokens for the user happens through the token version bump
+    # below: refresh tokens carry the version they were issued under.
+
+    # Alternative: only revoke the current refresh token (less secure)
     # if refresh_token:
     #     try:
     #         data = decode(refresh_token)
@@ -268,7 +336,7 @@ async def logout(
     #     except Exception:
     #         pass  # Token might be invalid, but we still want to logout
     
-    # Increment token version to invalidate all access tokens
+    # Increment token version to invalidate all access and refresh tokens
     await db.execute(
         update(User)
         .where(User.id == current_user.id)
@@ -281,3 +349,19 @@ async def logout(
     clear_refresh_cookie(resp)
     
     return {"message": "Successfully logged out"}
+
+
+@jwks_router.get("/.well-known/jwks.json")
+async def jwks(resp: Response):
+    """
+    Publish the public keys used to sign JWTs as a JSON Web Key Set.
+
+    Other services can cache this document and verify access tokens locally by
+    matching the token's kid header. Retired keys stay listed while they remain
+    in the key ring, so tokens signed before a rotation keep validating.
+    With an HMAC algorithm there are no public keys and the set is empty.
+    """
+    resp.headers["Cache-Control"] = f"public, max-age={settings.JWKS_MAX_AGE_SECONDS}"
+    if is_hmac_algorithm(settings.JWT_ALG):
+        return {"keys": []}
+    return get_key_ring().jwks()
@@ -0,0 +1,98 @@
+"""
+Key ring for asymmetric JWT signing (ES256/ES384/ES512, RS256/RS384/RS512).
+
+Keys are configured in JWT_KEYS as a JSON object mapping a key id (kid) to a
+PEM key, and JWT_ACTIVE_KID selects the private key used for signing. Every
+other key in the ring is used for verification only, so rotating means:
+add the new key, switch JWT_ACTIVE_KID, and drop the old key (or keep only its
+public PEM) once tokens signed with it have expired.
+"""
+import json
+from typing import Optional
+
+from jose import jwk
+from jose.backends.base import Key
+from jose.exceptions import JWTError
+
+from backend.config import settings
+
+HMAC_ALGORITHMS = {"HS256", "HS384", "HS512"}
+
+
+def is_hmac_algorithm(algorithm: str) -> bool:
+    return algorithm.upper() in HMAC_ALGORITHMS
+
+
+class JwtKeyRing:
+    """
+    Signing key plus the public keys accepted for verification.
+
+    Args:
+        keys (dict[str, str]): kid -> PEM. Retired keys may be public-only.
+        active_kid (str): kid of the private key used to sign new tokens.
+        algorithm (str): Asymmetric JWT algorithm, e.g. 'ES256'.
+
+    Raises:
+        ValueError: If the active key is missing or is not a private key.
+    """
+
+    def __init__(self, keys: dict[str, str], active_kid: str, algorithm: str):
+        if active_kid not in keys:
+            raise ValueError(f"JWT_ACTIVE_KID '{active_kid}' is not in JWT_KEYS")
+
+        self.algorithm = algorithm
+        self.active_kid = active_kid
+        self._signing_pem = keys[active_kid]
+        self._public: dict[str, Key] = {}
+        for kid, pem in keys.items():
+            key = jwk.construct(pem, algorithm)
+            if kid == active_kid and key.is_public():
+                raise ValueError(f"Active JWT key '{kid}' must be a private key")
+            self._public[kid] = key.public_key()
+
+    @property
+    def kids(self) -> list[str]:
+        return list(self._public)
+
+    def signing_key(self) -> tuple[str, str]:
+        """Return (kid, private PEM) of the active key."""
+        return self.active_kid, self._signing_pem
+
+    def verification_key(self, kid: Optional[str]) -> Key:
+        """
+        Return the public key for ``kid``.
+
+        Raises:
+            JWTError: If the kid is missing or unknown.
+        """
+        key = self._public.get(kid) if kid else None
+        if key is None:
+            raise JWTError("Unknown signing key")
+        return key
+
+    def jwks(self) -> dict:
+        """Public keys as a JSON Web Key Set."""
+        return {
+            "keys": [
+                {**key.to_dict(), "kid": kid, "use": "sig", "alg": self.algorithm}
+                for kid, key in self._public.items()
+            ]
+        }
+
+
+_key_ring: Optional[JwtKeyRing] = None
+
+
+def get_key_ring() -> JwtKeyRing:
+    """Return the key ring built from settings (loaded once per process)."""
+    global _key_ring
+    if _key_ring is None:
+        keys = json.loads(settings.JWT_KEYS or "{}")
+        _key_ring = JwtKeyRing(keys, settings.JWT_ACTIVE_KID, settings.JWT_ALG)
+    return _key_ring
+
+
+def set_key_ring(key_ring: Optional[JwtKeyRing]) -> None:
+    """Replace the key ring (None reloads it from settings on next use)."""
+    global _key_ring
+    _key_ring = key_ring
@@ -1,18 +1,93 @@
 from jose import jwt
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
-from passlib.hash import bcrypt
+from passlib.context import CryptContext
+import hashlib
+import time
 import uuid
 from backend.config import settings
+from backend.routers.auth.jwt_keys import get_key_ring, is_hmac_algorithm
+from backend.middleware.timing import timed
 
-def hash_password(pw: str) -> str: return bcrypt.hash(pw)
-def verify_password(pw: str, pw_hash: str) -> bool: return bcrypt.verify(pw, pw_hash)
+
+def build_password_context(
+    scheme: str = settings.PASSWORD_HASH_SCHEME,
+    bcrypt_rounds: int = settings.BCRYPT_ROUNDS,
+    argon2_time_cost: int = settings.ARGON2_TIME_COST,
+    argon2_memory_cost: int = settings.ARGON2_MEMORY_COST_KIB,
+    argon2_parallelism: int = settings.ARGON2_PARALLELISM,
+) -> CryptContext:
+    """
+    Build the passlib context for the given hashing policy.
+
+    The selected scheme is used for new hashes. bcrypt is always kept as a
+    verifiable scheme so existing hashes keep working after switching to argon2;
+    hashes made with another scheme or a weaker cost are reported by
+    ``needs_update`` so they can be upgraded on the next successful login.
+
+    Args:
+        scheme (str): 'bcrypt' or 'argon2'. argon2 requires the argon2-cffi package.
+        bcrypt_rounds (int): bcrypt cost factor (log2 of the iteration count).
+        argon2_time_cost (int): argon2id number of passes.
+        argon2_memory_cost (int): argon2id memory usage in KiB.
+        argon2_parallelism (int): argon2id number of lanes.
+
+    Raises:
+        ValueError: If the scheme is not supported.
+    """
+    if scheme not in {"bcrypt", "argon2"}:
+        raise ValueError(f"Unsupported password hash scheme: {scheme}")
+
+    schemes = ["argon2", "bcrypt"] if scheme == "argon2" else ["bcrypt"]
+    return CryptContext(
+        schemes=schemes,
+        default=scheme,
+        deprecated="auto",
+        bcrypt__default_rounds=bcrypt_rounds,
+        bcrypt__min_rounds=bcrypt_rounds,
+        argon2__type="ID",
+        argon2__rounds=argon2_time_cost,
+        argon2__memory_cost=argon2_memory_cost,
+        argon2__parallelism=argon2_parallelism,
+    )
+
+
+pwd_context = build_password_context()
+
+
+def _encode(payload: dict) -> str:
+    """Sign a JWT with JWT_SECRET (HMAC) or the active key of the key ring, tagged with its kid."""
+    if is_hmac_algorithm(settings.JWT_ALG):
+        return jwt.encode(payload, settings.JWT_SECRET, algorithm=settings.JWT_ALG)
+    kid, key = get_key_ring().signing_key()
+    return jwt.encode(payload, key, algorithm=settings.JWT_ALG, headers={"kid": kid})
+
+
+def _verify(token: str) -> dict:
+    """Verify a JWT against JWT_SECRET (HMAC) or the key ring entry named by its kid header."""
+    if is_hmac_algorithm(settings.JWT_ALG):
+        return jwt.decode(token, settings.JWT_SECRET, algorithms=[settings.JWT_ALG])
+    kid = jwt.get_unverified_header(token).get("kid")
+    return jwt.decode(token, get_key_ring().verification_key(kid), algorithms=[settings.JWT_ALG])
+
+
+def hash_password(pw: str) -> str:
+    with timed("hash"):
+        return pwd_context.hash(pw)
+
+def verify_password(pw: str, pw_hash: str) -> bool:
+    with timed("hash"):
+        return pwd_context.verify(pw, pw_hash)
+
+def needs_rehash(pw_hash: str) -> bool: return pwd_context.needs_update(pw_hash)
 
 def make_access_token(user_id: uuid.UUID, role: str, token_version: int) -> str:
     """
     Generate a JWT access token for a user.
 
     This function creates a JSON Web Token (JWT) containing the user's ID, role, token version,
-    issued at time, and expiration time. The token is signed using the configured secret and algorithm.
+    issued at time, and expiration time. The token is signed using the configured secret or active key
+    and algorithm.
 
     Args:
         user_id (uuid.UUID): The unique identifier of the user.
@@ -33,14 +108,14 @@ def make_access_token(user_id: uuid.UUID, role: str, token_version: int) -> str:
         "iat": int(now.timestamp()),
         "exp": int((now + timedelta(minutes=settings.ACCESS_EXPIRE_MIN)).timestamp()),
     }
-    return jwt.encode(payload, settings.JWT_SECRET, algorithm=settings.JWT_ALG)
+    return _encode(payload)
 
 def make_refresh_token(user_id: uuid.UUID) -> tuple[str, uuid.UUID]:
     """
     Generates a JWT refresh token for the given user ID.
     This function creates a JSON Web Token (JWT) with a payload containing the user ID,
     a unique token ID (JTI), issued at time (IAT), and expiration time (EXP). The token
-    is encoded using the configured JWT secret and algorithm.
+    is encoded using the configured JWT secret or active key and algorithm.
     Args:
         user_id (uuid.UUID): The unique identifier of the user for whom the token is being generated.
     Returns:
@@ -57,10 +132,46 @@ def make_refresh_token(user_id: uuid.UUID) -> tuple[str, uuid.UUID]:
         "iat": int(now.timestamp()),
         "exp": int((now + timedelta(days=settings.REFRESH_EXPIRE_DAYS)).timestamp()),
     }
-    return jwt.encode(payload, settings.JWT_SECRET, algorithm=settings.JWT_ALG), jti
+    return _encode(payload), jti
+
+# Verified claims keyed by sha256(token), kept until the token's exp.
+_decode_cache: "OrderedDict[bytes, tuple[dict, int]]" = OrderedDict()
+
+
+def clear_decode_cache() -> None:
+    _decode_cache.clear()
+
 
 def decode(token: str) -> dict:
-    return jwt.decode(token, settings.JWT_SECRET, algorithms=[settings.JWT_ALG])
+    """
+    Verify and decode a JWT.
+
+    Successfully verified tokens are cached (bounded LRU of JWT_DECODE_CACHE_SIZE
+    entries) until their exp claim, so repeated requests with the same token skip
+    signature verification and claim parsing. Failed verifications are never cached.
+
+    Raises:
+        JWTError: If the token is invalid, tampered or expired.
+    """
+    if settings.JWT_DECODE_CACHE_SIZE <= 0:
+        return _verify(token)
+
+    key = hashlib.sha256(token.encode()).digest()
+    cached = _decode_cache.get(key)
+    if cached is not None:
+        claims, exp = cached
+        if time.time() < exp:
+            _decode_cache.move_to_end(key)
+            return dict(claims)
+        del _decode_cache[key]
+
+    claims = _verify(token)
+    exp = claims.get("exp")
+    if isinstance(exp, int):
+        _decode_cache[key] = (dict(claims), exp)
+        while len(_decode_cache) > settings.JWT_DECODE_CACHE_SIZE:
+            _decode_cache.popitem(last=False)
+    return claims
 
 # OAuth2 dependency functions
 async def get_current_user_id(token: str) -> uuid.UUID:
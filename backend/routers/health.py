@@ -0,0 +1,30 @@
+import asyncio
+
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from backend.db import health
+
+router = APIRouter(tags=["health"])
+
+
+@router.get("/healthz")
+async def healthz():
+    """Liveness probe: the process is up and serving. Never touches the databases."""
+    return {"status": "ok"}
+
+
+@router.get("/readyz")
+async def readyz():
+    """
+    Readiness probe: 200 once the schemas are current and both databases answer,
+    503 otherwise. Checks are cached for READINESS_CACHE_SECONDS.
+    """
+    names = list(health.readiness_checks)
+    results = await asyncio.gather(*(health.readiness_checks[name]() for name in names))
+    checks = dict(zip(names, results))
+    ready = all(checks.values())
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"status": "ready" if ready else "not_ready", "checks": checks},
+    )
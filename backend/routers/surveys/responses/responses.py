@@ -1,19 +1,26 @@
 """
 Routes for managing survey responses.
 """
+import asyncio
 from datetime import datetime, timezone
-from typing import Optional
+from typing import List, Optional
 import uuid
 from bson import ObjectId
 from fastapi import APIRouter, HTTPException, Depends, Query
-from sqlalchemy import desc, select, func
+from fastapi.exceptions import RequestValidationError
+from sqlalchemy import desc, func, literal_column, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from collections import defaultdict
 
-from backend.db.sql.sql_driver import get_async_db
+from backend.db.sql.sql_driver import get_analytics_db, get_async_db, get_ingest_db, get_read_db, release_connection
+from backend.middleware.json_body import JsonBody
+from backend.middleware.rate_limiting import submit_response_ip_limit, submit_response_survey_limit
 from backend.models.api.surveys import PaginatedResponseList, QuestionStats, SurveyResponseCreate, SurveyResponseRead, SurveyResponseStats, SurveyStatus, TrendPoint
-from backend.models.db.sql.auth import SurveyResponse, User
+from backend.models.db.sql.auth import SurveyResponse, SurveyResponseAnswer, User
 from backend.routers.auth.auth import get_current_user
+from backend.services.surveys.answer_validation import validate_answers
+from backend.services.surveys.response_answers import answer_rows
+from backend.services.surveys.response_filters import AnswerFilter, answer_filter_clauses, parse_answer_filters
 from backend.db.mongo.mongoDB import surveys_collection
 
 
@@ -23,6 +30,12 @@ router = APIRouter(
 )
 
 
+response_body = JsonBody(SurveyResponseCreate)
+
+# Switch (boolean) answers are stored as 'true'/'false' value keys
+_BOOL_OPTIONS = {"true": "Yes", "false": "No"}
+
+
 def _parse_survey_object_id(id: str) -> ObjectId:
     try:
         return ObjectId(id)
@@ -37,6 +50,34 @@ def _to_survey_status(survey: dict) -> SurveyStatus:
     return SurveyStatus.published if bool(survey.get("is_public")) else SurveyStatus.draft
 
 
+async def _gather(*aws):
+    """
+    asyncio.gather that cancels the remaining awaitables when one fails, so no
+    query keeps running against a session the dependency is about to close.
+    """
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+def answer_filters(
+    answer: List[str] = Query(
+        [], description="Only responses where a question's answer equals a value, as questionId:value. Repeat to combine."),
+    answer_contains: List[str] = Query(
+        [], description="Only responses where a multi-choice answer includes a value, as questionId:value. Repeat to combine."),
+) -> list[AnswerFilter]:
+    """Answer predicates shared by the routes that list or export responses."""
+    try:
+        return parse_answer_filters(answer) + parse_answer_filters(answer_contains, contains=True)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
 def _serialize_response(response: SurveyResponse) -> dict:
     return {
         "id": str(response.id),
@@ -46,11 +87,15 @@ def _serialize_response(response: SurveyResponse) -> dict:
     }
 
 
-@router.post("/{id}/responses")
+@router.post(
+    "/{id}/responses",
+    dependencies=[Depends(submit_response_ip_limit), Depends(submit_response_survey_limit)],
+    openapi_extra=response_body.openapi_extra,
+)
 async def submit_response(
     id: str,
-    payload: SurveyResponseCreate,
-    db: AsyncSession = Depends(get_async_db),
+    db: AsyncSession = Depends(get_ingest_db),
+    payload: SurveyResponseCreate = Depends(response_body),
 ):
     """
     Submit an anonymous response for a published survey.
@@ -68,15 +113,21 @@ async def submit_response(
     except Exception:
         raise HTTPException(status_code=500, detail="Survey owner is invalid")
 
+    errors = validate_answers(survey, payload.answers)
+    if errors:
+        raise RequestValidationError(errors)
+
     submitted_at = payload.submitted_at or datetime.now(timezone.utc)
     if submitted_at.tzinfo is None:
         submitted_at = submitted_at.replace(tzinfo=timezone.utc)
 
+    answers = [answer.model_dump() for answer in payload.answers]
     response = SurveyResponse(
         survey_id=id,
         survey_owner_id=survey_owner_id,
-        answers=[answer.model_dump() for answer in payload.answers],
+        answers=answers,
         submitted_at=submitted_at,
+        answer_keys=answer_rows(id, answers),
     )
     db.add(response)
     await db.commit()
@@ -88,45 +139,59 @@ async def submit_response(
 async def list_responses(
     id: str,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_async_db),
+    db: AsyncSession = Depends(get_read_db),
     page: int = Query(1, ge=1, description="Page number (1-indexed)"),
     page_size: int = Query(
         10, ge=1, le=100, description="Number of responses per page"),
+    filters_by_answer: list[AnswerFilter] = Depends(answer_filters),
 ):
     """
     List responses for a survey owned by the current user with pagination.
+    The Mongo ownership check and the SQL page run concurrently; the SQL side is
+    already scoped to the owner, and nothing is returned until ownership is confirmed.
+    Answer filters are ANDed together.
     """
     object_id = _parse_survey_object_id(id)
-    survey = await surveys_collection.find_one({
-        "_id": object_id,
-        "created_by_id": str(current_user.id)
-    })
-
-    if not survey:
-        raise HTTPException(
-            status_code=404, detail="Survey not found or access denied")
-
-    # Count total responses
-    count_query = select(func.count()).select_from(SurveyResponse).where(
+    offset = (page - 1) * page_size
+    filters = (
         SurveyResponse.survey_id == id,
         SurveyResponse.survey_owner_id == current_user.id,
+        *answer_filter_clauses(filters_by_answer),
     )
-    total_count = (await db.execute(count_query)).scalar() or 0
 
-    # Fetch paginated responses
-    offset = (page - 1) * page_size
-    query = (
-        select(SurveyResponse)
-        .where(
-            SurveyResponse.survey_id == id,
-            SurveyResponse.survey_owner_id == current_user.id,
+    async def fetch_page():
+        # One session cannot run statements concurrently, so these stay sequential
+        query = (
+            select(SurveyResponse)
+            .where(*filters)
+            .order_by(desc(SurveyResponse.submitted_at), desc(SurveyResponse.id))
+            .limit(page_size)
+            .offset(offset)
         )
-        .order_by(desc(SurveyResponse.submitted_at), desc(SurveyResponse.id))
-        .limit(page_size)
-        .offset(offset)
+        responses = (await db.execute(query)).scalars().all()
+
+        # A short, non-empty page (or an empty first page) already determines the total
+        if len(responses) < page_size and (responses or offset == 0):
+            total_count = offset + len(responses)
+        else:
+            count_query = select(func.count()).select_from(SurveyResponse).where(*filters)
+            total_count = (await db.execute(count_query)).scalar() or 0
+
+        # Reads are done; free the connection while the Mongo lookup may still be running
+        await release_connection(db)
+        return responses, total_count
+
+    survey, (responses, total_count) = await _gather(
+        surveys_collection.find_one({
+            "_id": object_id,
+            "created_by_id": str(current_user.id)
+        }),
+        fetch_page(),
     )
-    result = await db.execute(query)
-    responses = result.scalars().all()
+
+    if not survey:
+        raise HTTPException(
+            status_code=404, detail="Survey not found or access denied")
 
     return {
         "responses": [_serialize_response(r) for r in responses],
@@ -140,7 +205,7 @@ async def list_responses(
 async def get_survey_stats(
     id: str,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_async_db),
+    db: AsyncSession = Depends(get_analytics_db),
     start_date: Optional[str] = Query(
         None, description="Start date filter (ISO format YYYY-MM-DD)"),
     end_date: Optional[str] = Query(
@@ -151,14 +216,6 @@ async def get_survey_stats(
     Includes response count, completion rate, trend data, and question breakdown.
     """
     object_id = _parse_survey_object_id(id)
-    survey = await surveys_collection.find_one({
-        "_id": object_id,
-        "created_by_id": str(current_user.id)
-    })
-
-    if not survey:
-        raise HTTPException(
-            status_code=404, detail="Survey not found or access denied")
 
     # Parse date filters if provided
     start_dt = None
@@ -180,73 +237,86 @@ async def get_survey_stats(
                 status_code=400, detail="Invalid end_date format. Use YYYY-MM-DD")
 
     # Build query for responses
-    query = select(SurveyResponse).where(
+    response_filters = [
         SurveyResponse.survey_id == id,
         SurveyResponse.survey_owner_id == current_user.id,
-    )
-
+    ]
     if start_dt:
-        query = query.where(SurveyResponse.submitted_at >= start_dt)
+        response_filters.append(SurveyResponse.submitted_at >= start_dt)
     if end_dt:
-        query = query.where(SurveyResponse.submitted_at <= end_dt)
+        response_filters.append(SurveyResponse.submitted_at <= end_dt)
+
+    # Per-day response counts and answered-question totals, aggregated in SQL (dates in UTC)
+    # 'UTC' is inlined: a bind parameter would be numbered apart in SELECT and GROUP BY
+    day = func.date(func.timezone(literal_column("'UTC'"), SurveyResponse.submitted_at)).label("day")
+    trend_query = (
+        select(day, func.count(), func.sum(func.jsonb_array_length(SurveyResponse.answers)))
+        .where(*response_filters)
+        .group_by(day)
+        .order_by(day)
+    )
+
+    # Option counts come from the per-answer rows instead of re-reading every JSONB document
+    counts_query = (
+        select(SurveyResponseAnswer.question_id, SurveyResponseAnswer.value_key, func.count())
+        .join(SurveyResponse, SurveyResponse.id == SurveyResponseAnswer.response_id)
+        .where(SurveyResponseAnswer.survey_id == id, *response_filters)
+        .group_by(SurveyResponseAnswer.question_id, SurveyResponseAnswer.value_key)
+    )
+
+    async def fetch_rows():
+        # One session cannot run statements concurrently, so these stay sequential
+        trend_rows = (await db.execute(trend_query)).all()
+        answer_counts = (await db.execute(counts_query)).all()
+        await release_connection(db)
+        return trend_rows, answer_counts
+
+    # Survey document and aggregates are independent; ownership is checked once both arrive
+    survey, (trend_rows, answer_counts) = await _gather(
+        surveys_collection.find_one({
+            "_id": object_id,
+            "created_by_id": str(current_user.id)
+        }),
+        fetch_rows(),
+    )
 
-    result = await db.execute(query)
-    responses = result.scalars().all()
+    if not survey:
+        raise HTTPException(
+            status_code=404, detail="Survey not found or access denied")
 
     # Calculate stats
-    total_responses = len(responses)
+    total_responses = sum(count for _, count, _ in trend_rows)
+    total_answers = sum(answered or 0 for _, _, answered in trend_rows)
     questions = survey.get("questions", [])
     total_questions = len(questions)
 
-    # Calculate completion rate
+    # Completion rate: mean share of questions answered per response
     completion_rate = 0.0
     if total_responses > 0 and total_questions > 0:
-        completion_rates = []
-        for response in responses:
-            answered = len(response.answers)
-            rate = (answered / total_questions) * \
-                100 if total_questions > 0 else 0
-            completion_rates.append(rate)
-        completion_rate = round(
-            sum(completion_rates) / len(completion_rates), 1)
-
-    # Build trend data (group by date)
-    trend_data = defaultdict(int)
-    for response in responses:
-        date_str = response.submitted_at.date().isoformat()
-        trend_data[date_str] += 1
+        completion_rate = round(total_answers / total_responses / total_questions * 100, 1)
 
     trend = [
-        TrendPoint(date=date, responses=count)
-        for date, count in sorted(trend_data.items())
+        TrendPoint(date=str(date), responses=count)
+        for date, count, _ in trend_rows
     ]
 
+    # Group option counts per question; multi-choice answers count once per selected option.
+    # Only Switch answers are booleans; a text or option value "true" keeps its label.
+    switch_ids = {question.get("id") for question in questions if question.get("component") == "Switch"}
+    counts_by_question = defaultdict(dict)
+    for question_id, value_key, count in answer_counts:
+        option = _BOOL_OPTIONS.get(value_key, value_key) if question_id in switch_ids else value_key
+        counts_by_question[question_id][option] = counts_by_question[question_id].get(option, 0) + count
+
     # Build question breakdown
     question_breakdown = []
     for question in questions:
         question_id = question.get("id")
         question_text = question.get("questionText", f"Question {question_id}")
 
-        # Count answers for this question
-        option_counts = defaultdict(int)
-        for response in responses:
-            # Find answer for this question
-            for answer in response.answers:
-                if answer.get("questionId") == question_id:
-                    value = answer.get("value")
-                    # Convert value to string for grouping
-                    if isinstance(value, list):
-                        key = ", ".join(str(v) for v in value)
-                    elif isinstance(value, bool):
-                        key = "Yes" if value else "No"
-                    else:
-                        key = str(value)
-                    option_counts[key] += 1
-                    break
-
         counts = [
             {"option": option, "count": count}
-            for option, count in sorted(option_counts.items())
+            for option, count in sorted(counts_by_question[question_id].items())
         ]
 
         question_breakdown.append(QuestionStats(
@@ -4,11 +4,12 @@ Route for managing surveys.
 from typing import List
 
 from bson import ObjectId
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
 from fastapi.exceptions import RequestValidationError
 from pymongo.errors import DuplicateKeyError
 
 from backend.config import settings
+from backend.middleware.json_body import JsonBody
 from backend.models.api.surveys import (
     Survey,
     SurveyCreate,
@@ -26,6 +27,7 @@ from backend.services.surveys.survey_generation import (
     is_suspicious_prompt,
 )
 from backend.db.mongo import surveys_collection
+from backend.db.read_routing import mark_recent_write, surveys_for_read
 
 router = APIRouter(
     prefix="/surveys",
@@ -33,6 +35,9 @@ router = APIRouter(
 )
 
 
+survey_body = JsonBody(SurveyCreate)
+
+
 def _to_survey_status(survey: dict) -> SurveyStatus:
     raw_status = survey.get("status")
     if raw_status in {SurveyStatus.draft.value, SurveyStatus.published.value}:
@@ -55,8 +60,12 @@ def _parse_survey_object_id(id: str) -> ObjectId:
         raise HTTPException(status_code=400, detail="Invalid survey ID format")
 
 
-@router.post("/")
-async def create_survey(survey: SurveyCreate, current_user: User = Depends(get_current_user)):
+@router.post("/", openapi_extra=survey_body.openapi_extra)
+async def create_survey(
+    response: Response,
+    current_user: User = Depends(get_current_user),
+    survey: SurveyCreate = Depends(survey_body),
+):
     """Create a new survey.
 
     :param survey: The survey to create.
@@ -71,8 +80,11 @@ async def create_survey(survey: SurveyCreate, current_user: User = Depends(get_c
         survey_dict["status"] = survey.status.value
         survey_dict["created_by_id"] = str(current_user.id)
         survey_dict["created_by_email"] = current_user.email
+        # Bumped on every update; keys the compiled answer validators
+        survey_dict["revision"] = 1
 
         result = await surveys_collection.insert_one(survey_dict)
+        mark_recent_write(response)
         return {"id": str(result.inserted_id)}
     except DuplicateKeyError:
         raise HTTPException(
@@ -84,7 +96,7 @@ async def create_survey(survey: SurveyCreate, current_user: User = Depends(get_c
 
 
 @router.get("/options", response_model=List[SurveyOption])
-async def get_survey_options(current_user: User = Depends(get_current_user)):
+async def get_survey_options(request: Request, current_user: User = Depends(get_current_user)):
     """
     Get a list of survey options (ID and title) for the authenticated user.
 
@@ -93,7 +105,7 @@ async def get_survey_options(current_user: User = Depends(get_current_user)):
     :return: List of survey options.
     :rtype: list[SurveyOption]
     """
-    cursor = surveys_collection.find({"created_by_id": str(current_user.id)})
+    cursor = surveys_for_read(request).find({"created_by_id": str(current_user.id)})
     options = []
 
     async for survey in cursor:
@@ -160,12 +172,12 @@ async def generate_survey(payload: SurveyGenerateRequest, current_user: User = D
 
 
 @router.get("/public/{id}", response_model=Survey)
-async def get_public_survey(id: str):
+async def get_public_survey(id: str, request: Request):
     """
     Return a published survey for anonymous responders.
     """
     object_id = _parse_survey_object_id(id)
-    survey = await surveys_collection.find_one({"_id": object_id})
+    survey = await surveys_for_read(request).find_one({"_id": object_id})
     if not survey or _to_survey_status(survey) != SurveyStatus.published:
         raise HTTPException(status_code=404, detail="Survey not found")
     return Survey(**_normalize_survey(survey))
@@ -198,8 +210,13 @@ async def get_survey(id: str, current_user: User = Depends(get_current_user)):
     return Survey(**_normalize_survey(survey))
 
 
-@router.put("/{id}")
-async def update_survey(id: str, survey: SurveyCreate, current_user: User = Depends(get_current_user)):
+@router.put("/{id}", openapi_extra=survey_body.openapi_extra)
+async def update_survey(
+    id: str,
+    response: Response,
+    current_user: User = Depends(get_current_user),
+    survey: SurveyCreate = Depends(survey_body),
+):
     """
     Update an existing survey by ID for the authenticated owner.
 
@@ -225,7 +242,7 @@ async def update_survey(id: str, survey: SurveyCreate, current_user: User = Depe
                 "_id": object_id,
                 "created_by_id": str(current_user.id),
             },
-            {"$set": survey_dict},
+            {"$set": survey_dict, "$inc": {"revision": 1}},
         )
     except DuplicateKeyError:
         raise HTTPException(
@@ -239,11 +256,12 @@ async def update_survey(id: str, survey: SurveyCreate, current_user: User = Depe
         raise HTTPException(
             status_code=404, detail="Survey not found or access denied")
 
+    mark_recent_write(response)
     return {"id": id}
 
 
 @router.delete("/{id}")
-async def delete_survey(id: str, current_user: User = Depends(get_current_user)):
+async def delete_survey(id: str, response: Response, current_user: User = Depends(get_current_user)):
     """
     Delete a survey by its ID.
 
@@ -268,4 +286,5 @@ async def delete_survey(id: str, current_user: User = Depends(get_current_user))
         raise HTTPException(
             status_code=404, detail="Survey not found or access denied")
 
+    mark_recent_write(response)
     return {"message": "Survey deleted successfully"}
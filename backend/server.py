@@ -0,0 +1,152 @@
+"""
+Production entry point.
+
+    python -m backend.server
+
+Runs uvicorn with one worker process per available CPU (SERVER_WORKERS to
+override), uvloop/httptools when installed, and workers recycled after
+SERVER_MAX_REQUESTS requests (the supervisor starts a fresh one). Each worker
+draws its own limit within SERVER_MAX_REQUESTS_JITTER of that value, so
+workers that share the load evenly do not all restart at the same moment.
+On SIGTERM uvicorn stops accepting connections and waits up to
+SERVER_GRACEFUL_SHUTDOWN_SECONDS for in-flight requests. With several workers,
+Prometheus metrics run in multiprocess mode over PROMETHEUS_MULTIPROC_DIR.
+"""
+
+import glob
+import logging
+import os
+import random
+import sys
+import tempfile
+
+import uvicorn
+from prometheus_client import multiprocess as prometheus_multiprocess
+from uvicorn.main import STARTUP_FAILURE
+from uvicorn.supervisors import Multiprocess
+
+from backend.config import settings
+
+logger = logging.getLogger(__name__)
+
+APP = "backend.main:app"
+
+
+def available_cpus() -> int:
+    """CPUs this process may run on (respects container cpusets where the OS exposes them)."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def worker_count(configured: int = None, max_workers: int = None) -> int:
+    configured = settings.SERVER_WORKERS if configured is None else configured
+    max_workers = settings.SERVER_MAX_WORKERS if max_workers is None else max_workers
+    if configured > 0:
+        return configured
+    return max(1, min(available_cpus(), max_workers))
+
+
+def jittered_limit(limit: int, jitter: float = None) -> int:
+    """``limit`` moved by a random amount of up to ``jitter`` (a fraction of it) either way."""
+    jitter = settings.SERVER_MAX_REQUESTS_JITTER if jitter is None else jitter
+    spread = int(limit * jitter)
+    return max(1, limit + random.randint(-spread, spread))
+
+
+class RecyclingServer(uvicorn.Server):
+    """
+    uvicorn Server that jitters limit_max_requests in the process it runs in.
+    The supervisor starts every worker (and every replacement) from the
+    parent's copy, so each one draws a fresh limit.
+    """
+
+    def run(self, sockets=None) -> None:
+        if self.config.limit_max_requests:
+            self.config.limit_max_requests = jittered_limit(self.config.limit_max_requests)
+        return super().run(sockets=sockets)
+
+
+def server_options() -> dict:
+    """Keyword arguments for uvicorn.run built from settings."""
+    workers = worker_count()
+    max_requests = settings.SERVER_MAX_REQUESTS or None
+    if workers == 1 and max_requests:
+        # Without a supervisor a recycled worker would take the whole server down
+        logger.warning("SERVER_MAX_REQUESTS ignored: worker recycling needs more than one worker")
+        max_requests = None
+    return {
+        "host": settings.SERVER_HOST,
+        "port": settings.SERVER_PORT,
+        "workers": workers,
+        "loop": settings.SERVER_LOOP,
+        "http": settings.SERVER_HTTP,
+        "timeout_keep_alive": settings.SERVER_KEEPALIVE_SECONDS,
+        "backlog": settings.SERVER_BACKLOG,
+        "limit_max_requests": max_requests,
+        "timeout_graceful_shutdown": settings.SERVER_GRACEFUL_SHUTDOWN_SECONDS,
+    }
+
+
+def prepare_metrics_dir() -> str:
+    """
+    Point every worker at one empty PROMETHEUS_MULTIPROC_DIR, so /metrics
+    aggregates all workers. Files left by a previous run are removed.
+    """
+    directory = settings.PROMETHEUS_MULTIPROC_DIR or tempfile.mkdtemp(prefix="prometheus-")
+    os.makedirs(directory, exist_ok=True)
+    for path in glob.glob(os.path.join(directory, "*.db")):
+        os.remove(path)
+    # Set before any worker imports prometheus_client, which reads it at import time
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = directory
+    return directory
+
+
+class MetricsMultiprocess(Multiprocess):
+    """
+    uvicorn's worker supervisor that also marks exited workers dead for
+    prometheus_client, dropping their live gauges from the aggregate.
+    """
+
+    def _reaped(self, action, *args) -> None:
+        before = {process.pid for process in self.processes}
+        action(*args)
+        alive = {process.pid for process in self.processes if process.process.exitcode is None}
+        for pid in before - alive:
+            prometheus_multiprocess.mark_process_dead(pid)
+
+    def keep_subprocess_alive(self) -> None:
+        self._reaped(super().keep_subprocess_alive)
+
+    def restart_all(self) -> None:
+        self._reaped(super().restart_all)
+
+    def handle_ttou(self) -> None:
+        self._reaped(super().handle_ttou)
+
+    def join_all(self) -> None:
+        self._reaped(super().join_all)
+
+
+def main() -> None:
+    options = server_options()
+    # Workers size their PostgreSQL pools from SQL_CONNECTION_BUDGET / WEB_CONCURRENCY
+    os.environ["WEB_CONCURRENCY"] = str(options["workers"])
+    logger.info("Starting %s with %s", APP, options)
+    # uvicorn.run() without the reload branch, so workers run RecyclingServer
+    config = uvicorn.Config(APP, **options)
+    server = RecyclingServer(config=config)
+    try:
+        if config.workers > 1:
+            prepare_metrics_dir()
+            MetricsMultiprocess(config, target=server.run, sockets=[config.bind_socket()]).run()
+        else:
+            server.run()
+    except KeyboardInterrupt:
+        pass
+    if config.workers == 1 and not server.started:
+        sys.exit(STARTUP_FAILURE)
+
+
+if __name__ == "__main__":
+    main()
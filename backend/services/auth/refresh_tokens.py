@@ -0,0 +1,87 @@
+"""Background maintenance for the refresh_tokens table."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, or_, select
+
+from backend.config import settings
+from backend.db.sql.sql_driver import AsyncSessionLocal
+from backend.middleware.metrics import refresh_tokens_pruned_total
+from backend.models.db.sql.auth import RefreshToken, User
+
+logger = logging.getLogger(__name__)
+
+
+async def _delete_in_batches(batch_query, batch_size: int) -> int:
+    """Delete rows selected by ``batch_query`` (an id subquery) until none are left."""
+    deleted = 0
+    while True:
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(
+                delete(RefreshToken)
+                .where(RefreshToken.id.in_(batch_query.limit(batch_size).scalar_subquery()))
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
+        deleted += result.rowcount or 0
+        if (result.rowcount or 0) < batch_size:
+            return deleted
+        # Yield to request handlers between batches
+        await asyncio.sleep(0)
+
+
+async def prune_refresh_tokens(batch_size: int = settings.REFRESH_TOKEN_PRUNE_BATCH_SIZE) -> int:
+    """
+    Delete refresh tokens that can no longer be used.
+
+    Expired tokens (older than REFRESH_EXPIRE_DAYS) are removed oldest first via
+    a range scan on ix_refresh_tokens_created_at. Revoked tokens and tokens from a
+    revoked session family (token_version behind the user's) are removed next.
+    Each batch is its own short transaction so the table is never locked for long.
+
+    Returns:
+        int: Number of deleted rows.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(days=settings.REFRESH_EXPIRE_DAYS)
+
+    expired = (
+        select(RefreshToken.id)
+        .where(RefreshToken.created_at < cutoff)
+        .order_by(RefreshToken.created_at)
+    )
+    revoked = (
+        select(RefreshToken.id)
+        .join(User, User.id == RefreshToken.user_id)
+        .where(
+            or_(
+                RefreshToken.revoked.is_(True),
+                RefreshToken.token_version != User.token_version,
+            )
+        )
+        .order_by(RefreshToken.created_at)
+    )
+
+    deleted = await _delete_in_batches(expired, batch_size)
+    deleted += await _delete_in_batches(revoked, batch_size)
+    refresh_tokens_pruned_total.inc(deleted)
+    if deleted:
+        logger.info("Pruned %s expired or revoked refresh tokens.", deleted)
+    return deleted
+
+
+async def run_refresh_token_pruner(
+    interval_seconds: float = settings.REFRESH_TOKEN_PRUNE_INTERVAL_SECONDS,
+) -> None:
+    """Prune refresh tokens every ``interval_seconds`` until cancelled."""
+    while True:
+        try:
+            await prune_refresh_tokens()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Refresh token pruning failed")
+        await asyncio.sleep(interval_seconds)
@@ -0,0 +1,145 @@
+"""
+Compiled answer validation for survey responses.
+
+A survey's questions are compiled once per revision into a questionId -> rule
+map holding frozensets of allowed option values, so every submission is
+checked in O(answers) with set lookups instead of walking the survey document.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Iterable
+
+from backend.config import settings
+from backend.models.api.surveys import SurveyAnswer
+
+# Unanswered questions are submitted as "" by the survey page, whatever the component
+UNANSWERED = ""
+
+
+@dataclass(frozen=True)
+class QuestionRule:
+    kind: str  # text, toggle, choice, multi or any
+    allowed: frozenset[str] = frozenset()
+
+
+def _option_values(option_props: dict, key: str) -> frozenset[str]:
+    return frozenset(
+        str(item["value"])
+        for item in option_props.get(key) or []
+        if isinstance(item, dict) and "value" in item
+    )
+
+
+def _compile_question(question: dict) -> QuestionRule:
+    component = question.get("component")
+    option_props = (question.get("option") or {}).get("optionProps") or {}
+    if component == "TextInput":
+        return QuestionRule("text")
+    if component == "Switch":
+        return QuestionRule("toggle")
+    if component == "RadioBar":
+        return QuestionRule("choice", _option_values(option_props, "buttons"))
+    if component == "DropDown":
+        return QuestionRule("choice", _option_values(option_props, "options"))
+    if component == "CheckboxTiles":
+        return QuestionRule("multi", _option_values(option_props, "buttons"))
+    # Components this backend does not know yet are accepted as-is
+    return QuestionRule("any")
+
+
+def _error(index: int, message: str, value: Any, field: str = "value") -> dict:
+    return {
+        "type": "value_error",
+        "loc": ("body", "answers", index, field),
+        "msg": message,
+        "input": value,
+    }
+
+
+class SurveyAnswerValidator:
+    """Validator compiled from one revision of a survey's questions."""
+
+    def __init__(self, rules: dict[str, QuestionRule]):
+        self.rules = rules
+
+    def validate(self, answers: Iterable[SurveyAnswer]) -> list[dict]:
+        """Return FastAPI-style validation errors; empty when all answers are valid."""
+        errors = []
+        seen = set()
+        for index, answer in enumerate(answers):
+            question_id, value = answer.questionId, answer.value
+            rule = self.rules.get(question_id)
+            if rule is None:
+                errors.append(_error(index, f"Unknown question '{question_id}'", question_id, "questionId"))
+                continue
+            if question_id in seen:
+                errors.append(_error(index, f"Duplicate answer for question '{question_id}'", question_id, "questionId"))
+                continue
+            seen.add(question_id)
+
+            if value == UNANSWERED or rule.kind == "any":
+                continue
+            if rule.kind == "text":
+                if not isinstance(value, str):
+                    errors.append(_error(index, "Expected a text answer", value))
+            elif rule.kind == "toggle":
+                if not isinstance(value, bool):
+                    errors.append(_error(index, "Expected a boolean answer", value))
+            elif rule.kind == "choice":
+                if not isinstance(value, str) or value not in rule.allowed:
+                    errors.append(_error(index, "Value is not one of the question's options", value))
+            elif rule.kind == "multi":
+                if not isinstance(value, list) or not rule.allowed.issuperset(value) or len(set(value)) != len(value):
+                    errors.append(_error(index, "Values must be distinct options of the question", value))
+        return errors
+
+
+def compile_survey_validator(survey: dict) -> SurveyAnswerValidator:
+    return SurveyAnswerValidator(
+        {
+            str(question["id"]): _compile_question(question)
+            for question in survey.get("questions") or []
+            if isinstance(question, dict) and question.get("id") is not None
+        }
+    )
+
+
+class ValidatorCache:
+    """LRU of compiled validators keyed by survey id; a new revision replaces the old entry."""
+
+    def __init__(self, max_entries: int):
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[int, SurveyAnswerValidator]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, survey: dict) -> SurveyAnswerValidator:
+        survey_id = str(survey["_id"])
+        revision = int(survey.get("revision") or 0)
+        with self._lock:
+            cached = self._entries.get(survey_id)
+            if cached is not None and cached[0] == revision:
+                self._entries.move_to_end(survey_id)
+                return cached[1]
+
+        validator = compile_survey_validator(survey)
+        with self._lock:
+            self._entries[survey_id] = (revision, validator)
+            self._entries.move_to_end(survey_id)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return validator
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+validator_cache = ValidatorCache(settings.ANSWER_VALIDATOR_CACHE_SIZE)
+
+
+def validate_answers(survey: dict, answers: Iterable[SurveyAnswer]) -> list[dict]:
+    return validator_cache.get(survey).validate(answers)
@@ -0,0 +1,104 @@
+"""
+Normalised answer rows (survey_response_answers) for survey responses.
+
+Each answered (question, value) pair of a response gets one row, written in
+the same transaction as the response at ingest. ``backfill_response_answers``
+fills the table for responses stored before it existed, or by workers that
+did not write it yet.
+"""
+
+import logging
+import uuid
+from typing import Any, Iterable
+
+from sqlalchemy import text
+
+from backend.config import settings
+from backend.db.sql.sql_driver import get_maintenance_engine
+from backend.models.db.sql.auth import SurveyResponseAnswer
+
+logger = logging.getLogger(__name__)
+
+# Mirrors answer_rows() in SQL: booleans become 'true'/'false', arrays one row
+# per element, and unanswered ("") and null values are skipped (->> yields NULL)
+_BACKFILL_SQL = text(
+    """
+    INSERT INTO survey_response_answers (response_id, survey_id, question_id, value_key)
+    SELECT r.id, r.survey_id, a.answer ->> 'questionId', v.value_key
+    FROM survey_responses r
+    CROSS JOIN LATERAL jsonb_array_elements(r.answers) AS a(answer)
+    CROSS JOIN LATERAL (
+        SELECT jsonb_array_elements_text(a.answer -> 'value') AS value_key
+        WHERE jsonb_typeof(a.answer -> 'value') = 'array'
+        UNION ALL
+        SELECT a.answer ->> 'value'
+        WHERE jsonb_typeof(a.answer -> 'value') <> 'array'
+    ) AS v
+    WHERE r.id = ANY(:ids)
+      AND a.answer ->> 'questionId' IS NOT NULL
+      AND v.value_key IS NOT NULL
+      AND v.value_key <> ''
+    ON CONFLICT DO NOTHING
+    """
+)
+
+_NEXT_BATCH_SQL = text(
+    """
+    SELECT r.id FROM survey_responses r
+    WHERE r.id > :after
+      AND NOT EXISTS (SELECT 1 FROM survey_response_answers x WHERE x.response_id = r.id)
+    ORDER BY r.id
+    LIMIT :limit
+    """
+)
+
+
+def answer_value_keys(value: Any) -> list[str]:
+    """Index keys for one answer value, in the order they were given."""
+    values = value if isinstance(value, list) else [value]
+    keys = []
+    for item in values:
+        if item is None:
+            continue
+        key = ("true" if item else "false") if isinstance(item, bool) else str(item)
+        if key and key not in keys:
+            keys.append(key)
+    return keys
+
+
+def answer_rows(survey_id: str, answers: Iterable[dict]) -> list[SurveyResponseAnswer]:
+    """Rows for ``SurveyResponse.answer_keys``; response_id is filled in on flush."""
+    rows = {}
+    for answer in answers:
+        question_id = answer.get("questionId")
+        if question_id is None:
+            continue
+        for value_key in answer_value_keys(answer.get("value")):
+            rows.setdefault(
+                (question_id, value_key),
+                SurveyResponseAnswer(survey_id=survey_id, question_id=question_id, value_key=value_key),
+            )
+    return list(rows.values())
+
+
+async def backfill_response_answers(batch_size: int = settings.SQL_MIGRATION_BATCH_SIZE) -> int:
+    """
+    Write answer rows for responses that have none, one committed batch at a time.
+    Runs on the maintenance engine (no statement_timeout). Safe to re-run;
+    returns the number of responses processed.
+    """
+    processed = 0
+    after = uuid.UUID(int=0)
+    async with get_maintenance_engine().connect() as conn:
+        while True:
+            ids = (
+                await conn.execute(_NEXT_BATCH_SQL, {"after": after, "limit": batch_size})
+            ).scalars().all()
+            if not ids:
+                break
+            await conn.execute(_BACKFILL_SQL, {"ids": list(ids)})
+            await conn.commit()
+            processed += len(ids)
+            after = ids[-1]
+    logger.info("Backfilled survey_response_answers for %d responses.", processed)
+    return processed
@@ -0,0 +1,53 @@
+"""
+Answer predicates for listing (and exporting) survey responses.
+
+Filters are given as ``questionId:value`` strings and become JSONB containment
+clauses on SurveyResponse.answers, which the jsonb_path_ops GIN index serves.
+"""
+
+from dataclasses import dataclass
+
+from sqlalchemy import or_
+
+from backend.models.db.sql.auth import SurveyResponse
+
+_BOOLEAN_VALUES = ("true", "false")
+
+
+@dataclass(frozen=True)
+class AnswerFilter:
+    question_id: str
+    value: str
+    contains: bool = False  # the value is one of a multi-choice answer's options
+
+
+def parse_answer_filters(raw_filters: list[str], contains: bool = False) -> list[AnswerFilter]:
+    """Parse ``questionId:value`` strings; raises ValueError on a malformed filter."""
+    filters = []
+    for raw in raw_filters:
+        question_id, separator, value = raw.partition(":")
+        if not separator or not question_id:
+            raise ValueError(f"Invalid filter '{raw}'. Use questionId:value")
+        filters.append(AnswerFilter(question_id, value, contains))
+    return filters
+
+
+def answer_filter_clauses(filters: list[AnswerFilter]) -> list:
+    """
+    WHERE clauses matching every filter. Plain predicates share one @> array;
+    "true"/"false" equality also matches Switch answers stored as JSON booleans.
+    """
+    # An array value contains [v] when v is one of its selected options
+    elements = [
+        {"questionId": f.question_id, "value": [f.value] if f.contains else f.value}
+        for f in filters
+        if f.contains or f.value not in _BOOLEAN_VALUES
+    ]
+    clauses = [SurveyResponse.answers.contains(elements)] if elements else []
+    for f in filters:
+        if not f.contains and f.value in _BOOLEAN_VALUES:
+            clauses.append(or_(
+                SurveyResponse.answers.contains([{"questionId": f.question_id, "value": f.value}]),
+                SurveyResponse.answers.contains([{"questionId": f.question_id, "value": f.value == "true"}]),
+            ))
+    return clauses
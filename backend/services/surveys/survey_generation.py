@@ -4,12 +4,14 @@ from __future__ import annotations
 
 import json
 import re
+import time
 import uuid
 from typing import Any
 
 import httpx
 
 from backend.config import settings
+from backend.middleware.metrics import generation_duration_seconds, generation_failures_total
 from backend.models.api.surveys.survey_generation import (
     build_survey_generation_payload,
 )
@@ -79,6 +81,7 @@ async def _request_openai_survey(prompt: str) -> dict[str, Any]:
     attempts = max(settings.OPENAI_GENERATION_RETRIES, 0) + 1
 
     for _attempt in range(attempts):
+        started = time.perf_counter()
         try:
             async with httpx.AsyncClient(timeout=settings.OPENAI_TIMEOUT_SECONDS) as client:
                 response = await client.post(
@@ -88,14 +91,20 @@ async def _request_openai_survey(prompt: str) -> dict[str, Any]:
                 )
 
             if response.status_code >= 400:
+                generation_failures_total.labels(reason=f"http_{response.status_code}").inc()
+                generation_duration_seconds.labels(outcome="error").observe(time.perf_counter() - started)
                 raise SurveyGenerationProviderError(
                     f"OpenAI returned status {response.status_code}"
                 )
 
             data = response.json()
             text = _extract_output_text(data)
-            return json.loads(text)
+            parsed = json.loads(text)
+            generation_duration_seconds.labels(outcome="success").observe(time.perf_counter() - started)
+            return parsed
         except (httpx.HTTPError, ValueError, json.JSONDecodeError) as exc:
+            generation_failures_total.labels(reason=type(exc).__name__).inc()
+            generation_duration_seconds.labels(outcome="error").observe(time.perf_counter() - started)
             last_error = exc
 
     raise SurveyGenerationProviderError("Unable to generate survey draft") from last_error
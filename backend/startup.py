@@ -0,0 +1,116 @@
+"""
+Small dependency-graph runner for startup and migration steps.
+
+Every step starts as soon as the steps it depends on have finished, so
+independent work (PostgreSQL DDL, MongoDB index checks) overlaps and total
+time is the longest dependency chain instead of the sum of all steps.
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Optional
+
+logger = logging.getLogger("backend.startup")
+
+
+@dataclass(frozen=True)
+class Step:
+    """
+    A named unit of startup work.
+    ``run`` receives the results of already-finished steps keyed by name.
+    """
+
+    name: str
+    run: Callable[[dict[str, Any]], Awaitable[Any]]
+    depends_on: tuple[str, ...] = ()
+    timeout: Optional[float] = None
+
+
+@dataclass
+class StepResult:
+    status: str = "pending"  # ok, failed, timeout or skipped
+    started_ms: float = 0.0
+    duration_ms: float = 0.0
+    result: Any = None
+    error: Optional[str] = None
+
+
+@dataclass
+class StartupReport:
+    name: str
+    steps: dict[str, StepResult] = field(default_factory=dict)
+    total_ms: float = 0.0
+
+    @property
+    def failed(self) -> list[str]:
+        return [name for name, step in self.steps.items() if step.status != "ok"]
+
+    def result(self, name: str) -> Any:
+        return self.steps[name].result
+
+    def log(self) -> None:
+        step_sum = sum(step.duration_ms for step in self.steps.values())
+        logger.info(
+            "%s finished in %.1f ms (steps sum to %.1f ms)", self.name, self.total_ms, step_sum
+        )
+        for name, step in self.steps.items():
+            logger.info(
+                "  %-24s %-8s start=+%.1f ms duration=%.1f ms%s",
+                name,
+                step.status,
+                step.started_ms,
+                step.duration_ms,
+                f" error={step.error}" if step.error else "",
+            )
+
+
+async def run_graph(steps: list[Step], name: str = "startup") -> StartupReport:
+    """
+    Run steps concurrently, respecting ``depends_on``.
+    A failed or timed-out step marks its dependents as skipped; nothing is raised.
+    """
+    by_name = {step.name: step for step in steps}
+    for step in steps:
+        missing = [dep for dep in step.depends_on if dep not in by_name]
+        if missing:
+            raise ValueError(f"Step {step.name!r} depends on unknown steps {missing}")
+
+    report = StartupReport(name=name, steps={step.name: StepResult() for step in steps})
+    results: dict[str, Any] = {}
+    done = {step.name: asyncio.Event() for step in steps}
+    origin = time.perf_counter()
+
+    async def execute(step: Step) -> None:
+        outcome = report.steps[step.name]
+        try:
+            for dep in step.depends_on:
+                await done[dep].wait()
+            blocked = [dep for dep in step.depends_on if report.steps[dep].status != "ok"]
+            if blocked:
+                outcome.status = "skipped"
+                outcome.error = f"dependency failed: {', '.join(blocked)}"
+                return
+
+            started = time.perf_counter()
+            outcome.started_ms = round((started - origin) * 1000, 1)
+            try:
+                outcome.result = await asyncio.wait_for(step.run(results), timeout=step.timeout)
+                results[step.name] = outcome.result
+                outcome.status = "ok"
+            except asyncio.TimeoutError:
+                outcome.status = "timeout"
+                outcome.error = f"exceeded {step.timeout}s"
+            except Exception as exc:
+                logger.exception("Startup step %s failed", step.name)
+                outcome.status = "failed"
+                outcome.error = f"{type(exc).__name__}: {exc}"
+            finally:
+                outcome.duration_ms = round((time.perf_counter() - started) * 1000, 1)
+        finally:
+            done[step.name].set()
+
+    await asyncio.gather(*(execute(step) for step in steps))
+    report.total_ms = round((time.perf_counter() - origin) * 1000, 1)
+    report.log()
+    return report
@@ -3,3 +3,16 @@ from pathlib import Path
 
 # Add the parent directory (project root) to sys.path so 'backend' module can be found
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+
+import pytest
+
+from backend.middleware.rate_limiting import InMemoryRateLimitBackend, set_rate_limit_backend
+
+
+@pytest.fixture(autouse=True)
+def reset_rate_limits():
+    """Give every test fresh rate-limit buckets."""
+    set_rate_limit_backend(InMemoryRateLimitBackend())
+    yield
+    set_rate_limit_backend(None)
@@ -3,7 +3,7 @@ import types
 import uuid
 import pytest
 from types import SimpleNamespace
-from fastapi import Response, Request
+from fastapi import BackgroundTasks, Response, Request
 from starlette.datastructures import Headers
 from backend.routers.auth import auth as auth_mod
 
@@ -21,21 +21,43 @@ class FakeUser:
         self.is_active = is_active
 
 class FakeRefreshToken:
-    def __init__(self, user_id, token_id, revoked=False):
+    def __init__(self, user_id, token_id, revoked=False, token_version=0):
         self.user_id = user_id
         self.token_id = token_id
         self.revoked = revoked
+        self.token_version = token_version
 
 class FakeSelect:
-    def __init__(self, model):
-        self.model = model
+    def __init__(self, *entities):
+        self.entities = entities
+        self.model = entities[0]
         self._where = tuple()
 
+    def join(self, target, *onclause):
+        return self
+
     def where(self, *conds):
         # Store any conditions (they're opaque to us, but our fakes will pack necessary values in them)
         self._where = tuple(conds)
         return self
 
+class FakeInsert:
+    def __init__(self, model):
+        self.model = model
+        self._values = {}
+        self.on_conflict = None
+
+    def values(self, **kwargs):
+        self._values = kwargs
+        return self
+
+    def on_conflict_do_nothing(self, index_elements=None):
+        self.on_conflict = "nothing"
+        return self
+
+    def returning(self, *cols):
+        return self
+
 class FakeFunc:
     class _Lower:
         def __init__(self, col):
@@ -61,68 +83,93 @@ class FakeSession:
     - add
     - commit
     - refresh
-    - execute(...).scalar_one_or_none()
+    - execute(...).scalar_one_or_none() / .first()
     - get(model, pk)
+
+    Every call that would hit the database is counted in ``round_trips``;
+    objects passed to ``add`` count as one INSERT each when flushed on commit.
     """
     def __init__(self):
         self.users_by_email = {}   # email -> FakeUser
         self.users_by_id = {}      # uuid -> FakeUser
         self.refresh_tokens = {}   # jti -> FakeRefreshToken
+        self.pending = []
+        self.round_trips = 0
+
+    def reset_round_trips(self):
+        self.pending.clear()
+        self.round_trips = 0
 
     class _Result:
         def __init__(self, value):
             self._value = value
         def scalar_one_or_none(self):
             return self._value
+        def first(self):
+            return self._value
+
+    def _conditions(self, stmt):
+        conds = {}
+        for cond in stmt._where:
+            if isinstance(cond, tuple) and len(cond) == 2 and cond[0] == "LOWER_EQ":
+                conds["lower_email"] = cond[1]
+            if isinstance(cond, tuple) and len(cond) == 3 and cond[0] == "EQ":
+                conds[cond[1]] = cond[2]
+        return conds
 
     async def execute(self, stmt):
+        self.round_trips += 1
+
+        # INSERT INTO users ... ON CONFLICT (lower(email)) DO NOTHING RETURNING ...
+        if isinstance(stmt, FakeInsert) and stmt.model is auth_mod.User:
+            email = stmt._values["email"]
+            if email in self.users_by_email:
+                return FakeSession._Result(None)
+            user = FakeUser(email=email, password_hash=stmt._values["password_hash"])
+            self._store(user)
+            return FakeSession._Result(user)
+
         # SELECT User WHERE lower(User.email) == email
-        if isinstance(stmt, FakeSelect) and stmt.model is auth_mod.User:
-            # Find email packed inside ("LOWER_EQ", email)
-            email = None
-            for cond in stmt._where:
-                if isinstance(cond, tuple) and len(cond) == 2 and cond[0] == "LOWER_EQ":
-                    email = cond[1]
+        if isinstance(stmt, FakeSelect) and stmt.entities == (auth_mod.User,):
+            email = self._conditions(stmt).get("lower_email")
             user = self.users_by_email.get(email)
             return FakeSession._Result(user)
 
-        # SELECT RefreshToken WHERE token_id == jti AND revoked == False
-        if isinstance(stmt, FakeSelect) and stmt.model is auth_mod.RefreshToken:
-            # Expect cond like ("EQ", "token_id", jti) and ("EQ", "revoked", False)
-            jti = None
-            revoked_val = None
-            for cond in stmt._where:
-                if isinstance(cond, tuple) and len(cond) == 3:
-                    tag, field, value = cond
-                    if tag == "EQ" and field == "token_id":
-                        jti = value
-                    if tag == "EQ" and field == "revoked":
-                        revoked_val = value
-            rt = self.refresh_tokens.get(jti)
-            if rt and revoked_val is False and rt.revoked is False:
-                return FakeSession._Result(rt)
+        # SELECT User, RefreshToken.token_version JOIN ... WHERE token_id == jti AND user_id == sub AND revoked == False
+        if isinstance(stmt, FakeSelect) and stmt.model is auth_mod.User:
+            conds = self._conditions(stmt)
+            rt = self.refresh_tokens.get(conds.get("token_id"))
+            user = self.users_by_id.get(conds.get("user_id"))
+            if rt and user and rt.user_id == user.id and conds.get("revoked") is False and rt.revoked is False:
+                return FakeSession._Result((user, rt.token_version))
             return FakeSession._Result(None)
 
         # Fallback: nothing found
         return FakeSession._Result(None)
 
     async def get(self, model, pk):
+        self.round_trips += 1
         if model is auth_mod.User:
             return self.users_by_id.get(pk)
         return None
 
-    def add(self, obj):
+    def _store(self, obj):
         if isinstance(obj, FakeUser):
             self.users_by_email[obj.email] = obj
             self.users_by_id[obj.id] = obj
         elif isinstance(obj, FakeRefreshToken):
             self.refresh_tokens[obj.token_id] = obj
 
+    def add(self, obj):
+        self._store(obj)
+        self.pending.append(obj)
+
     async def commit(self):
-        return
+        self.round_trips += len(self.pending) + 1
+        self.pending.clear()
 
     async def refresh(self, obj):
-        return
+        self.round_trips += 1
 
 
 @pytest.fixture(autouse=True)
@@ -131,7 +178,7 @@ def patch_auth_module(monkeypatch):
     Auto-applied fixture to patch:
     - settings & constants
     - ORM models (User, RefreshToken) columns
-    - sqlalchemy helpers (select, func)
+    - sqlalchemy helpers (select, pg_insert, func)
     - security utils (hash/verify/make/decode)
     """
     # Patch cookie name & expiry settings
@@ -146,11 +193,17 @@ def patch_auth_module(monkeypatch):
     monkeypatch.setattr(auth_mod, "RefreshToken", FakeRefreshToken, raising=False)
     # attach "columns" for the FakeFunc.lower(...) and equality checks
     auth_mod.User.email = FakeColumn("email")
+    auth_mod.User.id = FakeColumn("id")
+    auth_mod.User.role = FakeColumn("role")
+    auth_mod.User.token_version = FakeColumn("token_version")
     auth_mod.RefreshToken.token_id = FakeColumn("token_id")
+    auth_mod.RefreshToken.user_id = FakeColumn("user_id")
+    auth_mod.RefreshToken.token_version = FakeColumn("token_version")
     auth_mod.RefreshToken.revoked = FakeColumn("revoked")
 
     # Patch SQL helpers
-    monkeypatch.setattr(auth_mod, "select", lambda model: FakeSelect(model), raising=False)
+    monkeypatch.setattr(auth_mod, "select", lambda *entities: FakeSelect(*entities), raising=False)
+    monkeypatch.setattr(auth_mod, "pg_insert", lambda model: FakeInsert(model), raising=False)
     monkeypatch.setattr(auth_mod, "func", FakeFunc(), raising=False)
 
     # Patch security utilities
@@ -160,6 +213,9 @@ def patch_auth_module(monkeypatch):
     def fake_verify_password(pw: str, hashed: str) -> bool:
         return hashed == f"hashed:{pw}"
 
+    def fake_needs_rehash(hashed: str) -> bool:
+        return False
+
     def fake_make_refresh_token(user_id):
         jti = uuid.uuid4()
         return ("refresh.jwt", jti)
@@ -174,6 +230,7 @@ def patch_auth_module(monkeypatch):
 
     monkeypatch.setattr(auth_mod, "hash_password", fake_hash_password, raising=False)
     monkeypatch.setattr(auth_mod, "verify_password", fake_verify_password, raising=False)
+    monkeypatch.setattr(auth_mod, "needs_rehash", fake_needs_rehash, raising=False)
     monkeypatch.setattr(auth_mod, "make_refresh_token", fake_make_refresh_token, raising=False)
     monkeypatch.setattr(auth_mod, "make_access_token", fake_make_access_token, raising=False)
     monkeypatch.setattr(auth_mod, "decode", fake_decode, raising=False)
@@ -235,7 +292,7 @@ async def test_login_success_sets_cookie_and_returns_access(db):
 
     resp = Response()
     payload = SimpleNamespace(email="  U@EX.COM ", password="pw")
-    out = await auth_mod.login(payload=payload, resp=resp, db=db)
+    out = await auth_mod.login(payload=payload, resp=resp, background_tasks=BackgroundTasks(), db=db)
 
     assert out["access_token"] == "access.jwt"
     cookies = resp.headers.get("set-cookie") or ""
@@ -254,10 +311,35 @@ async def test_login_invalid_credentials_401(db):
     resp = Response()
     payload = SimpleNamespace(email="u@ex.com", password="pw")
     with pytest.raises(Exception) as exc:
-        await auth_mod.login(payload=payload, resp=resp, db=db)
+        await auth_mod.login(payload=payload, resp=resp, background_tasks=BackgroundTasks(), db=db)
     assert hasattr(exc.value, "status_code") and exc.value.status_code == 401, f"detail: {exc.value}"
     assert "Invalid credentials" in str(exc.value.detail), f"detail: {exc.value.detail}"
 
+@pytest.mark.asyncio
+async def test_login_schedules_rehash_for_outdated_hash(db, monkeypatch):
+    user = FakeUser(email="u@ex.com", password_hash="hashed:pw")
+    db.add(user)
+    monkeypatch.setattr(auth_mod, "needs_rehash", lambda hashed: True, raising=False)
+
+    tasks = BackgroundTasks()
+    payload = SimpleNamespace(email="u@ex.com", password="pw")
+    await auth_mod.login(payload=payload, resp=Response(), background_tasks=tasks, db=db)
+
+    assert len(tasks.tasks) == 1
+    assert tasks.tasks[0].func is auth_mod.rehash_password
+    assert tasks.tasks[0].args == (user.id, "pw")
+
+@pytest.mark.asyncio
+async def test_login_skips_rehash_for_current_hash(db):
+    user = FakeUser(email="u@ex.com", password_hash="hashed:pw")
+    db.add(user)
+
+    tasks = BackgroundTasks()
+    payload = SimpleNamespace(email="u@ex.com", password="pw")
+    await auth_mod.login(payload=payload, resp=Response(), background_tasks=tasks, db=db)
+
+    assert tasks.tasks == []
+
 # ----------------------------
 # Tests for refresh (error branches)
 # ----------------------------
@@ -332,6 +414,39 @@ async def test_refresh_user_inactive_401(db, monkeypatch):
     assert exc.value.status_code == 401, f"exc value: {exc.value}"
     assert "User inactive" in exc.value.detail, f"detail: {exc.value.detail}"
 
+@pytest.mark.asyncio
+async def test_refresh_token_from_revoked_session_family_401(db, monkeypatch):
+    # Token issued under token_version 0, user has since logged out (version 1)
+    jti = uuid.uuid4()
+    uid = uuid.uuid4()
+
+    def good_decode(_):
+        return {"jti": str(jti), "sub": str(uid)}
+    monkeypatch.setattr(auth_mod, "decode", good_decode, raising=False)
+
+    db.add(FakeRefreshToken(user_id=uid, token_id=jti, revoked=False, token_version=0))
+    db.add(FakeUser(email="x@y.com", password_hash="hashed:a", token_version=1, id=uid))
+
+    resp = Response()
+    scope = {"type": "http", "headers": []}
+    req = Request(scope, receive=lambda: None)
+
+    with pytest.raises(Exception) as exc:
+        await auth_mod.refresh(request=req, resp=resp, db=db, refresh_token="ok")
+    assert exc.value.status_code == 401, f"exc value: {exc.value}"
+    assert "Refresh revoked or not found" in exc.value.detail, f"detail: {exc.value.detail}"
+
+@pytest.mark.asyncio
+async def test_login_records_session_family_on_refresh_token(db):
+    user = FakeUser(email="u@ex.com", password_hash="hashed:pw", token_version=3)
+    db.add(user)
+
+    payload = SimpleNamespace(email="u@ex.com", password="pw")
+    await auth_mod.login(payload=payload, resp=Response(), background_tasks=BackgroundTasks(), db=db)
+
+    (token,) = db.refresh_tokens.values()
+    assert token.token_version == 3
+
 # ----------------------------
 # Cookie helpers
 # ----------------------------
@@ -351,3 +466,47 @@ def test_set_and_clear_refresh_cookie_roundtrip():
     cookies2 = resp.headers.getlist("set-cookie")
     # Last cookie should contain Max-Age=0 or an expired date (framework-dependent)
     assert any("rt=" in c and "Path=/refresh" in c for c in cookies2), f"cookies: {cookies2}"
+
+# ----------------------------
+# Round trips per endpoint
+# ----------------------------
+
+@pytest.mark.asyncio
+async def test_register_round_trips(db):
+    payload = SimpleNamespace(email="new@ex.com", password="pw")
+    await auth_mod.register(payload=payload, resp=Response(), db=db)
+
+    # INSERT user ... RETURNING, INSERT refresh token, COMMIT
+    assert db.round_trips == 3, f"round trips: {db.round_trips}"
+
+@pytest.mark.asyncio
+async def test_login_round_trips(db):
+    db.add(FakeUser(email="u@ex.com", password_hash="hashed:pw"))
+    db.reset_round_trips()
+
+    payload = SimpleNamespace(email="u@ex.com", password="pw")
+    await auth_mod.login(payload=payload, resp=Response(), background_tasks=BackgroundTasks(), db=db)
+
+    # SELECT user, INSERT refresh token, COMMIT
+    assert db.round_trips == 3, f"round trips: {db.round_trips}"
+
+@pytest.mark.asyncio
+async def test_refresh_success_single_round_trip(db, monkeypatch):
+    jti = uuid.uuid4()
+    uid = uuid.uuid4()
+
+    def good_decode(_):
+        return {"jti": str(jti), "sub": str(uid)}
+    monkeypatch.setattr(auth_mod, "decode", good_decode, raising=False)
+
+    db.add(FakeRefreshToken(user_id=uid, token_id=jti))
+    db.add(FakeUser(email="x@y.com", password_hash="hashed:a", id=uid))
+    db.reset_round_trips()
+
+    scope = {"type": "http", "headers": []}
+    req = Request(scope, receive=lambda: None)
+    out = await auth_mod.refresh(request=req, resp=Response(), db=db, refresh_token="ok")
+
+    assert out["access_token"] == "access.jwt"
+    # Joined SELECT of token and user
+    assert db.round_trips == 1, f"round trips: {db.round_trips}"
@@ -1,16 +1,20 @@
 from backend.routers.auth.auth import get_current_user
-from backend.db.sql.sql_driver import get_async_db
+from backend.db.sql.sql_driver import get_analytics_db, get_async_db, get_ingest_db, get_read_db
 from backend.routers.surveys import router
 from backend.routers import responses
+import asyncio
 import uuid
 import pytest
-from datetime import datetime, timezone, timedelta
+from collections import Counter, defaultdict
+from datetime import date, datetime, timezone, timedelta
 from fastapi.testclient import TestClient
 from types import SimpleNamespace
 from bson import ObjectId
 from fastapi import FastAPI
 from pymongo.errors import DuplicateKeyError
 from backend.db.mongo.mongoDB import surveys_collection
+from backend.models.db.sql.auth import SurveyResponseAnswer
+from backend.services.surveys.response_answers import answer_rows
 
 app = FastAPI()
 app.include_router(router)
@@ -92,7 +96,8 @@ def set_db_override(session):
     async def fake_get_db():
         yield session
 
-    app.dependency_overrides[get_async_db] = fake_get_db
+    for dependency in (get_async_db, get_ingest_db, get_read_db, get_analytics_db):
+        app.dependency_overrides[dependency] = fake_get_db
 
 
 @pytest.mark.asyncio
@@ -762,6 +767,33 @@ async def test_get_public_survey_only_for_published(monkeypatch):
     assert denied_resp.status_code == 404
 
 
+@pytest.mark.asyncio
+async def test_surveys_stored_with_legacy_props_shape_are_still_readable(monkeypatch):
+    """Older writes stored malformed DropDown/RadioBar props in the ToggleSwitch shape."""
+    object_id = ObjectId()
+    legacy_props = {"activeLabel": None, "inactiveLabel": None, "checked": None}
+    stored_doc = {
+        "_id": object_id,
+        "title": "Legacy Survey",
+        "status": "published",
+        "created_by_id": str(fake_user.id),
+        "questions": [
+            {"id": "q1", "questionText": "Pick", "component": "DropDown", "option": {"optionProps": legacy_props}},
+            {"id": "q2", "questionText": "Choose", "component": "RadioBar", "option": {"optionProps": legacy_props}},
+        ],
+    }
+
+    async def fake_find_one(query):
+        return stored_doc if query.get("_id") == object_id else None
+
+    monkeypatch.setattr(surveys_collection, "find_one", fake_find_one)
+
+    for path in (f"/surveys/{object_id}", f"/surveys/public/{object_id}"):
+        resp = client.get(path)
+        assert resp.status_code == 200
+        assert [q["option"]["optionProps"] for q in resp.json()["questions"]] == [legacy_props, legacy_props]
+
+
 @pytest.mark.asyncio
 async def test_submit_response_published_survey(monkeypatch):
     object_id = ObjectId()
@@ -770,7 +802,14 @@ async def test_submit_response_published_survey(monkeypatch):
         "title": "Published Survey",
         "status": "published",
         "created_by_id": str(fake_user.id),
-        "questions": [],
+        "questions": [
+            {
+                "id": "q1",
+                "questionText": "Pick one",
+                "component": "RadioBar",
+                "option": {"optionProps": {"buttons": [{"label": "A", "value": "A"}, {"label": "B", "value": "B"}]}},
+            }
+        ],
     }
 
     async def fake_find_one(query):
@@ -797,6 +836,48 @@ async def test_submit_response_published_survey(monkeypatch):
     assert "id" in resp.json()
     assert len(fake_session.added) == 1
     assert fake_session.added[0].survey_id == str(object_id)
+    assert [(row.question_id, row.value_key) for row in fake_session.added[0].answer_keys] == [("q1", "A")]
+
+
+@pytest.mark.asyncio
+async def test_submit_response_rejects_answers_outside_survey(monkeypatch):
+    object_id = ObjectId()
+    fake_doc = {
+        "_id": object_id,
+        "title": "Published Survey",
+        "status": "published",
+        "created_by_id": str(fake_user.id),
+        "revision": 1,
+        "questions": [
+            {
+                "id": "q1",
+                "questionText": "Pick one",
+                "component": "RadioBar",
+                "option": {"optionProps": {"buttons": [{"label": "A", "value": "A"}]}},
+            }
+        ],
+    }
+
+    async def fake_find_one(query):
+        return fake_doc
+
+    monkeypatch.setattr(surveys_collection, "find_one", fake_find_one)
+    fake_session = FakeAsyncDbSession()
+    set_db_override(fake_session)
+
+    payload = {
+        "surveyId": str(object_id),
+        "answers": [
+            {"questionId": "q1", "value": "Z"},
+            {"questionId": "missing", "value": "A"},
+        ],
+    }
+
+    resp = client.post(f"/surveys/{str(object_id)}/responses", json=payload)
+    assert resp.status_code == 422
+    locations = [error["loc"] for error in resp.json()["detail"]]
+    assert locations == [["body", "answers", 0, "value"], ["body", "answers", 1, "questionId"]]
+    assert fake_session.added == []
 
 
 @pytest.mark.asyncio
@@ -1080,8 +1161,9 @@ async def test_get_survey_stats(monkeypatch):
         "created_by_id": str(fake_user.id),
         "created_at": datetime(2024, 1, 15, tzinfo=timezone.utc),
         "questions": [
-            {"id": "q1", "questionText": "What is your favorite color?"},
-            {"id": "q2", "questionText": "Do you like surveys?"},
+            {"id": "q1", "questionText": "What is your favorite color?", "component": "RadioBar"},
+            {"id": "q2", "questionText": "Do you like surveys?", "component": "Switch"},
+            {"id": "q3", "questionText": "Anything else?", "component": "TextInput"},
         ],
     }
 
@@ -1115,7 +1197,21 @@ async def test_get_survey_stats(monkeypatch):
                     return self
                 def all(self):
                     return self._items
-            return AllResult(self.responses)
+            if query.column_descriptions[0]["entity"] is SurveyResponseAnswer:
+                # Grouped (question_id, value_key, count) rows, as the answers table yields them
+                counts = Counter(
+                    (row.question_id, row.value_key)
+                    for response in self.responses
+                    for row in answer_rows(survey_id, response.answers)
+                )
+                return AllResult([(*key, count) for key, count in counts.items()])
+            # Per-day (date, responses, answered questions) rows
+            trend = defaultdict(lambda: [0, 0])
+            for response in self.responses:
+                day = trend[response.submitted_at.date()]
+                day[0] += 1
+                day[1] += len(response.answers)
+            return AllResult([(day, *totals) for day, totals in sorted(trend.items())])
 
     responses = [
         SimpleNamespace(
@@ -1125,6 +1221,7 @@ async def test_get_survey_stats(monkeypatch):
             answers=[
                 {"questionId": "q1", "value": "Blue"},
                 {"questionId": "q2", "value": True},
+                {"questionId": "q3", "value": "true"},
             ],
             submitted_at=datetime(2024, 1, 20, tzinfo=timezone.utc),
         ),
@@ -1161,6 +1258,8 @@ async def test_get_survey_stats(monkeypatch):
     assert data["title"] == "Stats Survey"
     assert data["responsesCount"] == 3
     assert data["createdDate"] == "2024-01-15"
+    # 3 + 2 + 1 answers over 3 responses x 3 questions
+    assert data["completionRate"] == 66.7
     
     # Check trend data
     assert len(data["trend"]) == 2  # Two different dates
@@ -1168,10 +1267,15 @@ async def test_get_survey_stats(monkeypatch):
     assert any(t["date"] == "2024-01-21" and t["responses"] == 2 for t in data["trend"])
     
     # Check question breakdown
-    assert len(data["questionBreakdown"]) == 2
+    assert len(data["questionBreakdown"]) == 3
     q1_breakdown = next(q for q in data["questionBreakdown"] if q["questionId"] == "q1")
     assert any(c["option"] == "Blue" and c["count"] == 2 for c in q1_breakdown["counts"])
     assert any(c["option"] == "Red" and c["count"] == 1 for c in q1_breakdown["counts"])
+    q2_breakdown = next(q for q in data["questionBreakdown"] if q["questionId"] == "q2")
+    assert q2_breakdown["counts"] == [{"option": "No", "count": 1}, {"option": "Yes", "count": 1}]
+    # Only Switch answers are relabelled; free text "true" stays as typed
+    q3_breakdown = next(q for q in data["questionBreakdown"] if q["questionId"] == "q3")
+    assert q3_breakdown["counts"] == [{"option": "true", "count": 1}]
 
 
 @pytest.mark.asyncio
@@ -1226,7 +1330,9 @@ async def test_get_survey_stats_date_filter(monkeypatch):
                     return self
                 def all(self):
                     return self._items
-            return AllResult(filtered)
+            if query.column_descriptions[0]["entity"] is SurveyResponseAnswer:
+                return AllResult([("q1", "Filtered", 1)])
+            return AllResult([(date(2024, 1, 21), len(filtered), 1)])
 
     session = FilteredDbSession()
     set_db_override(session)
@@ -1268,3 +1374,93 @@ async def test_stats_access_control(monkeypatch):
     # fake_user tries to access different_user's stats
     resp = client.get(f"/surveys/{survey_id}/responses/stats")
     assert resp.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_list_responses_runs_mongo_and_sql_concurrently(monkeypatch):
+    object_id = ObjectId()
+    events = []
+
+    async def slow_find_one(query):
+        events.append("mongo:start")
+        await asyncio.sleep(0.01)
+        events.append("mongo:end")
+        return {"_id": object_id, "created_by_id": str(fake_user.id), "questions": []}
+
+    class TrackingSession(FakeAsyncDbSession):
+        async def execute(self, query):
+            events.append("sql:" + ("count" if "count" in str(query).lower() else "page"))
+            await asyncio.sleep(0.01)
+            return FakeExecuteResult([])
+
+    monkeypatch.setattr(surveys_collection, "find_one", slow_find_one)
+    set_db_override(TrackingSession())
+
+    resp = client.get(f"/surveys/{object_id}/responses")
+
+    assert resp.status_code == 200
+    assert resp.json()["total_count"] == 0
+    # SQL started before Mongo finished, and an empty first page needs no COUNT
+    assert events.index("sql:page") < events.index("mongo:end")
+    assert "sql:count" not in events
+
+
+@pytest.mark.asyncio
+async def test_get_survey_stats_hides_rows_when_not_owner(monkeypatch):
+    object_id = ObjectId()
+
+    async def fake_find_one(query):
+        return None
+
+    monkeypatch.setattr(surveys_collection, "find_one", fake_find_one)
+    set_db_override(FakeAsyncDbSession([SimpleNamespace(answers=[], submitted_at=datetime.now(timezone.utc))]))
+
+    resp = client.get(f"/surveys/{object_id}/responses/stats")
+
+    assert resp.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_list_responses_filters_by_answer_containment(monkeypatch):
+    from sqlalchemy.dialects import postgresql
+
+    object_id = ObjectId()
+
+    async def fake_find_one(query):
+        return {"_id": object_id, "created_by_id": str(fake_user.id)}
+
+    class RecordingSession(FakeAsyncDbSession):
+        def __init__(self):
+            super().__init__([])
+            self.queries = []
+
+        async def execute(self, query):
+            self.queries.append(query.compile(dialect=postgresql.dialect()))
+            return await super().execute(query)
+
+    monkeypatch.setattr(surveys_collection, "find_one", fake_find_one)
+    session = RecordingSession()
+    set_db_override(session)
+
+    resp = client.get(
+        f"/surveys/{object_id}/responses",
+        params=[("answer", "q3:Option A"), ("answer_contains", "q4:x"), ("answer", "q5:true")],
+    )
+
+    assert resp.status_code == 200
+    assert resp.json()["total_count"] == 0
+    [page_query] = session.queries
+    assert str(page_query).count("survey_responses.answers @>") == 3
+    bound = list(page_query.params.values())
+    assert [{"questionId": "q3", "value": "Option A"}, {"questionId": "q4", "value": ["x"]}] in bound
+    assert [{"questionId": "q5", "value": True}] in bound
+    assert [{"questionId": "q5", "value": "true"}] in bound
+
+
+def test_list_responses_rejects_malformed_answer_filter():
+    set_db_override(FakeAsyncDbSession([]))
+
+    resp = client.get(f"/surveys/{ObjectId()}/responses", params={"answer_contains": "no-separator"})
+
+    assert resp.status_code == 400
+    assert "questionId:value" in resp.json()["detail"]
@@ -0,0 +1,109 @@
+from bson import ObjectId
+
+from backend.models.api.surveys import SurveyAnswer
+from backend.services.surveys.answer_validation import (
+    ValidatorCache,
+    compile_survey_validator,
+)
+
+
+def _survey(revision=1, radio_values=("A", "B")):
+    return {
+        "_id": ObjectId(),
+        "revision": revision,
+        "questions": [
+            {"id": "text", "component": "TextInput", "option": {"optionProps": {"label": "Name"}}},
+            {"id": "switch", "component": "Switch", "option": {"optionProps": {"label": "Agree"}}},
+            {
+                "id": "radio",
+                "component": "RadioBar",
+                "option": {"optionProps": {"buttons": [{"label": v, "value": v} for v in radio_values]}},
+            },
+            {
+                "id": "tiles",
+                "component": "CheckboxTiles",
+                "option": {"optionProps": {"buttons": [{"label": "X", "value": "x"}, {"label": "Y", "value": "y"}]}},
+            },
+            {
+                "id": "drop",
+                "component": "DropDown",
+                "option": {"optionProps": {"options": [{"label": "One", "value": "1"}]}},
+            },
+        ],
+    }
+
+
+def _answers(**values):
+    return [SurveyAnswer(questionId=key, value=value) for key, value in values.items()]
+
+
+def test_valid_answers_produce_no_errors() -> None:
+    validator = compile_survey_validator(_survey())
+
+    errors = validator.validate(
+        _answers(text="Ann", switch=True, radio="B", tiles=["x", "y"], drop="1")
+    )
+
+    assert errors == []
+
+
+def test_unanswered_questions_are_accepted() -> None:
+    validator = compile_survey_validator(_survey())
+
+    assert validator.validate(_answers(text="", switch="", radio="", tiles="", drop="")) == []
+
+
+def test_invalid_values_are_reported_per_answer() -> None:
+    validator = compile_survey_validator(_survey())
+
+    errors = validator.validate(
+        _answers(text=["a"], switch="yes", radio="C", tiles=["x", "z"], drop="2")
+    )
+
+    assert [error["loc"] for error in errors] == [
+        ("body", "answers", index, "value") for index in range(5)
+    ]
+
+
+def test_unknown_and_duplicate_questions_are_rejected() -> None:
+    validator = compile_survey_validator(_survey())
+
+    errors = validator.validate(
+        [
+            SurveyAnswer(questionId="radio", value="A"),
+            SurveyAnswer(questionId="radio", value="B"),
+            SurveyAnswer(questionId="nope", value="A"),
+        ]
+    )
+
+    assert [error["loc"] for error in errors] == [
+        ("body", "answers", 1, "questionId"),
+        ("body", "answers", 2, "questionId"),
+    ]
+
+
+def test_cache_reuses_validator_until_revision_changes() -> None:
+    cache = ValidatorCache(max_entries=8)
+    survey = _survey(revision=1)
+
+    first = cache.get(survey)
+    assert cache.get(survey) is first
+
+    updated = {**_survey(revision=2, radio_values=("C",)), "_id": survey["_id"]}
+    second = cache.get(updated)
+    assert second is not first
+    assert second.validate(_answers(radio="C")) == []
+
+
+def test_cache_evicts_least_recently_used_survey() -> None:
+    cache = ValidatorCache(max_entries=2)
+    first, second, third = _survey(), _survey(), _survey()
+
+    kept = cache.get(first)
+    cache.get(second)
+    cache.get(first)
+    cache.get(third)
+
+    assert cache.get(first) is kept
+    assert len(cache._entries) == 2
+    assert str(second["_id"]) not in cache._entries
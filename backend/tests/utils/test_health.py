@@ -0,0 +1,185 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.db import health
+from backend.db.health import CachedCheck
+from backend.routers import health as health_router
+
+
+def _app():
+    app = FastAPI()
+    app.include_router(health_router.router)
+    return app
+
+
+def _check(result):
+    async def check():
+        return result
+
+    return check
+
+
+@pytest.fixture
+def dependencies_up(monkeypatch):
+    checks = {"schema": _check(True), "sql": _check(True), "mongo": _check(True)}
+    monkeypatch.setattr(health, "readiness_checks", checks)
+    return checks
+
+
+def test_healthz_is_always_ok():
+    resp = TestClient(_app()).get("/healthz")
+
+    assert resp.status_code == 200
+    assert resp.json() == {"status": "ok"}
+
+
+def test_readyz_reports_ready_when_schema_current_and_dependencies_up(dependencies_up):
+    resp = TestClient(_app()).get("/readyz")
+
+    assert resp.status_code == 200
+    assert resp.json() == {
+        "status": "ready",
+        "checks": {"schema": True, "sql": True, "mongo": True},
+    }
+
+
+def test_readyz_is_unavailable_until_schema_is_current(dependencies_up):
+    dependencies_up["schema"] = _check(False)
+
+    resp = TestClient(_app()).get("/readyz")
+
+    assert resp.status_code == 503
+    assert resp.json()["status"] == "not_ready"
+
+
+def test_readyz_is_unavailable_when_a_dependency_is_down(dependencies_up):
+    dependencies_up["mongo"] = _check(False)
+
+    resp = TestClient(_app()).get("/readyz")
+
+    assert resp.status_code == 503
+    assert resp.json()["checks"] == {"schema": True, "sql": True, "mongo": False}
+
+
+@pytest.mark.asyncio
+async def test_schema_check_turns_ready_once_migrate_has_run(monkeypatch):
+    status = {"sql": False, "mongo": True}
+
+    async def fake_check_schema():
+        return dict(status)
+
+    monkeypatch.setattr(health, "check_schema", fake_check_schema)
+    cached = CachedCheck("schema", health.schema_current, ttl=0, timeout=1)
+
+    assert await cached() is False
+    status["sql"] = True
+    assert await cached() is True
+
+
+@pytest.mark.asyncio
+async def test_cached_check_runs_once_per_ttl_for_concurrent_callers():
+    calls = []
+
+    async def check():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return True
+
+    cached = CachedCheck("sql", check, ttl=60, timeout=1)
+
+    assert await asyncio.gather(cached(), cached(), cached()) == [True, True, True]
+    assert await cached() is True
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_cached_check_reports_errors_and_timeouts_as_unavailable():
+    async def broken():
+        raise ConnectionError("refused")
+
+    async def hanging():
+        await asyncio.sleep(1)
+
+    assert await CachedCheck("sql", broken, ttl=0, timeout=1)() is False
+    assert await CachedCheck("mongo", hanging, ttl=0, timeout=0.01)() is False
+
+
+@pytest.mark.asyncio
+async def test_warm_sql_pool_opens_connections_concurrently(monkeypatch):
+    opened, closed = [], []
+
+    class FakeConnection:
+        async def execute(self, statement):
+            pass
+
+        async def close(self):
+            closed.append(self)
+
+    class FakeEngine:
+        class pool:
+            @staticmethod
+            def size():
+                return 3
+
+        async def connect(self):
+            conn = FakeConnection()
+            opened.append(conn)
+            return conn
+
+    monkeypatch.setattr(health, "get_async_engine", lambda workload: FakeEngine())
+
+    assert await health.warm_sql_pool(size=5) == 3
+    assert len(opened) == 3
+    assert closed == opened
+
+
+def _warmup_engine(monkeypatch, connect_behaviours, execute_delay=0):
+    opened, closed = [], []
+
+    class FakeConnection:
+        async def execute(self, statement):
+            await asyncio.sleep(execute_delay)
+
+        async def close(self):
+            closed.append(self)
+
+    class FakeEngine:
+        class pool:
+            @staticmethod
+            def size():
+                return len(connect_behaviours)
+
+        async def connect(self):
+            if connect_behaviours.pop(0) == "fail":
+                raise ConnectionRefusedError("connection refused")
+            conn = FakeConnection()
+            opened.append(conn)
+            return conn
+
+    monkeypatch.setattr(health, "get_async_engine", lambda workload: FakeEngine())
+    return opened, closed
+
+
+@pytest.mark.asyncio
+async def test_warm_sql_pool_closes_opened_connections_when_one_connect_fails(monkeypatch):
+    opened, closed = _warmup_engine(monkeypatch, ["ok", "fail", "ok"])
+
+    with pytest.raises(ConnectionRefusedError):
+        await health.warm_sql_pool(size=3)
+
+    assert len(opened) == 2
+    assert closed == opened
+
+
+@pytest.mark.asyncio
+async def test_warm_sql_pool_closes_opened_connections_when_cancelled(monkeypatch):
+    opened, closed = _warmup_engine(monkeypatch, ["ok", "ok"], execute_delay=1)
+
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(health.warm_sql_pool(size=2), timeout=0.05)
+
+    assert len(opened) == 2
+    assert closed == opened
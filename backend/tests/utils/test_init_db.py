@@ -0,0 +1,107 @@
+import pytest
+
+from backend.db.sql import init_db
+
+
+class FakeResult:
+    def __init__(self, value):
+        self.value = value
+
+    def scalar_one_or_none(self):
+        return self.value
+
+
+class FakeConnection:
+    def __init__(self, indisvalid, fail_on=None):
+        self.indisvalid = indisvalid
+        self.fail_on = fail_on
+        self.isolation_level = None
+        self.statements = []
+
+    async def execution_options(self, isolation_level):
+        self.isolation_level = isolation_level
+        return self
+
+    async def execute(self, statement, params=None):
+        sql = str(statement)
+        self.statements.append(sql)
+        if self.fail_on and sql.startswith(self.fail_on):
+            raise RuntimeError("canceling statement")
+        return FakeResult(self.indisvalid if "pg_index" in sql else None)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+def _use_connection(monkeypatch, conn):
+    class FakeEngine:
+        def connect(self):
+            return conn
+
+    monkeypatch.setattr(init_db, "get_maintenance_engine", lambda: FakeEngine())
+
+
+@pytest.mark.asyncio
+async def test_builds_missing_index_concurrently_without_timeout(monkeypatch):
+    conn = FakeConnection(indisvalid=None)
+    _use_connection(monkeypatch, conn)
+
+    await init_db.ensure_answers_gin_index()
+
+    assert conn.isolation_level == "AUTOCOMMIT"
+    assert conn.statements[0] == "SET statement_timeout = 0"
+    assert conn.statements[-1].startswith(
+        f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {init_db.ANSWERS_GIN_INDEX}"
+    )
+    assert not any(sql.startswith("DROP") for sql in conn.statements)
+
+
+@pytest.mark.asyncio
+async def test_drops_invalid_leftover_before_rebuilding(monkeypatch):
+    conn = FakeConnection(indisvalid=False)
+    _use_connection(monkeypatch, conn)
+
+    await init_db.ensure_answers_gin_index()
+
+    assert conn.statements[-2] == f"DROP INDEX CONCURRENTLY IF EXISTS {init_db.ANSWERS_GIN_INDEX}"
+    assert conn.statements[-1].startswith("CREATE INDEX CONCURRENTLY")
+
+
+@pytest.mark.asyncio
+async def test_valid_index_is_left_alone(monkeypatch):
+    conn = FakeConnection(indisvalid=True)
+    _use_connection(monkeypatch, conn)
+
+    await init_db.ensure_answers_gin_index()
+
+    assert not any(sql.startswith(("CREATE", "DROP")) for sql in conn.statements)
+
+
+@pytest.mark.asyncio
+async def test_build_failure_propagates(monkeypatch):
+    _use_connection(monkeypatch, FakeConnection(indisvalid=None, fail_on="CREATE INDEX"))
+
+    with pytest.raises(RuntimeError):
+        await init_db.ensure_answers_gin_index()
+
+
+@pytest.mark.asyncio
+async def test_init_database_creates_tables_on_the_maintenance_engine(monkeypatch):
+    created = []
+
+    class FakeBeginConnection(FakeConnection):
+        async def run_sync(self, fn):
+            created.append(fn)
+
+    class FakeEngine:
+        def begin(self):
+            return FakeBeginConnection(indisvalid=None)
+
+    monkeypatch.setattr(init_db, "get_maintenance_engine", lambda: FakeEngine())
+
+    await init_db.init_database(max_retries=1)
+
+    assert created == [init_db.Base.metadata.create_all]
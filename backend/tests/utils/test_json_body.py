@@ -0,0 +1,55 @@
+import pytest
+from fastapi.exceptions import RequestValidationError
+
+from backend.middleware.json_body import JsonBody
+from backend.models.api.surveys import SurveyCreate, SurveyResponseCreate
+
+survey_body = JsonBody(SurveyCreate)
+
+
+def test_validates_raw_bytes_into_model() -> None:
+    survey = survey_body.validate(b'{"title": " Survey ", "questions": []}')
+
+    assert isinstance(survey, SurveyCreate)
+    assert survey.title == "Survey"
+
+
+def test_field_errors_are_prefixed_with_body() -> None:
+    with pytest.raises(RequestValidationError) as exc_info:
+        JsonBody(SurveyResponseCreate).validate(b'{"answers": [{"questionId": "q1"}]}')
+
+    [error] = exc_info.value.errors()
+    assert error["type"] == "missing"
+    assert error["loc"] == ("body", "answers", 0, "value")
+    assert "url" not in error
+
+
+def test_invalid_json_matches_fastapi_decode_error() -> None:
+    with pytest.raises(RequestValidationError) as exc_info:
+        survey_body.validate(b'{"title": 1')
+
+    assert exc_info.value.errors() == [
+        {
+            "type": "json_invalid",
+            "loc": ("body", 11),
+            "msg": "JSON decode error",
+            "input": {},
+            "ctx": {"error": "Expecting ',' delimiter"},
+        }
+    ]
+
+
+def test_empty_body_is_reported_missing() -> None:
+    with pytest.raises(RequestValidationError) as exc_info:
+        survey_body.validate(b"")
+
+    assert exc_info.value.errors()[0]["loc"] == ("body",)
+    assert exc_info.value.errors()[0]["type"] == "missing"
+
+
+def test_openapi_request_body_is_self_contained() -> None:
+    schema = survey_body.openapi_extra["requestBody"]["content"]["application/json"]["schema"]
+
+    assert "$defs" not in schema
+    assert "$ref" not in str(schema)
+    assert set(schema["properties"]) >= {"title", "questions"}
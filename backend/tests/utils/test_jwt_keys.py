@@ -0,0 +1,95 @@
+import uuid
+
+import pytest
+from ecdsa import NIST256p, SigningKey
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from jose import jwk, jwt
+from jose.exceptions import JWTError
+
+from backend.config import settings
+from backend.routers.auth import auth as auth_mod
+from backend.routers.auth.jwt_keys import JwtKeyRing, set_key_ring
+from backend.routers.auth.security_utl import clear_decode_cache, decode, make_access_token
+
+
+def _private_pem() -> str:
+    return SigningKey.generate(curve=NIST256p).to_pem().decode()
+
+
+@pytest.fixture
+def es256(monkeypatch):
+    monkeypatch.setattr(settings, "JWT_ALG", "ES256")
+    clear_decode_cache()
+    yield
+    set_key_ring(None)
+    clear_decode_cache()
+
+
+def test_tokens_carry_kid_and_verify(es256):
+    set_key_ring(JwtKeyRing({"k1": _private_pem()}, "k1", "ES256"))
+
+    token = make_access_token(uuid.uuid4(), "user", 0)
+
+    assert jwt.get_unverified_header(token)["kid"] == "k1"
+    assert decode(token)["role"] == "user"
+
+
+def test_old_key_keeps_validating_after_rotation(es256):
+    old_pem, new_pem = _private_pem(), _private_pem()
+    set_key_ring(JwtKeyRing({"old": old_pem}, "old", "ES256"))
+    old_token = make_access_token(uuid.uuid4(), "user", 0)
+
+    # Rotate: new key signs, old key is kept public-only for verification
+    old_public = jwk.construct(old_pem, "ES256").public_key().to_pem().decode()
+    set_key_ring(JwtKeyRing({"new": new_pem, "old": old_public}, "new", "ES256"))
+    clear_decode_cache()
+    new_token = make_access_token(uuid.uuid4(), "user", 0)
+
+    assert jwt.get_unverified_header(new_token)["kid"] == "new"
+    assert decode(old_token)["role"] == "user"
+    assert decode(new_token)["role"] == "user"
+
+
+def test_unknown_kid_is_rejected(es256):
+    set_key_ring(JwtKeyRing({"k1": _private_pem()}, "k1", "ES256"))
+    token = make_access_token(uuid.uuid4(), "user", 0)
+
+    set_key_ring(JwtKeyRing({"k2": _private_pem()}, "k2", "ES256"))
+    clear_decode_cache()
+
+    with pytest.raises(JWTError):
+        decode(token)
+
+
+def test_active_key_must_be_private():
+    public_pem = jwk.construct(_private_pem(), "ES256").public_key().to_pem().decode()
+
+    with pytest.raises(ValueError):
+        JwtKeyRing({"k1": public_pem}, "k1", "ES256")
+    with pytest.raises(ValueError):
+        JwtKeyRing({"k1": _private_pem()}, "missing", "ES256")
+
+
+def test_jwks_endpoint_publishes_public_keys_only(es256):
+    set_key_ring(JwtKeyRing({"k1": _private_pem(), "k2": _private_pem()}, "k1", "ES256"))
+    app = FastAPI()
+    app.include_router(auth_mod.jwks_router)
+
+    resp = TestClient(app).get("/.well-known/jwks.json")
+
+    assert resp.status_code == 200
+    assert "max-age" in resp.headers["Cache-Control"]
+    keys = resp.json()["keys"]
+    assert {key["kid"] for key in keys} == {"k1", "k2"}
+    assert all(key["kty"] == "EC" and "d" not in key for key in keys)
+
+
+def test_jwks_endpoint_is_empty_for_hmac(monkeypatch):
+    monkeypatch.setattr(settings, "JWT_ALG", "HS256")
+    app = FastAPI()
+    app.include_router(auth_mod.jwks_router)
+
+    resp = TestClient(app).get("/.well-known/jwks.json")
+
+    assert resp.json() == {"keys": []}
@@ -0,0 +1,95 @@
+import subprocess
+import sys
+
+from backend.db.mongo import mongoDB
+from backend.db.mongo.mongoDB import LazyCollection
+from backend.db.sql import sql_driver
+
+
+def test_importing_app_builds_no_engine_or_client():
+    code = (
+        "import sys, backend.main\n"
+        "from backend.db.sql import sql_driver\n"
+        "from backend.db.mongo import mongoDB\n"
+        "assert sql_driver.get_async_engine.cache_info().currsize == 0\n"
+        "assert sql_driver.get_sync_engine.cache_info().currsize == 0\n"
+        "assert mongoDB.get_client.cache_info().currsize == 0\n"
+        "assert 'psycopg2' not in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_async_engine_is_shared():
+    assert sql_driver.get_async_engine() is sql_driver.get_async_engine()
+    assert sql_driver.async_engine is sql_driver.get_async_engine()
+
+
+def test_lazy_collection_resolves_on_first_use(monkeypatch):
+    resolved = []
+
+    class FakeDatabase(dict):
+        def __missing__(self, name):
+            resolved.append(name)
+            return type("FakeCollection", (), {"name": name})()
+
+    monkeypatch.setattr(mongoDB, "get_database", FakeDatabase)
+    collection = LazyCollection("answers")
+
+    assert resolved == []
+    assert collection.name == "answers"
+    assert collection.name == "answers"
+    assert resolved == ["answers"]
+
+
+def test_each_workload_gets_its_own_pool_and_statement_timeout():
+    engines = {name: sql_driver.get_async_engine(name) for name in ("interactive", "ingest", "analytics")}
+
+    assert len({id(engine) for engine in engines.values()}) == 3
+    for name, engine in engines.items():
+        config = sql_driver.workload_pools()[name]
+        assert engine.pool.size() == config.size
+        assert engine.pool.metrics_name == name
+
+
+def test_workload_engine_sets_statement_timeout(monkeypatch):
+    captured = {}
+    real_create_async_engine = sql_driver.create_async_engine
+
+    def capture(url, **kwargs):
+        captured.update(kwargs)
+        return real_create_async_engine(url, **kwargs)
+
+    monkeypatch.setattr(sql_driver, "create_async_engine", capture)
+    sql_driver.get_async_engine.__wrapped__("analytics")
+
+    expected = str(sql_driver.workload_pools()["analytics"].statement_timeout_ms)
+    assert captured["connect_args"] == {"server_settings": {"statement_timeout": expected}}
+
+
+def test_reads_share_interactive_engine_without_replica(monkeypatch):
+    monkeypatch.setattr(sql_driver.settings, "DATABASE_READ_URL", "")
+
+    assert "read" not in sql_driver.workload_pools()
+    assert sql_driver.get_async_engine("read") is sql_driver.get_async_engine("interactive")
+
+
+def test_primary_pools_fit_connection_budget(monkeypatch):
+    monkeypatch.setattr(sql_driver.settings, "DATABASE_READ_URL", "")
+    monkeypatch.setattr(sql_driver.settings, "SQL_CONNECTION_BUDGET", 80)
+    monkeypatch.setattr(sql_driver.settings, "WEB_CONCURRENCY", 8)
+
+    pools = sql_driver.workload_pools()
+
+    assert set(pools) == {"interactive", "ingest", "analytics"}
+    assert sum(pool.size + pool.max_overflow for pool in pools.values()) <= 10
+    assert all(pool.size >= 1 for pool in pools.values())
+
+
+def test_replica_pools_are_outside_the_primary_budget(monkeypatch):
+    monkeypatch.setattr(sql_driver.settings, "DATABASE_READ_URL", "postgresql://replica/db")
+    monkeypatch.setattr(sql_driver.settings, "SQL_CONNECTION_BUDGET", 1000)
+
+    pools = sql_driver.workload_pools()
+
+    assert pools["read"].replica and pools["analytics"].replica
+    assert pools["interactive"].size == sql_driver.settings.SQL_POOL_INTERACTIVE_SIZE
@@ -0,0 +1,118 @@
+import pytest
+
+from backend import manage
+from backend.db import schema
+
+
+@pytest.mark.asyncio
+async def test_check_schema_queries_both_stores(monkeypatch):
+    async def current():
+        return True
+
+    async def behind():
+        return False
+
+    monkeypatch.setattr(schema.sql_migrations, "schema_is_current", current)
+    monkeypatch.setattr(schema.mongo_migrations, "schema_is_current", behind)
+
+    assert await schema.check_schema() == {"sql": True, "mongo": False}
+
+
+def test_manage_migrate_runs_migrations_then_verifies(monkeypatch):
+    calls = []
+
+    async def fake_migrate():
+        calls.append("migrate")
+
+    async def fake_check():
+        calls.append("check")
+        return {"sql": True, "mongo": True}
+
+    monkeypatch.setattr(manage, "migrate", fake_migrate)
+    monkeypatch.setattr(manage, "check_schema", fake_check)
+
+    assert manage.main(["migrate"]) == 0
+    assert calls == ["migrate", "check"]
+
+
+def test_manage_check_fails_when_schema_is_behind(monkeypatch):
+    async def fake_check():
+        return {"sql": False, "mongo": True}
+
+    monkeypatch.setattr(manage, "check_schema", fake_check)
+
+    assert manage.main(["check"]) == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_token_version_column_migration_is_not_recorded(monkeypatch):
+    migrations = schema.sql_migrations
+    recorded = []
+
+    class FailingSession:
+        async def execute(self, *args, **kwargs):
+            raise RuntimeError("permission denied for table refresh_tokens")
+
+        async def rollback(self):
+            recorded.append("rollback")
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+    async def record():
+        recorded.append("recorded")
+
+    monkeypatch.setattr(migrations, "MaintenanceSessionLocal", FailingSession)
+    monkeypatch.setattr(migrations, "_record_schema_version", record)
+
+    with pytest.raises(RuntimeError):
+        await migrations.run_migrations()
+
+    assert recorded == ["rollback"]
+
+
+@pytest.mark.asyncio
+async def test_sql_migrations_run_on_the_maintenance_engine(monkeypatch):
+    migrations = schema.sql_migrations
+    statements = []
+
+    class Result:
+        def scalar_one_or_none(self):
+            return None
+
+    class MaintenanceSession:
+        async def execute(self, statement, *args, **kwargs):
+            statements.append(str(statement))
+            return Result()
+
+        async def commit(self):
+            pass
+
+        async def rollback(self):
+            pass
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+    def interactive_session():
+        raise AssertionError("migrations must not use the interactive pool")
+
+    async def backfill():
+        return 0
+
+    monkeypatch.setattr(migrations, "MaintenanceSessionLocal", MaintenanceSession)
+    monkeypatch.setattr(migrations, "AsyncSessionLocal", interactive_session)
+    monkeypatch.setattr(migrations, "backfill_response_answers", backfill)
+
+    await migrations.run_migrations()
+
+    assert any(sql.startswith("ALTER TABLE refresh_tokens") for sql in statements)
+    # Only the column in our own schema counts, not a refresh_tokens table elsewhere
+    assert any("information_schema.columns" in sql and "table_schema = current_schema()" in sql for sql in statements)
+    assert any("INSERT INTO schema_version" in sql for sql in statements)
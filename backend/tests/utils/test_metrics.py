@@ -0,0 +1,111 @@
+import os
+import subprocess
+import sys
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from backend.config import settings
+from backend.middleware import metrics
+from backend.middleware.metrics import REGISTRY, MeteredAsyncAdaptedQueuePool, PrometheusMiddleware
+
+
+def _sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def _app():
+    app = FastAPI()
+    app.add_middleware(PrometheusMiddleware)
+
+    @app.get("/things/{thing_id}")
+    async def thing(thing_id: str):
+        if thing_id == "broken":
+            raise HTTPException(status_code=503, detail="down")
+        return {"id": thing_id}
+
+    return app
+
+
+def test_middleware_records_per_route_metrics(monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "")
+    client = TestClient(_app())
+    route = "/things/{thing_id}"
+    before_ok = _sample("http_requests_total", method="GET", route=route, status="200")
+    before_errors = _sample("http_request_errors_total", method="GET", route=route)
+    before_observed = _sample("http_request_duration_seconds_count", method="GET", route=route)
+
+    client.get("/things/1")
+    client.get("/things/2")
+    client.get("/things/broken")
+
+    assert _sample("http_requests_total", method="GET", route=route, status="200") == before_ok + 2
+    assert _sample("http_request_errors_total", method="GET", route=route) == before_errors + 1
+    assert _sample("http_request_duration_seconds_count", method="GET", route=route) == before_observed + 3
+
+
+def test_metrics_endpoint_requires_the_token(monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "scrape-secret")
+    client = TestClient(_app())
+    client.get("/things/1")
+
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+
+    resp = client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"})
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain")
+    assert 'http_requests_total{method="GET",route="/things/{thing_id}",status="200"}' in resp.text
+    assert "sqlalchemy_pool_checked_out" in resp.text
+
+
+def test_metrics_endpoint_is_not_served_without_a_token(monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "")
+
+    assert TestClient(_app()).get("/metrics").status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_sql_pool_gauges_follow_checkouts():
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=MeteredAsyncAdaptedQueuePool, pool_size=3)
+    metrics.register_sql_pool("test", engine)
+    assert _sample("sqlalchemy_pool_size", pool="test") == 3
+
+    async with engine.connect():
+        assert _sample("sqlalchemy_pool_checked_out", pool="test") == 1
+    assert _sample("sqlalchemy_pool_checked_out", pool="test") == 0
+    assert _sample("sqlalchemy_pool_overflow", pool="test") == 0
+    await engine.dispose()
+
+
+_WORKER = """
+from backend.middleware import metrics
+metrics.http_requests_total.labels(method="GET", route="/x", status="200").inc()
+metrics.background_tasks_pending.labels(task="t").inc()
+"""
+
+_SCRAPE = """
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from backend.config import settings
+from backend.middleware.metrics import PrometheusMiddleware
+settings.METRICS_TOKEN = "t"
+app = FastAPI()
+app.add_middleware(PrometheusMiddleware)
+print(TestClient(app).get("/metrics", headers={"Authorization": "Bearer t"}).text)
+"""
+
+
+def test_multiprocess_mode_serves_every_workers_samples(tmp_path):
+    env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path)}
+    for _ in range(2):
+        subprocess.run([sys.executable, "-c", _WORKER], env=env, check=True)
+
+    scraped = subprocess.run(
+        [sys.executable, "-c", _SCRAPE], env=env, check=True, capture_output=True, text=True
+    ).stdout
+
+    assert 'http_requests_total{method="GET",route="/x",status="200"} 2.0' in scraped
+    assert 'background_tasks_pending{task="t"} 2.0' in scraped
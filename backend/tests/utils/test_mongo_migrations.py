@@ -0,0 +1,249 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from pymongo.errors import DuplicateKeyError
+
+from backend.db.mongo import migrations
+from backend.db.mongo.migrations import Migration
+
+
+class FakeLedger:
+    def __init__(self):
+        self.docs = {}
+        self.finds = 0
+
+    def find(self, query):
+        self.finds += 1
+        ids = query["_id"]["$in"]
+        docs = [self.docs[_id] for _id in ids if _id in self.docs]
+
+        async def gen():
+            for doc in docs:
+                yield doc
+
+        return gen()
+
+    async def insert_one(self, doc):
+        if doc["_id"] in self.docs:
+            raise DuplicateKeyError("duplicate")
+        self.docs[doc["_id"]] = doc
+
+
+class FakeLocks:
+    def __init__(self):
+        self.docs = {}
+
+    async def find_one_and_update(self, query, update, upsert=False):
+        current = self.docs.get(query["_id"])
+        if current is not None and not current["expires_at"] < query["expires_at"]["$lt"]:
+            raise DuplicateKeyError("lock held")
+        self.docs[query["_id"]] = {"_id": query["_id"], **update["$set"]}
+
+    async def update_one(self, query, update):
+        current = self.docs.get(query["_id"])
+        if current is None or current["owner"] != query["owner"]:
+            return SimpleNamespace(matched_count=0)
+        current.update(update["$set"])
+        return SimpleNamespace(matched_count=1)
+
+    async def delete_one(self, query):
+        current = self.docs.get(query["_id"])
+        if current is not None and current["owner"] == query["owner"]:
+            del self.docs[query["_id"]]
+
+
+@pytest.fixture
+def ledger(monkeypatch):
+    fake_ledger, fake_locks = FakeLedger(), FakeLocks()
+    monkeypatch.setattr(migrations, "migrations_collection", fake_ledger)
+    monkeypatch.setattr(migrations, "locks_collection", fake_locks)
+    calls = []
+
+    async def first():
+        calls.append("first")
+
+    async def second():
+        calls.append("second")
+
+    monkeypatch.setattr(
+        migrations,
+        "MIGRATIONS",
+        [Migration("0001_first", first), Migration("0002_second", second)],
+    )
+    return fake_ledger, fake_locks, calls
+
+
+@pytest.mark.asyncio
+async def test_run_migrations_applies_each_migration_once_in_order(ledger):
+    fake_ledger, fake_locks, calls = ledger
+
+    await migrations.run_migrations()
+    await migrations.run_migrations()
+
+    assert calls == ["first", "second"]
+    assert list(fake_ledger.docs) == ["0001_first", "0002_second"]
+    assert fake_ledger.docs["0001_first"]["checksum"] == migrations.MIGRATIONS[0].checksum
+    assert fake_locks.docs == {}
+
+
+@pytest.mark.asyncio
+async def test_run_migrations_resumes_after_partial_run(ledger):
+    fake_ledger, _, calls = ledger
+    fake_ledger.docs["0001_first"] = {"_id": "0001_first", "checksum": migrations.MIGRATIONS[0].checksum}
+
+    await migrations.run_migrations()
+
+    assert calls == ["second"]
+
+
+@pytest.mark.asyncio
+async def test_run_migrations_without_source_files_records_no_checksum(ledger, monkeypatch, caplog):
+    fake_ledger, _, calls = ledger
+    fake_ledger.docs["0001_first"] = {"_id": "0001_first", "checksum": "recorded-with-sources"}
+
+    def no_source(obj):
+        raise OSError("could not get source code")
+
+    monkeypatch.setattr(migrations.inspect, "getsource", no_source)
+
+    await migrations.run_migrations()
+
+    assert calls == ["second"]
+    assert fake_ledger.docs["0002_second"]["checksum"] is None
+    assert "has changed since it ran" not in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_run_migrations_waits_for_lock_held_by_another_runner(ledger):
+    _, fake_locks, calls = ledger
+    await migrations._acquire_lock("other-host:1", ttl_seconds=60)
+
+    with pytest.raises(TimeoutError):
+        await migrations.run_migrations(lock_ttl_seconds=0, poll_interval=0)
+
+    assert calls == []
+    assert fake_locks.docs[migrations.LOCK_ID]["owner"] == "other-host:1"
+
+
+@pytest.mark.asyncio
+async def test_expired_lock_is_taken_over(ledger):
+    _, fake_locks, calls = ledger
+    await migrations._acquire_lock("crashed-host:1", ttl_seconds=-1)
+
+    await migrations.run_migrations()
+
+    assert calls == ["first", "second"]
+
+
+@pytest.mark.asyncio
+async def test_heartbeat_extends_the_lease_while_a_migration_runs(ledger, monkeypatch):
+    _, fake_locks, _ = ledger
+    leases = []
+
+    async def slow():
+        leases.append(fake_locks.docs[migrations.LOCK_ID]["expires_at"])
+        await asyncio.sleep(0.5)
+        leases.append(fake_locks.docs[migrations.LOCK_ID]["expires_at"])
+
+    monkeypatch.setattr(migrations, "MIGRATIONS", [Migration("0001_slow", slow)])
+
+    await migrations.run_migrations(lock_ttl_seconds=1)
+
+    assert leases[1] > leases[0]
+    assert fake_locks.docs == {}
+
+
+@pytest.mark.asyncio
+async def test_lost_lock_is_not_recorded_in_the_ledger(ledger, monkeypatch):
+    fake_ledger, fake_locks, _ = ledger
+
+    async def stolen():
+        fake_locks.docs[migrations.LOCK_ID]["owner"] = "other-host:1"
+
+    monkeypatch.setattr(migrations, "MIGRATIONS", [Migration("0001_stolen", stolen)])
+
+    with pytest.raises(RuntimeError, match="Lost the MongoDB migration lock"):
+        await migrations.run_migrations()
+
+    assert fake_ledger.docs == {}
+    assert fake_locks.docs[migrations.LOCK_ID]["owner"] == "other-host:1"
+
+
+@pytest.mark.asyncio
+async def test_schema_is_current_uses_single_ledger_lookup(ledger):
+    fake_ledger, _, _ = ledger
+
+    assert await migrations.schema_is_current() is False
+    await migrations.run_migrations()
+    fake_ledger.finds = 0
+
+    assert await migrations.schema_is_current() is True
+    assert fake_ledger.finds == 1
+
+
+class FakeSurveys:
+    def __init__(self, docs=(), groups=()):
+        self.docs = list(docs)
+        self.groups = list(groups)
+        self.queries = []
+        self.bulk_writes = []
+
+    def _cursor(self, items):
+        async def gen():
+            for item in items:
+                yield item
+
+        return gen()
+
+    def find(self, query, projection=None, **kwargs):
+        self.queries.append(query)
+        return self._cursor(self.docs)
+
+    def aggregate(self, pipeline, **kwargs):
+        return self._cursor(self.groups)
+
+    async def bulk_write(self, ops, ordered=True):
+        assert ordered is False
+        self.bulk_writes.append(list(ops))
+
+
+@pytest.mark.asyncio
+async def test_cleanup_problematic_titles_streams_one_cursor_in_batches(monkeypatch):
+    surveys = FakeSurveys(docs=[{"_id": i} for i in range(5)])
+    monkeypatch.setattr(migrations, "surveys_collection", surveys)
+    monkeypatch.setattr(migrations, "MONGO_MIGRATION_STRATEGY", "update")
+
+    await migrations._cleanup_problematic_titles(batch_size=2)
+
+    assert surveys.queries == [migrations.PROBLEMATIC_TITLE_FILTER]
+    assert [len(batch) for batch in surveys.bulk_writes] == [2, 2, 1]
+    assert surveys.bulk_writes[0][0]._doc == {"$set": {"title": "Untitled Survey 0"}}
+
+
+@pytest.mark.asyncio
+async def test_cleanup_problematic_titles_skips_in_safe_mode(monkeypatch):
+    surveys = FakeSurveys(docs=[{"_id": 1}])
+    monkeypatch.setattr(migrations, "surveys_collection", surveys)
+    monkeypatch.setattr(migrations, "MONGO_MIGRATION_STRATEGY", "safe")
+
+    await migrations._cleanup_problematic_titles()
+
+    assert surveys.queries == []
+    assert surveys.bulk_writes == []
+
+
+@pytest.mark.asyncio
+async def test_cleanup_duplicate_owner_titles_keeps_oldest_and_batches(monkeypatch):
+    groups = [
+        {"_id": {"created_by_id": "u1", "title": "A"}, "count": 3, "docs": ["c", "a", "b"]},
+        {"_id": {"created_by_id": "u2", "title": "B"}, "count": 2, "docs": ["e", "d"]},
+    ]
+    surveys = FakeSurveys(groups=groups)
+    monkeypatch.setattr(migrations, "surveys_collection", surveys)
+    monkeypatch.setattr(migrations, "MONGO_MIGRATION_STRATEGY", "delete")
+
+    await migrations._cleanup_duplicate_owner_titles(batch_size=100)
+
+    assert len(surveys.bulk_writes) == 1
+    assert [op._filter["_id"] for op in surveys.bulk_writes[0]] == ["b", "c", "e"]
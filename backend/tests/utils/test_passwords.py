@@ -6,10 +6,13 @@ from jose import jwt
 from jose.exceptions import JWTError
 
 from backend.routers.auth.security_utl import (
+    build_password_context,
     hash_password,
+    needs_rehash,
     verify_password,
     make_access_token,
     make_refresh_token,
+    clear_decode_cache,
     decode
 )
 from backend.config import settings
@@ -89,6 +92,26 @@ class TestPasswordHandling:
         assert verify_password(
             "not_empty", hashed) is False, "Non-empty password should not verify correctly."
 
+    def test_needs_rehash_for_current_policy(self):
+        """Test that a hash made with the current policy is not flagged for rehash."""
+        hashed = hash_password("test_password_123")
+
+        assert needs_rehash(hashed) is False, "Current-policy hash should not need a rehash."
+
+    def test_needs_rehash_for_weaker_bcrypt_cost(self):
+        """Test that a bcrypt hash below the configured rounds is flagged for rehash."""
+        weak_context = build_password_context(bcrypt_rounds=4)
+        weak_hash = weak_context.hash("test_password_123")
+
+        assert settings.BCRYPT_ROUNDS > 4
+        assert needs_rehash(weak_hash) is True, "Weaker bcrypt hash should need a rehash."
+        assert verify_password("test_password_123", weak_hash) is True, "Weaker hash should still verify."
+
+    def test_build_password_context_rejects_unknown_scheme(self):
+        """Test that an unsupported hashing scheme is rejected."""
+        with pytest.raises(ValueError):
+            build_password_context(scheme="md5")
+
 
 class TestAccessToken:
     """Test access token generation and validation."""
@@ -272,6 +295,52 @@ class TestTokenDecoding:
                 decode(token)
 
 
+class TestDecodeCache:
+    """Test the verified-token cache in decode()."""
+
+    def setup_method(self):
+        clear_decode_cache()
+
+    def test_decode_cache_skips_repeated_verification(self):
+        """Test that a second decode of the same token does not verify the signature again."""
+        token = make_access_token(uuid.uuid4(), "user", 0)
+
+        with patch("backend.routers.auth.security_utl.jwt.decode", wraps=jwt.decode) as spy:
+            first = decode(token)
+            second = decode(token)
+
+        assert spy.call_count == 1
+        assert first == second
+
+    def test_decode_cache_returns_copies(self):
+        """Test that callers mutating the claims do not poison the cache."""
+        token = make_access_token(uuid.uuid4(), "user", 0)
+
+        decode(token)["role"] = "admin"
+
+        assert decode(token)["role"] == "user"
+
+    def test_decode_cache_entry_expires_with_token(self):
+        """Test that a cached token is verified again (and rejected) after its exp."""
+        token = make_access_token(uuid.uuid4(), "user", 0)
+        exp = decode(token)["exp"]
+
+        with patch("backend.routers.auth.security_utl.time.time", return_value=exp + 1):
+            with patch("backend.routers.auth.security_utl.jwt.decode", side_effect=JWTError("expired")):
+                with pytest.raises(JWTError):
+                    decode(token)
+
+    def test_decode_cache_is_bounded(self):
+        """Test that the cache never holds more than JWT_DECODE_CACHE_SIZE entries."""
+        from backend.routers.auth import security_utl
+
+        with patch.object(settings, "JWT_DECODE_CACHE_SIZE", 2):
+            for _ in range(4):
+                decode(make_access_token(uuid.uuid4(), "user", 0))
+
+        assert len(security_utl._decode_cache) == 2
+
+
 class TestEdgeCases:
     """Test edge cases and error conditions."""
 
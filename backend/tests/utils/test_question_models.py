@@ -0,0 +1,99 @@
+import pytest
+from pydantic import TypeAdapter, ValidationError
+
+from backend.models.api.surveys import (
+    AnyQuestionItem,
+    DropDownProps,
+    QuestionItem,
+    RadioBarProps,
+    Survey,
+    SurveyCreate,
+    TextFieldProps,
+    ToggleSwitchProps,
+)
+
+questions_adapter = TypeAdapter(list[AnyQuestionItem])
+
+
+def test_component_selects_option_props_model() -> None:
+    questions = questions_adapter.validate_python(
+        [
+            {"id": "q1", "questionText": "Name", "component": "TextInput", "option": {"optionProps": {"label": "Name"}}},
+            {"id": "q2", "questionText": "Agree", "component": "Switch", "option": {"optionProps": {"checked": True}}},
+            {
+                "id": "q3",
+                "questionText": "Pick",
+                "component": "RadioBar",
+                "option": {"optionProps": {"buttons": [{"label": "A", "value": "a"}]}},
+            },
+        ]
+    )
+
+    assert isinstance(questions[0].option.optionProps, TextFieldProps)
+    assert isinstance(questions[1].option.optionProps, ToggleSwitchProps)
+    assert isinstance(questions[2].option.optionProps, RadioBarProps)
+
+
+def test_invalid_props_are_rejected_instead_of_misclassified() -> None:
+    # The plain union used to accept this as ToggleSwitchProps and drop the buttons
+    with pytest.raises(ValidationError) as exc_info:
+        questions_adapter.validate_python(
+            [{"id": "q1", "questionText": "Pick", "component": "RadioBar", "option": {"optionProps": {"name": "x"}}}]
+        )
+
+    assert exc_info.value.errors()[0]["loc"][:2] == (0, "RadioBar")
+
+
+def test_reads_fall_back_to_generic_question_for_legacy_props() -> None:
+    legacy = {"id": "q1", "questionText": "Pick", "component": "DropDown", "option": {"optionProps": {"checked": None}}}
+    valid = {
+        "id": "q2",
+        "questionText": "Pick",
+        "component": "DropDown",
+        "option": {"optionProps": {"options": [{"label": "A", "value": "a"}], "selectedOption": "a"}},
+    }
+
+    survey = Survey.model_validate({"questions": [legacy, valid]})
+
+    assert type(survey.questions[0]) is QuestionItem
+    assert isinstance(survey.questions[0].option.optionProps, ToggleSwitchProps)
+    assert isinstance(survey.questions[1].option.optionProps, DropDownProps)
+    with pytest.raises(ValidationError):
+        SurveyCreate.model_validate({"title": "T", "questions": [legacy]})
+
+
+def test_unknown_component_keeps_generic_question_item() -> None:
+    [question] = questions_adapter.validate_python(
+        [{"id": "q1", "questionText": "Info", "component": "InfoLabel", "option": {"optionProps": {}}}]
+    )
+
+    assert type(question) is QuestionItem
+
+
+def test_wire_format_round_trips() -> None:
+    payload = {
+        "title": "Survey",
+        "status": "draft",
+        "questions": [
+            {
+                "id": "q1",
+                "questionText": "Pick",
+                "component": "DropDown",
+                "option": {
+                    "optionProps": {
+                        "options": [{"label": "One", "value": "1"}],
+                        "selectedOption": "1",
+                        "label": None,
+                        "id": None,
+                        "name": None,
+                        "disabled": None,
+                        "test_id": None,
+                    }
+                },
+                "layout": None,
+            }
+        ],
+        "layouts": None,
+    }
+
+    assert SurveyCreate.model_validate(payload).model_dump(mode="json") == payload
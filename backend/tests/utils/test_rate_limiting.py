@@ -0,0 +1,101 @@
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+
+from backend.config import settings
+from backend.middleware.rate_limiting import (
+    InMemoryRateLimitBackend,
+    RateLimit,
+    client_ip,
+    parse_rate,
+    set_rate_limit_backend,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_parse_rate():
+    assert parse_rate("10/60") == (10, 10 / 60)
+    assert parse_rate("5") == (5, 5.0)
+    with pytest.raises(ValueError):
+        parse_rate("0/60")
+
+
+@pytest.mark.asyncio
+async def test_bucket_allows_burst_then_refills():
+    clock = FakeClock()
+    backend = InMemoryRateLimitBackend(max_keys=10, clock=clock)
+
+    for _ in range(3):
+        assert await backend.hit("k", capacity=3, refill_per_second=1.0) == 0
+
+    retry_after = await backend.hit("k", capacity=3, refill_per_second=1.0)
+    assert retry_after == pytest.approx(1.0)
+
+    clock.now += 1.0
+    assert await backend.hit("k", capacity=3, refill_per_second=1.0) == 0
+
+
+@pytest.mark.asyncio
+async def test_bucket_store_is_bounded_lru():
+    backend = InMemoryRateLimitBackend(max_keys=2, clock=FakeClock())
+
+    await backend.hit("a", capacity=1, refill_per_second=0.1)
+    await backend.hit("b", capacity=1, refill_per_second=0.1)
+    await backend.hit("c", capacity=1, refill_per_second=0.1)
+
+    assert len(backend) == 2
+    # "a" was evicted, so it starts with a full bucket again
+    assert await backend.hit("a", capacity=1, refill_per_second=0.1) == 0
+    # "c" is still tracked and exhausted
+    assert await backend.hit("c", capacity=1, refill_per_second=0.1) > 0
+
+
+def test_dependency_returns_429_with_retry_after():
+    set_rate_limit_backend(InMemoryRateLimitBackend(clock=FakeClock()))
+    limit = RateLimit("test:ip", "2/60")
+
+    app = FastAPI()
+
+    @app.post("/limited", dependencies=[Depends(limit)])
+    async def limited():
+        return {"ok": True}
+
+    client = TestClient(app)
+    assert client.post("/limited").status_code == 200
+    assert client.post("/limited").status_code == 200
+
+    resp = client.post("/limited")
+    assert resp.status_code == 429
+    assert resp.headers["Retry-After"] == "30"
+    assert resp.json()["detail"] == "Too many requests"
+
+
+def _request(forwarded_for=None):
+    headers = [(b"x-forwarded-for", forwarded_for.encode())] if forwarded_for else []
+    return Request({"type": "http", "headers": headers, "client": ("10.0.0.9", 5000)})
+
+
+@pytest.mark.parametrize(
+    ("trusted", "hops", "forwarded_for", "expected"),
+    [
+        (False, 1, "1.1.1.1", "10.0.0.9"),
+        (True, 1, None, "10.0.0.9"),
+        # The client-supplied left entries are ignored, the proxy appended the last one
+        (True, 1, "6.6.6.6, 1.1.1.1", "1.1.1.1"),
+        (True, 2, "6.6.6.6, 1.1.1.1, 172.16.0.2", "1.1.1.1"),
+        (True, 3, "1.1.1.1, 172.16.0.2", "1.1.1.1"),
+    ],
+)
+def test_client_ip_uses_the_entry_added_by_the_trusted_proxy(monkeypatch, trusted, hops, forwarded_for, expected):
+    monkeypatch.setattr(settings, "RATE_LIMIT_TRUST_FORWARDED_FOR", trusted)
+    monkeypatch.setattr(settings, "RATE_LIMIT_TRUSTED_PROXY_HOPS", hops)
+
+    assert client_ip(_request(forwarded_for)) == expected
@@ -0,0 +1,70 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+from fastapi import Response
+
+from backend.config import settings
+from backend.db import read_routing
+from backend.db.read_routing import READ_YOUR_WRITES_COOKIE, has_recent_write, mark_recent_write, surveys_for_read
+from backend.db.sql import sql_driver
+
+
+def _request(cookies=None):
+    return SimpleNamespace(cookies=cookies or {})
+
+
+@pytest.fixture
+def secondary_reads(monkeypatch):
+    monkeypatch.setattr(settings, "MONGO_SECONDARY_READS", True)
+
+
+def test_reads_use_primary_when_secondary_reads_disabled(monkeypatch):
+    monkeypatch.setattr(settings, "MONGO_SECONDARY_READS", False)
+
+    assert surveys_for_read(_request()) is read_routing.surveys_collection
+
+
+def test_reads_use_secondary_without_recent_write(secondary_reads):
+    assert surveys_for_read(_request()) is read_routing.surveys_secondary_collection
+
+
+def test_recent_write_pins_reads_to_primary(secondary_reads):
+    response = Response()
+    mark_recent_write(response)
+    cookie = response.headers["set-cookie"]
+    until = cookie.split(f"{READ_YOUR_WRITES_COOKIE}=")[1].split(";")[0]
+
+    assert f"Max-Age={settings.READ_YOUR_WRITES_SECONDS}" in cookie
+    assert surveys_for_read(_request({READ_YOUR_WRITES_COOKIE: until})) is read_routing.surveys_collection
+
+
+def test_expired_or_malformed_marker_allows_secondary(secondary_reads):
+    expired = str(int(time.time()) - 1)
+
+    assert has_recent_write(_request({READ_YOUR_WRITES_COOKIE: expired})) is False
+    assert has_recent_write(_request({READ_YOUR_WRITES_COOKIE: "garbage"})) is False
+    assert surveys_for_read(_request({READ_YOUR_WRITES_COOKIE: expired})) is read_routing.surveys_secondary_collection
+
+
+def test_read_workloads_use_replica_url(monkeypatch):
+    urls = []
+    real_create_async_engine = sql_driver.create_async_engine
+
+    def capture(url, **kwargs):
+        urls.append(url)
+        return real_create_async_engine(url, **kwargs)
+
+    monkeypatch.setattr(settings, "DATABASE_URL", "postgresql://app@primary/survey")
+    monkeypatch.setattr(settings, "DATABASE_READ_URL", "postgresql://app@replica/survey")
+    monkeypatch.setattr(sql_driver, "create_async_engine", capture)
+
+    for workload in ("interactive", "ingest", "read", "analytics"):
+        sql_driver.get_async_engine.__wrapped__(workload)
+
+    assert urls == [
+        "postgresql+asyncpg://app@primary/survey",
+        "postgresql+asyncpg://app@primary/survey",
+        "postgresql+asyncpg://app@replica/survey",
+        "postgresql+asyncpg://app@replica/survey",
+    ]
@@ -0,0 +1,63 @@
+import pytest
+from types import SimpleNamespace
+
+from backend.services.auth import refresh_tokens as pruning_mod
+
+
+class FakeSession:
+    """Async session fake that returns queued rowcounts for each DELETE."""
+
+    def __init__(self, rowcounts, statements):
+        self.rowcounts = rowcounts
+        self.statements = statements
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, stmt):
+        self.statements.append(str(stmt))
+        return SimpleNamespace(rowcount=self.rowcounts.pop(0))
+
+    async def commit(self):
+        return None
+
+
+@pytest.fixture
+def fake_sessions(monkeypatch):
+    state = {"rowcounts": [], "statements": []}
+    monkeypatch.setattr(
+        pruning_mod,
+        "AsyncSessionLocal",
+        lambda: FakeSession(state["rowcounts"], state["statements"]),
+    )
+    return state
+
+
+@pytest.mark.asyncio
+async def test_prune_deletes_in_batches_until_exhausted(fake_sessions):
+    # expired: two full batches then a partial one; revoked: one partial batch
+    fake_sessions["rowcounts"].extend([2, 2, 1, 1])
+
+    deleted = await pruning_mod.prune_refresh_tokens(batch_size=2)
+
+    assert deleted == 6
+    assert len(fake_sessions["statements"]) == 4
+    assert all(stmt.startswith("DELETE FROM refresh_tokens") for stmt in fake_sessions["statements"])
+
+
+@pytest.mark.asyncio
+async def test_prune_expired_batches_walk_created_at(fake_sessions):
+    fake_sessions["rowcounts"].extend([0, 0])
+
+    deleted = await pruning_mod.prune_refresh_tokens(batch_size=100)
+
+    assert deleted == 0
+    expired_stmt, revoked_stmt = fake_sessions["statements"]
+    assert "refresh_tokens.created_at <" in expired_stmt
+    assert "ORDER BY refresh_tokens.created_at" in expired_stmt
+    assert "LIMIT" in expired_stmt
+    assert "refresh_tokens.revoked IS true" in revoked_stmt
+    assert "refresh_tokens.token_version != users.token_version" in revoked_stmt
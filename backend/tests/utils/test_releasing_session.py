@@ -0,0 +1,104 @@
+import pytest
+import pytest_asyncio
+from sqlalchemy import column, event, insert, select, table, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from backend.db.sql.sql_driver import ReleasingAsyncSession, release_connection
+from backend.models.db.sql.auth import User
+
+items = table("items", column("id"))
+
+
+@pytest_asyncio.fixture
+async def session():
+    """A session on a real SQLite engine that logs every statement, COMMIT and checkout."""
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE TABLE items (id INTEGER)"))
+
+    log = []
+    event.listen(engine.sync_engine, "before_cursor_execute", lambda *args: log.append(args[2].split()[0]))
+    event.listen(engine.sync_engine, "commit", lambda conn: log.append("COMMIT"))
+    event.listen(engine.sync_engine.pool, "checkout", lambda *args: log.append("checkout"))
+    event.listen(engine.sync_engine.pool, "checkin", lambda *args: log.append("checkin"))
+
+    db = ReleasingAsyncSession(bind=engine, expire_on_commit=False)
+    db.log = log
+    yield db
+    await db.close()
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_reads_do_not_commit_until_released(session):
+    await session.execute(select(items))
+    await session.execute(select(items))
+
+    assert session.log == ["checkout", "SELECT", "SELECT"]
+
+    await session.release()
+    assert session.log[3:] == ["COMMIT", "checkin"]
+    assert session.sync_session.get_transaction() is None
+
+
+@pytest.mark.asyncio
+async def test_release_without_a_transaction_issues_nothing(session):
+    await session.release()
+
+    assert session.log == []
+
+
+@pytest.mark.asyncio
+async def test_writes_are_not_released(session):
+    await session.execute(insert(items).values(id=1))
+    await session.execute(select(items))
+    await session.release()
+
+    assert "COMMIT" not in session.log
+    assert session.sync_session.get_transaction() is not None
+
+    await session.commit()
+    await session.execute(select(items))
+    await session.release()
+    assert session.log.count("COMMIT") == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "statement",
+    [select(items).with_for_update(), text("SELECT 1")],
+    ids=["for_update", "text"],
+)
+async def test_locking_and_textual_statements_are_not_released(session, statement):
+    await session.execute(statement)
+    await session.release()
+
+    assert session.sync_session.get_transaction() is not None
+
+
+@pytest.mark.asyncio
+async def test_pending_orm_changes_keep_transaction(session):
+    await session.execute(select(items))
+    session.add(User(email="new@example.com", password_hash="x"))
+    await session.release()
+
+    assert session.sync_session.get_transaction() is not None
+    assert "COMMIT" not in session.log
+
+
+@pytest.mark.asyncio
+async def test_explicit_transaction_is_not_released(session):
+    session.sync_session.begin()
+    await session.execute(select(items))
+    await session.release()
+
+    assert session.sync_session.get_transaction() is not None
+    assert "COMMIT" not in session.log
+
+
+@pytest.mark.asyncio
+async def test_release_connection_ignores_other_sessions():
+    plain = AsyncSession()
+
+    await release_connection(plain)
+    await release_connection(object())
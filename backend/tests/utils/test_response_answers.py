@@ -0,0 +1,78 @@
+import uuid
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.orm import configure_mappers
+
+from backend.models.db.sql.auth import SurveyResponse, SurveyResponseAnswer
+from backend.services.surveys import response_answers
+from backend.services.surveys.response_answers import answer_rows, answer_value_keys
+
+
+def test_answer_value_keys_normalise_values() -> None:
+    assert answer_value_keys("Option A") == ["Option A"]
+    assert answer_value_keys(True) == ["true"]
+    assert answer_value_keys(False) == ["false"]
+    assert answer_value_keys(["b", "a", "b", ""]) == ["b", "a"]
+    assert answer_value_keys("") == []
+    assert answer_value_keys([]) == []
+    assert answer_value_keys(None) == []
+    assert answer_value_keys(["a", None]) == ["a"]
+
+
+def test_answer_rows_one_row_per_question_value() -> None:
+    rows = answer_rows(
+        "survey-1",
+        [
+            {"questionId": "q1", "value": "A"},
+            {"questionId": "q2", "value": ["x", "y"]},
+            {"questionId": "q3", "value": ""},
+            {"questionId": "q1", "value": "A"},
+        ],
+    )
+
+    assert all(isinstance(row, SurveyResponseAnswer) and row.survey_id == "survey-1" for row in rows)
+    assert [(row.question_id, row.value_key) for row in rows] == [("q1", "A"), ("q2", "x"), ("q2", "y")]
+
+
+def test_answer_rows_are_written_with_their_response() -> None:
+    configure_mappers()
+    foreign_key = next(iter(SurveyResponseAnswer.__table__.c.response_id.foreign_keys))
+
+    assert foreign_key.column.table is SurveyResponse.__table__
+    assert foreign_key.ondelete == "CASCADE"
+    assert SurveyResponse.answer_keys.property.mapper.class_ is SurveyResponseAnswer
+    index = next(iter(SurveyResponseAnswer.__table__.indexes))
+    assert [column.name for column in index.columns][:3] == ["survey_id", "question_id", "value_key"]
+
+
+@pytest.mark.asyncio
+async def test_backfill_commits_each_batch_on_the_maintenance_engine(monkeypatch) -> None:
+    ids = [uuid.uuid4() for _ in range(3)]
+    batches = [ids[:2], ids[2:], []]
+    statements = []
+
+    class FakeConnection:
+        async def execute(self, statement, params):
+            statements.append(statement)
+            if statement is response_answers._NEXT_BATCH_SQL:
+                batch = batches.pop(0)
+                return SimpleNamespace(scalars=lambda: SimpleNamespace(all=lambda: batch))
+            return None
+
+        async def commit(self):
+            statements.append("COMMIT")
+
+    @asynccontextmanager
+    async def connect():
+        yield FakeConnection()
+
+    monkeypatch.setattr(response_answers, "get_maintenance_engine", lambda: SimpleNamespace(connect=connect))
+
+    assert await response_answers.backfill_response_answers(batch_size=2) == 3
+    assert statements == [
+        response_answers._NEXT_BATCH_SQL, response_answers._BACKFILL_SQL, "COMMIT",
+        response_answers._NEXT_BATCH_SQL, response_answers._BACKFILL_SQL, "COMMIT",
+        response_answers._NEXT_BATCH_SQL,
+    ]
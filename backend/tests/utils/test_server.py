@@ -0,0 +1,93 @@
+import os
+from types import SimpleNamespace
+
+import uvicorn
+from uvicorn.supervisors import Multiprocess
+
+from backend import server
+from backend.config import settings
+
+
+def test_worker_count_defaults_to_available_cpus(monkeypatch):
+    monkeypatch.setattr(server, "available_cpus", lambda: 6)
+
+    assert server.worker_count(configured=0, max_workers=16) == 6
+    assert server.worker_count(configured=0, max_workers=4) == 4
+    assert server.worker_count(configured=3, max_workers=4) == 3
+
+
+def test_jittered_limit_stays_within_the_spread():
+    limits = {server.jittered_limit(10000, jitter=0.1) for _ in range(200)}
+
+    assert all(9000 <= limit <= 11000 for limit in limits)
+    assert len(limits) > 1
+    assert server.jittered_limit(10000, jitter=0) == 10000
+
+
+def test_each_worker_run_draws_its_own_limit(monkeypatch):
+    seen = []
+    monkeypatch.setattr(uvicorn.Server, "run", lambda self, sockets=None: seen.append(self.config.limit_max_requests))
+    monkeypatch.setattr(server, "jittered_limit", lambda limit: limit + 1)
+    config = uvicorn.Config(server.APP, limit_max_requests=100)
+
+    server.RecyclingServer(config=config).run()
+    server.RecyclingServer(config=uvicorn.Config(server.APP)).run()
+
+    assert seen == [101, None]
+
+
+def test_server_options_from_settings(monkeypatch):
+    monkeypatch.setattr(server, "available_cpus", lambda: 4)
+    monkeypatch.setattr(settings, "SERVER_WORKERS", 0)
+    monkeypatch.setattr(settings, "SERVER_MAX_REQUESTS", 5000)
+    monkeypatch.setattr(settings, "SERVER_KEEPALIVE_SECONDS", 7)
+    monkeypatch.setattr(settings, "SERVER_BACKLOG", 1024)
+
+    options = server.server_options()
+
+    assert options["workers"] == 4
+    assert options["limit_max_requests"] == 5000
+    assert options["timeout_keep_alive"] == 7
+    assert options["backlog"] == 1024
+    assert options["loop"] == settings.SERVER_LOOP
+    assert options["timeout_graceful_shutdown"] == settings.SERVER_GRACEFUL_SHUTDOWN_SECONDS
+
+
+def test_single_worker_is_not_recycled(monkeypatch):
+    monkeypatch.setattr(settings, "SERVER_WORKERS", 1)
+    monkeypatch.setattr(settings, "SERVER_MAX_REQUESTS", 5000)
+
+    assert server.server_options()["limit_max_requests"] is None
+
+
+def test_prepare_metrics_dir_empties_the_shared_directory(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", "")
+    (tmp_path / "counter_123.db").write_bytes(b"stale")
+
+    assert server.prepare_metrics_dir() == str(tmp_path)
+    assert list(tmp_path.iterdir()) == []
+    assert os.environ["PROMETHEUS_MULTIPROC_DIR"] == str(tmp_path)
+
+
+def test_supervisor_marks_replaced_workers_dead(monkeypatch):
+    dead = []
+    monkeypatch.setattr(server.prometheus_multiprocess, "mark_process_dead", dead.append)
+
+    def worker(pid, exitcode=None):
+        return SimpleNamespace(pid=pid, process=SimpleNamespace(exitcode=exitcode))
+
+    supervisor = server.MetricsMultiprocess.__new__(server.MetricsMultiprocess)
+    supervisor.processes = [worker(1), worker(2)]
+
+    def replace_first():
+        supervisor.processes[0] = worker(3)
+
+    monkeypatch.setattr(Multiprocess, "keep_subprocess_alive", lambda self: replace_first())
+    supervisor.keep_subprocess_alive()
+    assert dead == [1]
+
+    monkeypatch.setattr(Multiprocess, "join_all", lambda self: None)
+    supervisor.processes = [worker(2, exitcode=0), worker(3, exitcode=0)]
+    supervisor.join_all()
+    assert sorted(dead) == [1, 2, 3]
@@ -0,0 +1,150 @@
+import asyncio
+import json
+import logging
+from types import SimpleNamespace
+
+import pytest
+
+from backend.config import settings
+from backend.db import slow_queries
+from backend.db.slow_queries import (
+    SlowMongoCommandListener,
+    redact_mongo_command,
+    redact_sql_parameters,
+)
+
+
+@pytest.fixture
+def thresholds(monkeypatch):
+    monkeypatch.setattr(settings, "SLOW_QUERY_MONGO_MS", 100)
+    monkeypatch.setattr(settings, "SLOW_QUERY_EXPLAIN", True)
+    monkeypatch.setattr(settings, "ENVIRONMENT", "production")
+
+
+def _slow_records(caplog):
+    return [json.loads(r.getMessage()) for r in caplog.records if r.name == "backend.slow_queries"]
+
+
+def test_redact_sql_parameters_keeps_shape_and_nulls():
+    assert redact_sql_parameters(("alice@example.com", 3, None)) == ["<str>", "<int>", None]
+    assert redact_sql_parameters({"email": "a@b.c"}) == {"email": "<str>"}
+
+
+def test_redact_mongo_command_keeps_collection_and_operators():
+    command = {
+        "find": "surveys",
+        "filter": {"created_by_id": "user-1", "status": {"$in": ["draft", "published"]}},
+        "lsid": {"id": "session"},
+        "$db": "survey",
+    }
+
+    assert redact_mongo_command(command) == {
+        "find": "surveys",
+        "filter": {"created_by_id": "?", "status": {"$in": ["?", "?"]}},
+    }
+
+
+def _started(command, request_id=1):
+    return SimpleNamespace(
+        command_name=next(iter(command)),
+        command=command,
+        database_name="survey",
+        request_id=request_id,
+        connection_id=("localhost", 27017),
+    )
+
+
+def _succeeded(duration_ms, request_id=1, command_name="find"):
+    return SimpleNamespace(
+        command_name=command_name,
+        request_id=request_id,
+        connection_id=("localhost", 27017),
+        duration_micros=int(duration_ms * 1000),
+    )
+
+
+def test_mongo_listener_logs_only_slow_commands(thresholds, caplog):
+    listener = SlowMongoCommandListener()
+    caplog.set_level(logging.WARNING, logger="backend.slow_queries")
+
+    listener.started(_started({"find": "surveys", "filter": {"_id": "x"}}, request_id=1))
+    listener.succeeded(_succeeded(5, request_id=1))
+    listener.started(_started({"find": "surveys", "filter": {"_id": "y"}}, request_id=2))
+    listener.succeeded(_succeeded(250, request_id=2))
+
+    records = _slow_records(caplog)
+    assert len(records) == 1
+    assert records[0]["store"] == "mongo"
+    assert records[0]["command"] == {"find": "surveys", "filter": {"_id": "?"}}
+    assert "plan" not in records[0]
+    assert listener._commands == {}
+
+
+def test_mongo_listener_explains_outside_production(thresholds, monkeypatch, caplog):
+    monkeypatch.setattr(settings, "ENVIRONMENT", "development")
+    issued = []
+
+    class FakeDatabase:
+        def command(self, command):
+            issued.append(command)
+            return {
+                "queryPlanner": {"winningPlan": {"stage": "COLLSCAN"}},
+                "executionStats": {"nReturned": 1, "totalDocsExamined": 500},
+            }
+
+    listener = SlowMongoCommandListener()
+    listener.bind({"survey": FakeDatabase()})
+    caplog.set_level(logging.WARNING, logger="backend.slow_queries")
+
+    listener.started(_started({"find": "surveys", "filter": {"_id": "x"}, "lsid": {"id": "s"}}))
+    listener.succeeded(_succeeded(300))
+    listener._explainer.shutdown(wait=True)
+
+    assert issued == [{"explain": {"find": "surveys", "filter": {"_id": "x"}}, "verbosity": "executionStats"}]
+    plan = _slow_records(caplog)[0]["plan"]
+    assert plan["queryPlanner"] == {"stage": "COLLSCAN"}
+    assert plan["executionStats"]["totalDocsExamined"] == 500
+
+
+def test_sql_explain_analyzes_only_plain_selects():
+    assert slow_queries.explain_options("SELECT * FROM users") == "(ANALYZE, BUFFERS, FORMAT TEXT)"
+    assert slow_queries.explain_options("SELECT * FROM users FOR UPDATE") == "(FORMAT TEXT)"
+    assert slow_queries.explain_options("UPDATE users SET is_active = $1") == "(FORMAT TEXT)"
+    assert slow_queries.explain_options("WITH moved AS (DELETE FROM t RETURNING *) SELECT 1") is None
+    assert slow_queries.explain_options("CREATE TABLE t (id int)") is None
+    assert slow_queries.explain_options("COMMIT") is None
+
+
+@pytest.mark.asyncio
+async def test_sql_explain_runs_off_the_caller_connection(monkeypatch, caplog):
+    executed = []
+
+    class FakeConnection:
+        async def exec_driver_sql(self, statement, parameters):
+            executed.append((statement, parameters))
+            return SimpleNamespace(fetchall=lambda: [("Seq Scan on users",)])
+
+        async def rollback(self):
+            executed.append("ROLLBACK")
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+    monkeypatch.setattr(
+        slow_queries, "create_async_engine", lambda url, poolclass: SimpleNamespace(connect=FakeConnection)
+    )
+    caplog.set_level(logging.WARNING, logger="backend.slow_queries")
+    explainer = slow_queries.SqlExplainer("postgresql+asyncpg://localhost/db")
+
+    assert not explainer.submit("ALTER TABLE users ADD COLUMN x int", (), {})
+    assert explainer.submit("SELECT * FROM users WHERE id = $1", ("secret",), {"store": "sql"})
+    await asyncio.gather(*explainer._tasks)
+
+    assert executed == [
+        ("EXPLAIN (ANALYZE, BUFFERS, FORMAT TEXT) SELECT * FROM users WHERE id = $1", ("secret",)),
+        "ROLLBACK",
+    ]
+    assert _slow_records(caplog)[0]["plan"] == "Seq Scan on users"
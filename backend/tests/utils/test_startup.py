@@ -0,0 +1,102 @@
+import asyncio
+import time
+
+import pytest
+
+from backend.db import schema
+from backend.startup import Step, run_graph
+
+
+def _sleeper(seconds, value=None, log=None, name=None):
+    async def run(results):
+        if log is not None:
+            log.append(name)
+        await asyncio.sleep(seconds)
+        return value
+
+    return run
+
+
+@pytest.mark.asyncio
+async def test_independent_steps_run_concurrently():
+    started = time.perf_counter()
+    report = await run_graph([Step("sql", _sleeper(0.1)), Step("mongo", _sleeper(0.1))])
+    elapsed = time.perf_counter() - started
+
+    assert report.failed == []
+    assert elapsed < 0.18
+    assert report.total_ms < sum(step.duration_ms for step in report.steps.values())
+
+
+@pytest.mark.asyncio
+async def test_dependents_wait_and_receive_results():
+    log = []
+
+    async def consumer(results):
+        log.append("consumer")
+        return results["producer"] + 1
+
+    report = await run_graph(
+        [
+            Step("consumer", consumer, depends_on=("producer",)),
+            Step("producer", _sleeper(0.01, value=41, log=log, name="producer")),
+        ]
+    )
+
+    assert log == ["producer", "consumer"]
+    assert report.result("consumer") == 42
+
+
+@pytest.mark.asyncio
+async def test_timeout_skips_dependents_without_raising():
+    report = await run_graph(
+        [
+            Step("slow", _sleeper(1), timeout=0.01),
+            Step("after_slow", _sleeper(0), depends_on=("slow",)),
+            Step("independent", _sleeper(0, value="ok")),
+        ]
+    )
+
+    assert report.steps["slow"].status == "timeout"
+    assert report.steps["after_slow"].status == "skipped"
+    assert report.result("independent") == "ok"
+    assert report.failed == ["slow", "after_slow"]
+
+
+@pytest.mark.asyncio
+async def test_unknown_dependency_is_rejected():
+    with pytest.raises(ValueError):
+        await run_graph([Step("a", _sleeper(0), depends_on=("missing",))])
+
+
+@pytest.mark.asyncio
+async def test_migrate_overlaps_mongo_with_postgres_chain(monkeypatch):
+    order = []
+
+    def track(name, value=None):
+        async def run(*args, **kwargs):
+            order.append(f"{name}:start")
+            await asyncio.sleep(0.01)
+            order.append(f"{name}:end")
+            return value
+
+        return run
+
+    monkeypatch.setattr(schema, "init_database", track("init"))
+    monkeypatch.setattr(schema, "ensure_answers_gin_index", track("gin_index"))
+    monkeypatch.setattr(schema.sql_migrations, "run_migrations", track("sql"))
+    monkeypatch.setattr(schema, "seed_demo_user", track("seed_user"))
+    monkeypatch.setattr(schema.mongo_migrations, "run_migrations", track("mongo"))
+    monkeypatch.setattr(schema, "seed_demo_survey", track("seed_survey"))
+
+    await schema.migrate()
+
+    assert order.index("mongo:start") < order.index("init:end")
+    assert order.index("sql:start") > order.index("init:end")
+    # No demo user returned, so the survey seed is a no-op
+    assert "seed_survey:start" not in order
+
+
+def test_only_schema_checks_have_timeouts():
+    assert all(step.timeout is None for step in schema.migration_steps())
+    assert all(step.timeout is not None for step in schema.check_steps())
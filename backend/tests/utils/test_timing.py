@@ -0,0 +1,63 @@
+import logging
+from types import SimpleNamespace
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.middleware.timing import (
+    MongoTimingListener,
+    ServerTimingMiddleware,
+    current_timings,
+    record,
+    timed,
+)
+
+
+def _app():
+    app = FastAPI()
+    app.add_middleware(ServerTimingMiddleware)
+
+    @app.get("/items/{item_id}")
+    async def item(item_id: str):
+        MongoTimingListener().succeeded(SimpleNamespace(duration_micros=12_000))
+        record("sql", 0.004)
+        record("sql", 0.001)
+        with timed("hash"):
+            pass
+        return {"id": item_id}
+
+    return app
+
+
+def _parse_server_timing(header: str) -> dict[str, float]:
+    metrics = {}
+    for part in header.split(","):
+        name, dur = part.strip().split(";dur=")
+        metrics[name] = float(dur)
+    return metrics
+
+
+def test_server_timing_header_breaks_down_request():
+    resp = TestClient(_app()).get("/items/1")
+
+    metrics = _parse_server_timing(resp.headers["server-timing"])
+    assert set(metrics) == {"mongo", "sql", "hash", "app", "total"}
+    assert metrics["mongo"] == 12.0
+    assert metrics["sql"] == 5.0
+    assert metrics["total"] >= metrics["app"]
+
+
+def test_structured_log_line_uses_route_template(caplog):
+    with caplog.at_level(logging.INFO, logger="backend.timing"):
+        TestClient(_app()).get("/items/42")
+
+    (line,) = [r.getMessage() for r in caplog.records if r.name == "backend.timing"]
+    assert '"path": "/items/{item_id}"' in line
+    assert '"sql_count": 2' in line
+    assert '"status": 200' in line
+
+
+def test_record_outside_request_is_ignored():
+    assert current_timings() is None
+    record("sql", 1.0)
+    assert current_timings() is None